@@ -1,44 +1,99 @@
-from controller.controller import Controller
-from view.main_view import MainView
+from __future__ import annotations
+
 from pathlib import Path
-import tkinter as tk
-from tkinter import filedialog, messagebox
 import sys
 import json
+import time
+
+# tkinter and the views are imported where they are used, so --cli never loads them
 
-def _ensure_valid_db(config_path: Path) -> bool:
+def _load_settings(config_path: Path) -> dict:
     """
-    Ensure settings.json points to an existing sqlite db, otherwise prompt user.
+    Reads settings.json, the only time it is read at start-up. Creates an empty one if missing.
     """
+    if not config_path.exists():
+        config_path.write_text('{}')
     with open(config_path, 'r') as f:
-        config = json.load(f)
-    db_path = config.get('db_path', '')
-    changed=False
-    if not db_path or not Path(db_path).is_file():
-        # ask user using temporary hidden root then destroy it to avoid duplicate Tk roots
-        temp_root = tk.Tk(); temp_root.withdraw()
-        messagebox.showwarning('Database Missing', 'Database path is not set or file not found. Please select a database file.', parent=temp_root)
-        new_path = filedialog.askopenfilename(title='Select SQLite DB', parent=temp_root, filetypes=[('SQLite DB','*.db'),('All','*.*')])
-        if not new_path:
-            messagebox.showerror('No Database Selected', 'Application cannot start without a database. Exiting.', parent=temp_root)
-            temp_root.destroy()
-            sys.exit(1)
-
-        # update the settings.json file in config/
-        config['db_path'] = new_path
-        changed=True
-        with open(config_path,'w') as f:
-            json.dump(config, f, indent=2)
-        messagebox.showinfo('Database Set', f'Database path updated to:\n{new_path}', parent=temp_root)
-        temp_root.destroy()
-        return changed
-
-    return changed
+        return json.load(f)
+
+def _ensure_valid_db(settings: dict, config_path: Path, parent) -> str | None:
+    """
+    Ensure settings point to an existing sqlite db, otherwise prompt user over the main window.
+    A newly selected path is stored in settings and saved to settings.json.
+
+    Returns:
+        db_path (str | None): the database to open, None if the user gave up
+    """
+    from tkinter import filedialog, messagebox
+    db_path = settings.get('db_path', '')
+    if db_path and Path(db_path).is_file():
+        return db_path
+
+    messagebox.showwarning('Database Missing', 'Database path is not set or file not found. Please select a database file.', parent=parent)
+    new_path = filedialog.askopenfilename(title='Select SQLite DB', parent=parent, filetypes=[('SQLite DB','*.db'),('All','*.*')])
+    if not new_path:
+        messagebox.showerror('No Database Selected', 'Application cannot start without a database. Exiting.', parent=parent)
+        return None
+
+    # update the settings.json file in config/
+    settings['db_path'] = new_path
+    with open(config_path,'w') as f:
+        json.dump(settings, f, indent=2)
+    messagebox.showinfo('Database Set', f'Database path updated to:\n{new_path}', parent=parent)
+    return new_path
+
+def _open_database(controller, main_view, config_path: Path, started: float) -> None:
+    """
+    Runs once the window shell is on screen: checks the database path (prompting if needed),
+    then opens and loads the database on the worker. The screens are painted when it arrives.
+    """
+    from tkinter import messagebox
+    db_path = controller.get_setting('db_path', '')
+    if _ensure_valid_db(controller.settings, config_path, main_view) is None:
+        main_view.destroy()
+        return
+    if controller.get_setting('db_path') != db_path:
+        # bring window to front and focus
+        main_view.after(100, lambda: (main_view.lift(), main_view.focus_force()))
+
+    opening = time.perf_counter()
+    main_view.busy_text.set("Loading screens...")
+    future = controller.open_database()
+
+    def loaded(f):
+        controller.diagnostics.record('startup.load', time.perf_counter() - opening)
+        if f.exception() is not None:
+            messagebox.showerror('Database Error', f'Could not open the database:\n{f.exception()}\n\n'
+                                 'Choose another with Settings > Change Database Path.', parent=main_view)
+            return
+        # idle callbacks run in order, so this runs after the first refresh with data
+        main_view.after_idle(lambda: controller.diagnostics.record('startup.total', time.perf_counter() - started))
+    future.add_done_callback(loaded)
 
 def main():
     """
-    The main application loop.
+    The main application loop. With --cli as the first argument, runs the headless
+    command line instead (see cli.py).
+
+    Start-up shows the window before touching the database: settings.json is read once
+    and handed to the Controller, the window shell is built and painted, and only then is
+    the database opened and loaded on the worker thread. Each phase is recorded as a
+    startup.* timer in Help > Diagnostics, even with diagnostics off since they happen once.
     """
+    if sys.argv[1:2] == ['--cli']:
+        import cli
+        sys.exit(cli.main(sys.argv[2:]))
+
+    started = time.perf_counter()
+    phases = []
+    def phase(name, since):
+        now = time.perf_counter()
+        phases.append((name, now - since))
+        return now
+
+    from controller.controller import Controller
+    from view.main_view import MainView
+    mark = phase('startup.imports', started)
     # determine base directory (support PyInstaller frozen exe)
     if getattr(sys, 'frozen', False):
         base_dir = Path(sys.executable).parent
@@ -47,16 +102,22 @@ def main():
     config_dir = base_dir / 'config'
     config_dir.mkdir(parents=True, exist_ok=True)
     config_path = config_dir / 'settings.json'
-    # create empty settings file if missing so _ensure_valid_db can open it safely
-    if not config_path.exists():
-        config_path.write_text('{}')
-    prompted = _ensure_valid_db(config_path)
-    controller = Controller()
+    settings = _load_settings(config_path)
+    mark = phase('startup.settings', mark)
+    controller = Controller(settings=settings, load=False, maintain=True)
+    mark = phase('startup.controller', mark)
     main_view = MainView(controller)
-    if prompted:
-        # bring window to front and focus
-        main_view.after(100, lambda: (main_view.lift(), main_view.focus_force()))
+    mark = phase('startup.window', mark)
+    # paint the shell now, the data follows
+    main_view.update_idletasks()
+    phase('startup.first_paint', mark)
+    for name, seconds in phases:
+        controller.diagnostics.record(name, seconds)
+
+    main_view.after(0, lambda: _open_database(controller, main_view, config_path, started))
     main_view.mainloop()
+    # let writes still queued on the database worker finish
+    controller.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
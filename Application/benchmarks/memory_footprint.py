@@ -0,0 +1,95 @@
+"""
+Measures the memory held by the loaded screens, before and after the compact records
+(__slots__ and interned customer names).
+
+"Before" builds the same rows into a plain class with a per-instance __dict__ and
+uninterned strings, which is how Screen used to be stored.
+
+Run from the Application directory:
+    python -m benchmarks.memory_footprint --screens 100000
+"""
+from __future__ import annotations
+
+import argparse
+import tracemalloc
+from benchmarks.synthetic import populate
+from model import schema
+from model.screen import Screen
+
+class _DictScreen:
+    """
+    Screen as it was before __slots__, for comparison.
+    """
+    def __init__(self, location_id, quantity, design, customer, description, in_use, screen_id, row_version):
+        self.screen_id = screen_id
+        self.location_id = location_id
+        self.quantity = quantity
+        self.design = design
+        self.customer = customer
+        self.description = description
+        self.in_use = in_use
+        self.row_version = row_version
+
+def _build_database(screens: int, customers: int, locations: int, seed: int):
+    """
+    Creates an in-memory database holding synthetic screens.
+    """
+    conn = schema.connect(":memory:", {'journal_mode': 'memory'})
+    schema.migrate(conn)
+    populate(conn, screens, locations, customers=customers, seed=seed)
+    return conn
+
+def _measure(load) -> tuple[int, list]:
+    """
+    Returns the bytes still allocated after load() and its result, which is kept alive until measured.
+    """
+    tracemalloc.start()
+    try:
+        result = load()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return size, result
+
+def _read_dict_screens(conn) -> list[_DictScreen]:
+    """
+    Reads every screen into _DictScreen, the way Screen.read_all() used to.
+    """
+    rows = conn.execute("""SELECT ScreenID, LocationID, Quantity, Design, CustomerName, Description, InUse,
+        RowVersion FROM Screens""").fetchall()
+    return [_DictScreen(r[1], r[2], r[3], r[4], r[5], bool(r[6]), r[0], r[7]) for r in rows]
+
+def main(argv=None) -> dict:
+    """
+    Runs the benchmark and prints the comparison.
+
+    Returns:
+        results (dict): bytes held before and after, in total and per screen
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--screens', type=int, default=100000)
+    parser.add_argument('--customers', type=int, default=2000)
+    parser.add_argument('--locations', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    conn = _build_database(args.screens, args.customers, args.locations, args.seed)
+    before, _ = _measure(lambda: _read_dict_screens(conn))
+    after, _ = _measure(lambda: Screen.read_all(conn))
+    conn.close()
+
+    results = {
+        'screens': args.screens,
+        'before_bytes': before,
+        'after_bytes': after,
+        'before_per_screen': round(before / args.screens, 1),
+        'after_per_screen': round(after / args.screens, 1),
+        'saved_percent': round(100 * (before - after) / before, 1),
+    }
+    print(f"{args.screens} screens: {before / 2**20:.1f} MiB before, {after / 2**20:.1f} MiB after "
+          f"({results['before_per_screen']} -> {results['after_per_screen']} bytes per screen, "
+          f"{results['saved_percent']}% less)")
+    return results
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,328 @@
+"""
+Benchmark suite: times loading, Controller mutations, bulk operations, search, the
+filter/group step of MainView.refresh_display() and building the main window, against
+synthetic databases (see benchmarks.synthetic) at one or more scales.
+
+Results are written as JSON (progress and comparisons go to stderr) so runs of
+different versions can be compared.
+
+Run from the Application directory:
+    python -m benchmarks.suite --scale 1k --scale 10k --output before.json
+    python -m benchmarks.suite --scale 1k --scale 10k --output after.json --compare before.json
+
+Building the window needs a display. The suite uses $DISPLAY, or starts Xvfb when it is
+installed, and otherwise records the widget benchmarks as skipped.
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from benchmarks import synthetic
+from controller.controller import Controller
+from model import schema
+from model.location import Location
+from model.screen import Screen
+from view.filtering import filter_screens, group_by_location
+
+def _time(fn, repeat: int, setup=None, teardown=None, ops: int = 1) -> dict:
+    """
+    Times fn(setup()) repeat times, setup and teardown(state, result) are not timed.
+
+    Returns:
+        timing (dict): repeat, ops per run and min/median/mean seconds per run
+    """
+    times = []
+    for _ in range(repeat):
+        state = setup() if setup else None
+        start = time.perf_counter()
+        result = fn(state)
+        times.append(time.perf_counter() - start)
+        if teardown:
+            teardown(state, result)
+    return {
+        'repeat': repeat,
+        'ops': ops,
+        'min_s': min(times),
+        'median_s': statistics.median(times),
+        'mean_s': statistics.fmean(times),
+    }
+
+def _new_screen(rng: random.Random, location_id: int) -> Screen:
+    """
+    A screen that is not saved yet.
+    """
+    return Screen(location_id, rng.randint(1, 6), f"Bench {rng.randrange(10**6)}", "Bench Customer",
+                  "bench", False)
+
+def _run_scale(name: str, db_path: Path, repeat: int, sample: int, widgets: str | None,
+               full_limit: int) -> list[dict]:
+    """
+    Runs every benchmark against one database.
+
+    Arguments:
+        name (str): the scale, recorded with each result
+        db_path (Path): the synthetic database, which the mutations change
+        repeat (int): runs per benchmark
+        sample (int): screens touched by the mutation and bulk benchmarks
+        widgets (str | None): why widget benchmarks are skipped, None to run them
+        full_limit (int): skip building the "full" display mode above this many screens
+
+    Returns:
+        results (list[dict]): one entry per benchmark
+    """
+    results = []
+    def record(bench: str, timing: dict | None = None, skipped: str | None = None):
+        entry = {'scale': name, 'name': bench, **(timing or {})}
+        if skipped:
+            entry['skipped'] = skipped
+        results.append(entry)
+        if skipped:
+            print(f"  {bench:<32} skipped: {skipped}", file=sys.stderr)
+        else:
+            per_op = timing['median_s'] / timing['ops']
+            print(f"  {bench:<32} {timing['median_s'] * 1000:10.2f} ms"
+                  + (f"  ({per_op * 1000:.3f} ms/op)" if timing['ops'] > 1 else ""), file=sys.stderr)
+
+    settings = {'db_path': str(db_path), 'display_mode': 'virtual'}
+    rng = random.Random(1)
+
+    # reading
+    conn = schema.connect(str(db_path), settings)
+    record('read.screens', _time(lambda _: Screen.read_all(conn), repeat))
+    record('read.locations', _time(lambda _: Location.read_all(conn), repeat))
+    conn.close()
+    record('controller.load', _time(lambda _: Controller(settings=settings), repeat,
+                                    teardown=lambda _, controller: controller.close()))
+
+    controller = Controller(settings=settings)
+    try:
+        location_ids = list(controller.locations)
+
+        # single mutations, each its own transaction
+        added = []
+        def add(_):
+            for _ in range(sample):
+                screen = _new_screen(rng, rng.choice(location_ids))
+                controller.add_screen(screen)
+                added.append(screen)
+        record('controller.add_screen', _time(add, 1, ops=sample))
+        def update(_):
+            for screen in added:
+                screen.quantity += 1
+                controller.add_screen(screen)
+        record('controller.update_screen', _time(update, repeat, ops=len(added)))
+        def delete(_):
+            for screen in added:
+                controller.delete_screen(screen)
+        record('controller.delete_screen', _time(delete, 1, ops=len(added)))
+        locations = []
+        def add_locations(_):
+            for _ in range(10):
+                location = Location(f"Bench Location {rng.randrange(10**9)}")
+                controller.add_location(location)
+                locations.append(location)
+        record('controller.add_location', _time(add_locations, 1, ops=10))
+        def delete_locations(_):
+            for location in locations:
+                controller.delete_location(location)
+        record('controller.delete_location', _time(delete_locations, 1, ops=len(locations)))
+
+        # bulk operations, one transaction each
+        ids = [screen.screen_id for screen in rng.sample(controller.screens, min(sample, len(controller.screens)))]
+        flip = itertools.count()
+        record('bulk.update', _time(lambda _: controller.bulk_update(ids, in_use=next(flip) % 2 == 0), repeat,
+                                    ops=len(ids)))
+        record('bulk.move', _time(lambda _: controller.bulk_move(ids, rng.choice(location_ids)), repeat,
+                                  ops=len(ids)))
+        def add_doomed():
+            screens = [_new_screen(rng, rng.choice(location_ids)) for _ in range(sample)]
+            for screen in screens:
+                controller.add_screen(screen)
+            return [screen.screen_id for screen in screens]
+        record('bulk.delete', _time(lambda doomed: controller.bulk_delete(doomed), repeat, setup=add_doomed,
+                                    ops=sample))
+
+        # searching and the filter/group step of refresh_display
+        controller.search_index = None
+        record('search.first', _time(lambda _: controller.search("acme", ['customer']).result(), 1))
+        record('search.substring', _time(
+            lambda _: controller.search("ridge", ['design', 'customer', 'description']).result(), repeat))
+        everything = {'search_ids': None, 'loc_ids': set(), 'in_use': None}
+        record('refresh.filter_group.all', _time(
+            lambda _: group_by_location(filter_screens(controller.screens, everything), controller.locations), repeat))
+        filtered = {'search_ids': controller.search("acme", ['customer']).result(),
+                    'loc_ids': set(location_ids[::2]), 'in_use': True}
+        record('refresh.filter_group.filtered', _time(
+            lambda _: group_by_location(filter_screens(controller.screens, filtered), controller.locations), repeat))
+        screen_count = len(controller.screens)
+    finally:
+        controller.close()
+
+    # building the window, from an already loaded controller
+    for mode in ('virtual', 'full', 'table'):
+        bench = f'widgets.build.{mode}'
+        if widgets:
+            record(bench, skipped=widgets)
+        elif mode == 'full' and screen_count > full_limit:
+            record(bench, skipped=f"more than {full_limit} screens (--full-limit)")
+        else:
+            mode_settings = {**settings, 'display_mode': mode}
+            record(bench, _time(_build_view, min(repeat, 3), setup=lambda: Controller(settings=mode_settings),
+                                teardown=_destroy_view))
+    return results
+
+def _build_view(controller: Controller):
+    """
+    Builds the main window and waits until it is drawn.
+    """
+    from view.main_view import MainView
+    view = MainView(controller)
+    view.update()
+    return view
+
+def _destroy_view(controller: Controller, view) -> None:
+    """
+    Closes a window from _build_view() and its controller.
+    """
+    view.destroy()
+    controller.close()
+
+@contextmanager
+def _display(enabled: bool):
+    """
+    Makes a display available for the widget benchmarks, starting Xvfb if there is none.
+
+    Yields:
+        skipped (str | None): why widgets cannot be benchmarked, None if they can
+    """
+    if not enabled:
+        yield "disabled (--no-widgets)"
+        return
+    if os.environ.get('DISPLAY'):
+        yield None
+        return
+    xvfb = shutil.which('Xvfb')
+    if xvfb is None:
+        yield "no $DISPLAY and Xvfb is not installed"
+        return
+    # Xvfb picks a free display and writes its number to the pipe once it accepts connections
+    read_fd, write_fd = os.pipe()
+    process = subprocess.Popen([xvfb, '-displayfd', str(write_fd), '-screen', '0', '1920x1080x24', '-nolisten', 'tcp'],
+                               pass_fds=(write_fd,), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.close(write_fd)
+    try:
+        with os.fdopen(read_fd) as pipe:
+            number = pipe.readline().strip()
+        if not number:
+            yield "Xvfb did not start"
+            return
+        os.environ['DISPLAY'] = f":{number}"
+        try:
+            yield None
+        finally:
+            del os.environ['DISPLAY']
+    finally:
+        process.terminate()
+        process.wait()
+
+def _environment() -> dict:
+    """
+    Describes the machine and version the results were measured on.
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=Path(__file__).parent, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'time': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+    }
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[dict]:
+    """
+    Compares the median times of two result files.
+
+    Arguments:
+        baseline (dict): the results to compare against
+        current (dict): the new results
+        threshold (float): slowdown, as a fraction, counted as a regression
+
+    Returns:
+        regressions (list[dict]): the benchmarks that got slower by more than threshold
+    """
+    before = {(r['scale'], r['name']): r for r in baseline['results'] if 'median_s' in r}
+    regressions = []
+    print(f"\n{'scale':<6} {'benchmark':<32} {'before ms':>10} {'after ms':>10} {'change':>8}", file=sys.stderr)
+    for result in current['results']:
+        old = before.get((result['scale'], result['name']))
+        if old is None or 'median_s' not in result:
+            continue
+        change = result['median_s'] / old['median_s'] - 1 if old['median_s'] else 0.0
+        flag = "  REGRESSION" if change > threshold else ""
+        print(f"{result['scale']:<6} {result['name']:<32} {old['median_s'] * 1000:10.2f} "
+              f"{result['median_s'] * 1000:10.2f} {change:+8.1%}{flag}", file=sys.stderr)
+        if flag:
+            regressions.append({**result, 'baseline_median_s': old['median_s'], 'change': change})
+    return regressions
+
+def main(argv=None) -> int:
+    """
+    Runs the suite, writes the results and compares them with a baseline if given.
+
+    Returns:
+        status (int): 1 if a benchmark regressed against the baseline, otherwise 0
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', action='append', choices=synthetic.SCALES,
+                        help="data set size, may be repeated (default 1k and 10k)")
+    parser.add_argument('--repeat', type=int, default=5, help="runs per benchmark, the median is compared")
+    parser.add_argument('--sample', type=int, default=200, help="screens touched by mutation and bulk benchmarks")
+    parser.add_argument('--no-widgets', action='store_true', help="skip building the window")
+    parser.add_argument('--full-limit', type=int, default=10000,
+                        help="skip building the 'full' display mode above this many screens")
+    parser.add_argument('--output', help="write the results to this JSON file")
+    parser.add_argument('--compare', help="a results file from an earlier run to compare against")
+    parser.add_argument('--threshold', type=float, default=0.2, help="slowdown counted as a regression (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    scales = args.scale or ['1k', '10k']
+    results = []
+    with tempfile.TemporaryDirectory() as tmp, _display(not args.no_widgets) as widgets:
+        for scale in scales:
+            print(f"{scale}:", file=sys.stderr)
+            db_path = synthetic.generate(Path(tmp) / f"{scale}.db", **synthetic.SCALES[scale])
+            results += _run_scale(scale, db_path, args.repeat, args.sample, widgets, args.full_limit)
+    report = {'environment': _environment(), 'scales': {s: synthetic.SCALES[s] for s in scales},
+              'results': results}
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    else:
+        print(json.dumps(report, indent=2))
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        if compare(baseline, report, args.threshold):
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
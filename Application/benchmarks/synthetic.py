@@ -0,0 +1,128 @@
+"""
+Generates synthetic screen databases for the benchmarks.
+
+Customer names follow a Zipf-like skew (a few big customers own most screens, like the
+real data) and are drawn from a pool sized to the data set. Designs, descriptions and
+in-use flags are random but repeatable for a given seed.
+
+Run from the Application directory:
+    python -m benchmarks.synthetic bench.db --screens 100000 --locations 2000
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import random
+import sqlite3
+from pathlib import Path
+from model import schema
+
+SCALES = {
+    '1k': {'screens': 1000, 'locations': 10},
+    '10k': {'screens': 10000, 'locations': 100},
+    '100k': {'screens': 100000, 'locations': 2000},
+}
+
+_FIRST = ("Acme", "Blue Ridge", "Summit", "Lakeside", "Northwind", "Riverside", "Golden", "Pioneer",
+          "Harbor", "Evergreen", "Redwood", "Silver", "Maple", "Union", "Liberty", "Oak Hill")
+_SECOND = ("Printing", "Apparel", "Athletics", "Brewing", "Outfitters", "Academy", "Church", "Dental",
+           "Landscaping", "Auto", "Fitness", "Bakery", "Realty", "Marine", "Boosters", "Events")
+_MESHES = (110, 156, 200, 230, 305)
+_PLACEMENTS = ("Front", "Back", "Left Chest", "Sleeve", "Full Back", "Pocket")
+
+def customer_names(count: int) -> list[str]:
+    """
+    Returns count distinct customer names.
+    """
+    names = [f"{first} {second}" for first, second in itertools.product(_FIRST, _SECOND)]
+    n = len(names)
+    return [names[i] if i < n else f"{names[i % n]} {i // n + 1}" for i in range(count)]
+
+def populate(conn: sqlite3.Connection, screens: int, locations: int, customers: int | None = None,
+             skew: float = 1.1, in_use_ratio: float = 0.3, seed: int = 1, chunk_size: int = 10000) -> None:
+    """
+    Fills a migrated, empty database with synthetic locations and screens.
+
+    Arguments:
+        conn (sqlite3.Connection): connection to the database
+        screens (int): screens to create
+        locations (int): locations to create, each screen goes to one at random
+        customers (int | None): size of the customer pool, defaults to one per 50 screens
+        skew (float): Zipf exponent of the customer distribution, 0 for uniform
+        in_use_ratio (float): share of screens marked in use
+        seed (int): random seed, the same arguments always give the same data
+        chunk_size (int): screens per insert transaction
+    """
+    rng = random.Random(seed)
+    customers = customers or max(10, screens // 50)
+    names = customer_names(customers)
+    cum_weights = list(itertools.accumulate(1 / rank ** skew for rank in range(1, customers + 1)))
+    with conn:
+        conn.executemany("INSERT INTO Locations (Description) VALUES (?)",
+                         [(f"Rack {chr(65 + i % 26)}-{i // 26 + 1:03d}",) for i in range(locations)])
+    location_ids = [row[0] for row in conn.execute("SELECT LocationID FROM Locations")]
+    for start in range(0, screens, chunk_size):
+        rows = []
+        for i in range(start, min(start + chunk_size, screens)):
+            rows.append((f"SO-{100000 + i} {rng.choice(_PLACEMENTS)}", rng.choice(location_ids),
+                         rng.choices(names, cum_weights=cum_weights)[0], rng.randint(1, 6),
+                         f"{rng.choice(_MESHES)} mesh", 1 if rng.random() < in_use_ratio else 0))
+        with conn:
+            conn.executemany("""
+                INSERT INTO Screens (Design, LocationID, CustomerName, Quantity, Description, InUse)
+                VALUES (?, ?, ?, ?, ?, ?)""", rows)
+
+def generate(path: str, screens: int, locations: int, overwrite: bool = False, **options) -> Path:
+    """
+    Creates a database file holding synthetic data, with the current schema.
+
+    Arguments:
+        path (str): the file to create
+        screens (int): screens to create
+        locations (int): locations to create
+        overwrite (bool): replace the file if it exists, otherwise that is an error
+        **options: passed to populate()
+
+    Returns:
+        path (Path): the database file
+
+    Raises:
+        FileExistsError: the file exists and overwrite is False
+    """
+    path = Path(path)
+    if path.exists():
+        if not overwrite:
+            raise FileExistsError(f"{path} already exists")
+        for stale in (path, path.with_name(path.name + '-wal'), path.with_name(path.name + '-shm')):
+            stale.unlink(missing_ok=True)
+    conn = schema.connect(str(path), {})
+    try:
+        schema.migrate(conn)
+        populate(conn, screens, locations, **options)
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    finally:
+        conn.close()
+    return path
+
+def main(argv=None) -> None:
+    """
+    Generates one database from the command line.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('path')
+    parser.add_argument('--scale', choices=SCALES, help="preset screen and location counts")
+    parser.add_argument('--screens', type=int, default=10000)
+    parser.add_argument('--locations', type=int, default=100)
+    parser.add_argument('--customers', type=int, help="customer pool size, defaults to one per 50 screens")
+    parser.add_argument('--skew', type=float, default=1.1, help="Zipf exponent of customer names, 0 for uniform")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--overwrite', action='store_true')
+    args = parser.parse_args(argv)
+
+    counts = SCALES[args.scale] if args.scale else {'screens': args.screens, 'locations': args.locations}
+    path = generate(args.path, overwrite=args.overwrite, customers=args.customers, skew=args.skew,
+                    seed=args.seed, **counts)
+    print(f"{path}: {counts['screens']} screens in {counts['locations']} locations")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,209 @@
+"""
+Headless command line for scripting, e.g. from the order system. Prints JSON to stdout.
+Never imports tkinter and never loads every screen, so it starts quickly enough to run per order line.
+The read commands (search, locate, stats, export) open the database read-only and never migrate it.
+
+Usage (from the Application directory, or Main.py --cli ...):
+    python cli.py search <text> [--fields design,customer] [--in-use | --not-in-use] [--location NAME] [--limit N]
+    python cli.py locate <design>
+    python cli.py move <screen_id>... --to <location>
+    python cli.py set-in-use <screen_id>... [--off]
+    python cli.py stats
+    python cli.py import <file.csv> [--no-create-locations] [--rejects FILE]
+    python cli.py export <file> [--format csv|jsonl] [--search TEXT] [search's filters]
+
+Errors are printed as {"error": "..."} with exit status 1.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from controller.controller import Controller
+from model.screen import Screen
+from model.screen_query import ScreenQuery
+
+def _screen_json(controller: Controller, screen: Screen) -> dict:
+    """
+    Converts a screen to the JSON the commands print.
+    """
+    location = controller.locations.get(screen.location_id)
+    return {
+        'screen_id': screen.screen_id,
+        'design': screen.design,
+        'customer': screen.customer,
+        'description': screen.description,
+        'quantity': screen.quantity,
+        'in_use': screen.in_use,
+        'location_id': screen.location_id,
+        'location': location.description if location is not None else None,
+    }
+
+def _location_id(controller: Controller, name: str) -> int:
+    """
+    Looks up a location by description, case-insensitive.
+    """
+    location = controller.locations_by_folded_name.get(name.casefold())
+    if location is None:
+        raise ValueError(f"Unknown location: {name}")
+    return location.location_id
+
+def _query(controller: Controller, query: ScreenQuery, limit: int | None) -> list[dict]:
+    """
+    Runs query and returns up to limit matching screens as JSON.
+    """
+    screens, _ = controller.query_screens(query, limit=limit).result()
+    return [_screen_json(controller, screen) for screen in screens]
+
+def _filter_query(controller: Controller, args, text: str) -> ScreenQuery:
+    """
+    Builds the ScreenQuery for the sidebar-style filter options (see _add_filter_arguments).
+    """
+    in_use = True if args.in_use else False if args.not_in_use else None
+    location_ids = {_location_id(controller, name) for name in args.location} if args.location else None
+    return ScreenQuery(location_ids=location_ids, in_use=in_use, search=text,
+                       fields=args.fields.split(','),
+                       prefix=controller.prefix_search())
+
+def search(controller: Controller, args) -> dict:
+    """
+    search: screens containing the text, with the same filters as the sidebar.
+    """
+    return {'screens': _query(controller, _filter_query(controller, args, args.text), args.limit)}
+
+def locate(controller: Controller, args) -> dict:
+    """
+    locate: the screens with exactly this design, and where they are.
+    """
+    return {'screens': _query(controller, ScreenQuery(design=args.design), None)}
+
+def move(controller: Controller, args) -> dict:
+    """
+    move: moves screens to a location in one transaction.
+    """
+    moved = controller.bulk_move(args.screen_ids, _location_id(controller, args.to)).result()
+    return {'requested': len(set(args.screen_ids)), 'moved': moved}
+
+def set_in_use(controller: Controller, args) -> dict:
+    """
+    set-in-use: marks screens in use, or not in use with --off, in one transaction.
+    """
+    updated = controller.bulk_update(args.screen_ids, in_use=not args.off).result()
+    return {'requested': len(set(args.screen_ids)), 'updated': updated, 'in_use': not args.off}
+
+def stats(controller: Controller, args) -> dict:
+    """
+    stats: screen counts, in total, in use and per location.
+    """
+    def read(connection):
+        return ScreenQuery().count_by_location(connection), ScreenQuery(in_use=True).count(connection)
+    per_location, in_use = controller.run(read, name='stats').result()
+    return {
+        'screens': sum(per_location.values()),
+        'in_use': in_use,
+        'locations': len(controller.locations),
+        'by_location': {location.description: per_location.get(location_id, 0)
+                        for location_id, location in controller.locations.items()},
+    }
+
+def import_csv(controller: Controller, args) -> dict:
+    """
+    import: imports screens from a CSV file (see model.csv_import), progress goes to stderr.
+    """
+    def progress(report):
+        print(f"{report.rows_read} rows read, {report.imported} imported", file=sys.stderr)
+    report = controller.import_csv(args.file, progress=progress, rejects_path=args.rejects,
+                                   create_locations=not args.no_create_locations).result()
+    return report.as_dict()
+
+def export_screens(controller: Controller, args) -> dict:
+    """
+    export: streams the screens matching the filters to a CSV or JSON Lines file.
+    """
+    fmt = args.format or ('jsonl' if args.file.lower().endswith('.jsonl') else 'csv')
+    query = _filter_query(controller, args, args.search)
+    exported = controller.export_screens(query, args.file, fmt).result()
+    return {'file': args.file, 'format': fmt, 'exported': exported}
+
+def _add_filter_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Adds the sidebar-style filter options shared by search and export.
+    """
+    parser.add_argument('--fields', default='design,customer,description',
+                        help="comma separated, any of design, customer, description")
+    usage = parser.add_mutually_exclusive_group()
+    usage.add_argument('--in-use', action='store_true')
+    usage.add_argument('--not-in-use', action='store_true')
+    parser.add_argument('--location', action='append', help="only this location, may be repeated")
+
+def _parser() -> argparse.ArgumentParser:
+    """
+    Builds the argument parser with one subcommand per function above.
+    """
+    parser = argparse.ArgumentParser(prog='cli', description="Screen Locator command line, prints JSON.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    p = commands.add_parser('search', help="screens containing text")
+    p.add_argument('text')
+    _add_filter_arguments(p)
+    p.add_argument('--limit', type=int, default=None)
+    p.set_defaults(run=search, read_only=True)
+
+    p = commands.add_parser('locate', help="where the screens with exactly this design are")
+    p.add_argument('design')
+    p.set_defaults(run=locate, read_only=True)
+
+    p = commands.add_parser('move', help="move screens to a location")
+    p.add_argument('screen_ids', type=int, nargs='+')
+    p.add_argument('--to', required=True, help="destination location")
+    p.set_defaults(run=move, read_only=False)
+
+    p = commands.add_parser('set-in-use', help="mark screens in use (or not, with --off)")
+    p.add_argument('screen_ids', type=int, nargs='+')
+    p.add_argument('--off', action='store_true')
+    p.set_defaults(run=set_in_use, read_only=False)
+
+    p = commands.add_parser('stats', help="screen counts")
+    p.set_defaults(run=stats, read_only=True)
+
+    p = commands.add_parser('import', help="import screens from CSV")
+    p.add_argument('file')
+    p.add_argument('--no-create-locations', action='store_true', help="reject rows for unknown locations")
+    p.add_argument('--rejects', help="write rejected rows to this CSV file")
+    p.set_defaults(run=import_csv, read_only=False)
+
+    p = commands.add_parser('export', help="export screens to CSV or JSON Lines")
+    p.add_argument('file')
+    p.add_argument('--format', choices=('csv', 'jsonl'), help="defaults from the file extension")
+    p.add_argument('--search', default="", help="only screens containing this text")
+    _add_filter_arguments(p)
+    p.set_defaults(run=export_screens, read_only=True)
+    return parser
+
+def main(argv=None, settings: dict | None = None) -> int:
+    """
+    Runs one command.
+
+    Arguments:
+        argv (list[str] | None): the arguments after the program name, None for sys.argv
+        settings (dict | None): used instead of config/settings.json, e.g. by tests
+
+    Returns:
+        status (int): 0 on success, 1 on error
+    """
+    args = _parser().parse_args(argv)
+    controller = None
+    try:
+        controller = Controller(load_screens=False, settings=settings, read_only=args.read_only)
+        result = args.run(controller, args)
+    except Exception as e:
+        print(json.dumps({'error': str(e)}))
+        return 1
+    finally:
+        if controller is not None:
+            controller.close()
+    print(json.dumps(result, indent=2))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
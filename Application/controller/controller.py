@@ -1,8 +1,21 @@
+from __future__ import annotations
+
+import logging
+import os
 import sqlite3
 import sys
+from concurrent.futures import Future
+from contextlib import contextmanager
 from model.screen import Screen
 from model.location import Location
-from pathlib import Path
+from model import schema
+from model.errors import ConflictError
+from model.screen_query import ScreenQuery
+from controller.db_worker import DatabaseWorker
+from controller.diagnostics import Diagnostics
+from controller.events import ChangeEvent
+from controller.search_index import TrigramIndex
+from controller.write_behind import PendingWrites
 import json
 
 class Controller:
@@ -11,45 +24,458 @@ class Controller:
     their intended tasks.
 
     Attributes:
-        config_path (Path): the path to the config (../config/settings.json on this machine)
-        connection (sqlite3.Connection): the sqlite3 db connection
+        config_path (str): the path to the config (../config/settings.json on this machine)
+        settings (dict[str, Any]): the config as loaded from settings.json
+        worker (DatabaseWorker): owns the sqlite3 db connection and runs every query on its own thread
         screens (list[Screen]): a list of screens in the database 
         locations (Dict[int, Location]): a list of locations in the database    
         observers (list[Any]): a list of observers to be notified when data is changed
+        scheduler (Callable | None): defers coalesced notifications (e.g. Tk's after_idle), None notifies immediately
+        dispatcher (Callable | None): schedules a callback after a delay on the UI thread (e.g. Tk's after),
+            None makes every database operation wait for its result
+        search_index (TrigramIndex | None): substring index over self.screens, built on first search
+        load_screens (bool): False when the view pages screens from the db (display_mode "paged"),
+            self.screens then only holds screens added this session
+        location_names (list[str]): every location description, sorted like self.locations, for dropdowns
+        locations_by_name (dict[str, Location]): locations by exact description
+        locations_by_folded_name (dict[str, Location]): locations by casefolded description, for uniqueness checks
+        screen_ids_by_location (dict[int, set[int]]): ids of the loaded screens in each location
+        diagnostics (Diagnostics): timers around database jobs and notifications, see settings "diagnostics"
+        pending_writes (PendingWrites): in-use changes from set_in_use() not yet written to the database
     """
 
-    def __init__(self):
+    def __init__(self, load_screens: bool | None = None, settings: dict | None = None, load: bool = True,
+                 maintain: bool = False, read_only: bool = False):
         """
         Initializes a new controller. 
+
+        Arguments:
+            load_screens (bool | None): whether to read every screen into memory, None decides
+                from display_mode in settings.json; tools that query the database directly pass False
+            settings (dict | None): settings.json as already loaded by the caller (Main, the benchmarks),
+                None reads it here; must hold db_path
+            load (bool): open the database and read it before returning, False leaves that to
+                open_database() so a window can be shown first
+            maintain (bool): this is the interactive session (Main): journal in-use changes and
+                write those a crashed session left, prune the change log and create or drop the
+                search index to match search_mode; the command line and the benchmarks leave it False
+            read_only (bool): open the database with mode=ro and never migrate it, for the command
+                line's read commands; fails if the schema is not up to date
         """
-        # Determine config path (handles PyInstaller frozen executable)
+        # Determine config path (handles PyInstaller frozen executable);
+        # os.path rather than pathlib, which the command line would otherwise import just for this
         if getattr(sys, 'frozen', False):
-            base_dir = Path(sys.executable).parent
+            base_dir = os.path.dirname(sys.executable)
         else:
-            base_dir = Path(__file__).parent.parent
-        config_dir = base_dir / 'config'
-        config_dir.mkdir(parents=True, exist_ok=True)
-        self.config_path = config_dir / 'settings.json'
-        if not self.config_path.exists():
-            # create stub so json.load won't fail later
-            self.config_path.write_text('{}')
-
-        config = self.__load_config()
-        db_path = config["db_path"]
-
-        self.connection = sqlite3.connect(db_path)
+            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        config_dir = os.path.join(base_dir, 'config')
+        os.makedirs(config_dir, exist_ok=True)
+        self.config_path = os.path.join(config_dir, 'settings.json')
+        if settings is None:
+            if not os.path.exists(self.config_path):
+                # create stub so json.load won't fail later
+                with open(self.config_path, 'w') as f:
+                    f.write('{}')
+            settings = self.__load_config()
+        self.settings = settings
+
         self.screens = []
         self.observers = []
         self.locations = dict()
+        self.location_names = []
+        self.locations_by_name = {}
+        self.locations_by_folded_name = {}
+        self.screen_ids_by_location = {}
+        self._filed_names = {}      # location id -> description it is filed under in the name indexes
+        self._filed_locations = {}  # screen id -> location id it is filed under in screen_ids_by_location
+        self.search_index = None
+        if load_screens is None:
+            load_screens = self.get_setting('display_mode', 'virtual') != 'paged'
+        self.load_screens = load_screens
+
+        self.scheduler = None
+        self._batch_depth = 0
+        self._pending_events = []
+        self._notify_scheduled = False
+
+        log_path = self.get_setting('diagnostics_log')
+        self.diagnostics = Diagnostics(
+            enabled=self.get_setting('diagnostics', False),
+            log_path=os.path.join(config_dir, log_path) if log_path else None,
+            max_bytes=self.get_setting('diagnostics_log_max_bytes', 1_000_000),
+            backups=self.get_setting('diagnostics_log_backups', 3))
+        self.diagnostics.gauge('screens.loaded', lambda: len(self.screens))
+        self.diagnostics.gauge('locations.loaded', lambda: len(self.locations))
+        self.diagnostics.gauge('db.in_flight', lambda: len(self._in_flight))
+
+        self.dispatcher = None
+        self._in_flight = []  # (worker future, apply, caller's future), in submission order
+        self._results_scheduled = False
+        self._sync_future = None
+        self._opened = False
+        # what the open connection offers, read on the worker and assigned on the UI thread
+        self._change_log = False
+        self._last_seq = 0
+        self._data_version = None
+        self._fts = False
+
+        self.maintain = maintain
+        self.read_only = read_only
+        journal = self.get_setting('write_behind_journal', 'unsaved_changes.jsonl') if maintain else None
+        self.pending_writes = PendingWrites(self.settings.get('db_path', ''),
+                                            os.path.join(config_dir, journal) if journal else None)
+        self._flush_scheduled = False
+        self.diagnostics.gauge('writes.unsaved', lambda: len(self.pending_writes))
+
+        self.worker = DatabaseWorker()
+        if load:
+            self.open_database().result()
+
+    def open_database(self) -> Future:
+        """
+        Opens the database at db_path from the settings and reads everything from it.
+
+        Returns:
+            future (Future): resolves once loaded, fails if the database could not be opened or read
+        """
+        self.pending_writes.db_path = self.settings["db_path"]
+        return self._open(self.settings["db_path"], recover=True)
+
+    def _open(self, db_path: str, opened=None, recover: bool = False) -> Future:
+        """
+        Opens db_path on the worker, replacing the current connection, and reads everything from it.
+
+        Arguments:
+            db_path (str): path to the sqlite db
+            opened (Callable | None): runs on the UI thread once the database is open, before the data is applied
+            recover (bool): first write the changes the journal holds for pending_writes.db_path
+
+        Returns:
+            future (Future): resolves once loaded, fails if the database could not be opened or read
+        """
+        connected = self.worker.open(self._connect, db_path)
+
+        def read(connection):
+            # jobs run in order, so opening has finished; re-raise why it failed, if it did
+            connected.result()
+            if recover:
+                self._write_recovered(connection)
+            state = self._connection_state(connection)
+            return state, self._read_everything(connection, state['change_log'])
+
+        def apply(result):
+            state, data = result
+            if opened is not None:
+                opened()
+            self._change_log = state['change_log']
+            self._data_version = state['data_version']
+            self._fts = state['fts']
+            self._opened = True
+            self._apply_everything(data)
+
+        return self.run(read, name='open_database', apply=apply)
+
+    @staticmethod
+    def _connection_state(connection: sqlite3.Connection) -> dict:
+        """
+        Worker side of _open(): what the newly opened database offers.
+
+        Returns:
+            state (dict): 'change_log' and 'fts' availability, and the 'data_version' to poll against
+        """
+        return {
+            'change_log': schema.has_change_log(connection),
+            'data_version': connection.execute("PRAGMA data_version").fetchone()[0],
+            'fts': schema.has_search_index(connection),
+        }
+
+    def _write_recovered(self, connection: sqlite3.Connection):
+        """
+        Writes the in-use changes a previous session left unsaved in the journal, before the
+        database is read. They stay journaled if the write fails.
+        """
+        recovered = self.pending_writes.recover()
+        if not recovered:
+            return
+        try:
+            Screen.set_in_use_many(connection, recovered)
+        except sqlite3.Error as e:
+            print(f"Error saving {len(recovered)} recovered in-use changes: {e}")
+            return
+        self.pending_writes.committed(recovered)
+        print(f"Saved {len(recovered)} in-use changes left unsaved by the last session")
+
+    def close(self):
+        """
+        Writes the pending in-use changes, waits for the queued database work to finish and
+        closes the connection.
+        """
+        # the window is gone by now: write without the dispatcher and tell no observer
+        self.dispatcher = None
+        self.observers = []
+        self.flush_writes()
+        self.worker.close()
+        self.pending_writes.close()
+        self.diagnostics.close()
+
+    def set_scheduler(self, scheduler):
+        """
+        Sets the function used to defer notifications, e.g. a Tk widget's after_idle.
 
-        self.update_screens_and_locations()
+        Arguments:
+            scheduler (Callable[[Callable], Any]): called with the function to run later
+        """
+        self.scheduler = scheduler
+
+    def set_dispatcher(self, dispatcher):
+        """
+        Makes database operations asynchronous. Their results are picked up on the
+        UI thread by polling through dispatcher, e.g. a Tk widget's after.
+
+        Arguments:
+            dispatcher (Callable[[int, Callable], Any]): called with a delay in ms and the function to run
+        """
+        self.dispatcher = dispatcher
+
+    @property
+    def busy(self) -> bool:
+        """
+        True while database operations are pending.
+        """
+        return bool(self._in_flight)
+
+    def run(self, job, *args, name: str, apply=None, flush: bool = True) -> Future:
+        """
+        Runs job(connection, *args) on the database worker thread.
+        apply(result) then runs on the UI thread, which is where the controller's data
+        (screens, locations, index) may be changed.
+        Without a dispatcher this waits for the job, otherwise it returns at once.
+
+        Arguments:
+            job (Callable): the database work, receives the connection as its first argument
+            *args: passed to job after the connection
+            name (str): what diagnostics times the job and apply under, as db.<name> and apply.<name>
+            apply (Callable | None): receives the job's result, its return value resolves the future
+            flush (bool): write the pending in-use changes first; reads whose screens get
+                _keep_pending() pass False, so they don't cut the write-behind delay short
+
+        Returns:
+            future (Future): resolves once apply has run, to its result (or the job's if apply is None),
+                or to the exception either raised
+        """
+        if flush and self.pending_writes.waiting():
+            # anything this job reads or writes sees the toggles made before it
+            self.flush_writes()
+        if self.diagnostics.enabled:
+            job = self.diagnostics.wrap(f"db.{name}", job)
+            if apply is not None:
+                apply = self.diagnostics.wrap(f"apply.{name}", apply)
+        return self._track(self.worker.submit(job, *args), apply)
+
+    def _resolved(self, result=None) -> Future:
+        """
+        Returns a finished future, for operations that need no database work.
+        """
+        future = Future()
+        future.set_result(result)
+        return future
+
+    def _track(self, job_future: Future, apply=None) -> Future:
+        """
+        Wraps a worker future so apply and the caller's callbacks run on the UI thread.
+        """
+        future = Future()
+        if self.dispatcher is None:
+            self._complete(job_future, apply, future)
+            return future
+        was_busy = self.busy
+        self._in_flight.append((job_future, apply, future))
+        if not was_busy:
+            self._notify_busy(True)
+        self._schedule_results()
+        return future
+
+    def _schedule_results(self):
+        """
+        Polls for finished jobs through the dispatcher while any are pending.
+        """
+        if not self._results_scheduled:
+            self._results_scheduled = True
+            self.dispatcher(self.get_setting('db_poll_ms', 15), self._process_results)
 
-    def notify_observers(self):
+    def _process_results(self):
+        """
+        Completes finished jobs on the UI thread. Jobs finish in submission order, and are
+        completed in that order too.
         """
-        Executes the data_updated() function for all observers.
+        self._results_scheduled = False
+        with self.batch():
+            while self._in_flight and self._in_flight[0][0].done():
+                job_future, apply, future = self._in_flight.pop(0)
+                self._complete(job_future, apply, future)
+        if self._in_flight:
+            self._schedule_results()
+        else:
+            self._notify_busy(False)
+
+    def _complete(self, job_future: Future, apply, future: Future):
         """
+        Waits for job_future, runs apply and resolves future.
+        """
+        try:
+            result = job_future.result()
+            if apply is not None:
+                result = apply(result)
+        except ConflictError as e:
+            # expected with several workstations, the caller resolves it
+            logging.getLogger(__name__).debug("Conflict in database operation: %s", e)
+            future.set_exception(e)
+        except Exception as e:
+            print(f"Error in database operation: {e}")
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+
+    def set_in_use(self, screen: Screen, in_use: bool):
+        """
+        Marks a screen in use or not. The model and observers are updated at once, the database
+        write is deferred (see flush_writes()) so rapid toggles share one transaction and a
+        screen toggled back and forth is not written at all.
+
+        Arguments:
+            screen (Screen): a screen already in the database
+            in_use (bool): the new value
+        """
+        in_use = bool(in_use)
+        if screen.in_use == in_use:
+            return
+        self.pending_writes.set(screen.screen_id, in_use, original=screen.in_use)
+        screen.in_use = in_use
+        self._index_screen(screen)
+        self.notify_observers(ChangeEvent(ChangeEvent.SCREEN_UPDATED, screen.screen_id, screen.location_id))
+        self._notify_unsaved()
+        if self.dispatcher is None:
+            self.flush_writes()
+        elif not self._flush_scheduled:
+            # a fixed delay from the first change, further toggles don't push it back
+            self._flush_scheduled = True
+            self.dispatcher(self.get_setting('write_behind_ms', 1500), self._flush_timer)
+
+    def _flush_timer(self):
+        self._flush_scheduled = False
+        self.flush_writes()
+
+    def flush_writes(self) -> Future:
+        """
+        Writes the pending in-use changes in one transaction. Runs on a timer after set_in_use(),
+        before any other database job, and at close(). Changes whose write fails are kept
+        and retried on the next flush.
+
+        Returns:
+            future (Future[int]): number of screens written
+        """
+        changes = self.pending_writes.take()
+        if not changes:
+            return self._resolved(0)
+        # the write bumps RowVersion; keep the loaded screens in step so their next versioned save applies
+        screens = [s for s in self.screens if s.screen_id in changes]
+        for screen in screens:
+            screen.row_version += 1
+
+        def write(connection):
+            updated = Screen.set_in_use_many(connection, changes)
+            self.pending_writes.committed(changes)
+            return updated
+
+        def done(future):
+            if future.exception() is not None:
+                for screen in screens:
+                    screen.row_version -= 1
+                self.pending_writes.restore(changes)
+            self._notify_unsaved()
+
+        future = self.run(write, name='flush_writes')
+        future.add_done_callback(done)
+        return future
+
+    def _keep_pending(self, screens: list[Screen]):
+        """
+        Reapplies unsaved toggles to freshly read screens, for toggles made while the read was running.
+        """
+        if not len(self.pending_writes):
+            return
+        for screen in screens:
+            pending = self.pending_writes.value(screen.screen_id)
+            if pending is not None:
+                screen.in_use = pending
+
+    def _notify_unsaved(self):
+        """
+        Tells observers that implement unsaved_changed() how many screens have changes not yet saved.
+        """
+        count = len(self.pending_writes)
         for observer in self.observers:
-            observer.data_updated()
+            callback = getattr(observer, 'unsaved_changed', None)
+            if callback is not None:
+                callback(count)
+
+    def _notify_busy(self, busy: bool):
+        """
+        Tells observers that implement busy_changed() that database work started or finished.
+        """
+        for observer in self.observers:
+            callback = getattr(observer, 'busy_changed', None)
+            if callback is not None:
+                callback(busy)
+
+    @contextmanager
+    def batch(self):
+        """
+        Collects notifications raised inside the block (including nested batches)
+        and delivers a single one when the outermost block exits.
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._pending_events:
+                self._schedule_notify()
+
+    def notify_observers(self, event: ChangeEvent | None = None):
+        """
+        Requests a data_updated() callback for all observers.
+        Requests made inside batch() or before a scheduled callback runs are coalesced into one,
+        which receives every event in order.
+
+        Arguments:
+            event (ChangeEvent | None): what changed, None means everything may have changed
+        """
+        self._pending_events.append(event if event is not None else ChangeEvent(ChangeEvent.RELOADED))
+        if self._batch_depth == 0:
+            self._schedule_notify()
+
+    def _schedule_notify(self):
+        """
+        Runs the pending notification now, or on the scheduler if one is set.
+        """
+        if self.scheduler is None:
+            self._flush_notifications()
+        elif not self._notify_scheduled:
+            self._notify_scheduled = True
+            self.scheduler(self._flush_notifications)
+
+    def _flush_notifications(self):
+        """
+        Executes the data_updated() function for all observers with the pending events.
+        """
+        self._notify_scheduled = False
+        if not self._pending_events:
+            return
+        events, self._pending_events = self._pending_events, []
+        with self.diagnostics.timer('notify'):
+            for observer in self.observers:
+                observer.data_updated(events)
 
     def __load_config(self):
         """
@@ -71,85 +497,732 @@ class Controller:
         with open(self.config_path, "w") as f:
             json.dump(config, f, indent=2)
 
-    def update_db_path(self, new_path: str):
-        if (self.connection):
-            self.connection.close()
+    def get_setting(self, key: str, default=None):
+        """
+        Returns a value from settings.json.
+
+        Arguments:
+            key (str): the setting name
+            default (Any): returned when the setting is not present
+
+        Returns:
+            value (Any): the configured value or default
+        """
+        return self.settings.get(key, default)
+
+    def _connect(self, db_path: str) -> sqlite3.Connection:
+        """
+        Opens the database with the tunables from settings.json and migrates its schema.
+        If the database cannot be written (e.g. a read-only share) it is used as it is,
+        and without a change log sync() falls back to full reloads.
+        The maintaining session also prunes the change log, and creates the search index
+        for search_mode "prefix" or drops it otherwise. A read-only controller opens it with
+        mode=ro and only checks that the schema is current.
+
+        Arguments:
+            db_path (str): path to the sqlite db
+
+        Returns:
+            connection (sqlite3.Connection): the open connection
+        """
+        connection = schema.connect(db_path, self.settings, read_only=self.read_only)
+        if self.read_only:
+            if not schema.is_current(connection):
+                connection.close()
+                raise ValueError(f"The database schema is out of date, "
+                                 f"open {db_path} in the application once to upgrade it")
+            return connection
+        try:
+            schema.migrate(connection)
+        except sqlite3.OperationalError as e:
+            print(f"Could not upgrade the database schema: {e}")
+        if self.maintain and schema.has_change_log(connection):
+            try:
+                schema.prune_change_log(connection, self.get_setting('change_log_retention', 50000))
+            except sqlite3.OperationalError as e:
+                print(f"Could not prune the change log: {e}")
+
+        if self.maintain:
+            self._maintain_search_index(connection)
+        return connection
+
+    def _maintain_search_index(self, connection: sqlite3.Connection):
+        """
+        Creates the FTS5 index when search_mode is "prefix" and drops it (with its triggers) when not.
+        """
+        try:
+            if self.get_setting('search_mode', 'substring') == 'prefix':
+                if not schema.ensure_search_index(connection):
+                    print("Search index unavailable (no FTS5), falling back to substring search")
+            elif schema.has_search_index(connection):
+                schema.drop_search_index(connection)
+        except sqlite3.OperationalError as e:
+            print(f"Could not update the search index: {e}")
+
+    def prefix_search(self) -> bool:
+        """
+        Returns True if searches match word prefixes through the FTS5 index: search_mode
+        is "prefix" in settings.json and the open database has the index.
+        """
+        return self._fts and self.get_setting('search_mode', 'substring') == 'prefix'
+
+    def search(self, text: str, fields, within: set[int] | None = None) -> Future:
+        """
+        Finds the screens matching the search text in any of the given fields.
+        By default the text is matched as a case-insensitive substring using the in-memory
+        trigram index, and the future is already resolved. With search_mode "prefix" in
+        settings.json the FTS5 index is used instead (every word must start a word in one
+        of the fields), when available; that lookup runs on the database worker.
+
+        Arguments:
+            text (str): the search text
+            fields (Iterable[str]): any of 'design', 'customer', 'description'
+            within (set[int] | None): ids known to contain every match, e.g. the result of a
+                previous search for a substring of text; substring searches only check these
+
+        Returns:
+            future (Future[set[int]]): ids of the matching screens
+        """
+        fields = list(fields)
+        if self.prefix_search():
+            query = schema.build_search_query(text, fields)
+            if query is not None:
+                # matching ignores in_use, the pending toggles needn't be written first
+                return self.run(schema.search_screen_ids, query, name='search', flush=False)
+        if self.search_index is None:
+            with self.diagnostics.timer('search.index_build'):
+                self.search_index = TrigramIndex()
+                self.search_index.rebuild(self.screens)
+        if within is not None:
+            return self._resolved(self.search_index.search_within(text, fields, within))
+        return self._resolved(self.search_index.search(text, fields))
+
+    def query_screens(self, query: ScreenQuery, after: tuple | None = None,
+                      limit: int | None = 200) -> Future:
+        """
+        Reads one page of screens matching query straight from the database.
+
+        Arguments:
+            query (ScreenQuery): the filters
+            after (tuple | None): key returned with the previous page, None for the first page
+            limit (int | None): page size, None for every remaining row
+
+        Returns:
+            future (Future[tuple[list[Screen], tuple | None]]): the screens and the key of the next page (None at the end)
+        """
+        def apply(page):
+            self._keep_pending(page[0])
+            return page
+
+        # the toggles still pending are applied to the rows read rather than written first,
+        # so re-reading the paged display after a toggle keeps the write-behind delay
+        return self.run(query.fetch_page, after, limit, name='query_screens', apply=apply, flush=False)
+
+    def screen_count(self, location_id: int) -> int:
+        """
+        Returns:
+            count (int): number of loaded screens in the location (in paged mode only those added this session)
+        """
+        return len(self.screen_ids_by_location.get(location_id, ()))
+
+    def _index_screen(self, screen: Screen):
+        """
+        Files a new or changed screen under its location, and in the trigram index if it has been built.
+        """
+        old = self._filed_locations.get(screen.screen_id)
+        if old != screen.location_id:
+            if old is not None:
+                self._discard_screen_id(old, screen.screen_id)
+            self.screen_ids_by_location.setdefault(screen.location_id, set()).add(screen.screen_id)
+            self._filed_locations[screen.screen_id] = screen.location_id
+        if self.search_index is not None:
+            self.search_index.add(screen)
+
+    def _unindex_screen(self, screen_id: int):
+        """
+        Removes a screen from the location and trigram indexes.
+        """
+        old = self._filed_locations.pop(screen_id, None)
+        if old is not None:
+            self._discard_screen_id(old, screen_id)
+        if self.search_index is not None:
+            self.search_index.remove(screen_id)
+
+    def _discard_screen_id(self, location_id: int, screen_id: int):
+        """
+        Drops a screen id from screen_ids_by_location, and the location's entry once empty.
+        """
+        ids = self.screen_ids_by_location.get(location_id)
+        if ids is not None:
+            ids.discard(screen_id)
+            if not ids:
+                del self.screen_ids_by_location[location_id]
+
+    def _reindex_screens(self):
+        """
+        Rebuilds the location index after self.screens was replaced.
+        The trigram index is rebuilt lazily on the next search.
+        """
+        self.screen_ids_by_location = {}
+        self._filed_locations = {}
+        for screen in self.screens:
+            self.screen_ids_by_location.setdefault(screen.location_id, set()).add(screen.screen_id)
+            self._filed_locations[screen.screen_id] = screen.location_id
+        self.search_index = None
+
+    def _index_location(self, location: Location):
+        """
+        Files a new or renamed location in the name indexes.
+        """
+        old = self._filed_names.get(location.location_id)
+        if old == location.description:
+            return
+        if old is not None:
+            self._unindex_location(location.location_id)
+        self.locations_by_name[location.description] = location
+        self.locations_by_folded_name[location.description.casefold()] = location
+        self._filed_names[location.location_id] = location.description
+
+    def _unindex_location(self, location_id: int):
+        """
+        Removes a location from the name indexes.
+        """
+        old = self._filed_names.pop(location_id, None)
+        if old is None:
+            return
+        if getattr(self.locations_by_name.get(old), 'location_id', None) == location_id:
+            del self.locations_by_name[old]
+        if getattr(self.locations_by_folded_name.get(old.casefold()), 'location_id', None) == location_id:
+            del self.locations_by_folded_name[old.casefold()]
+
+    def _reindex_locations(self):
+        """
+        Rebuilds the name indexes after self.locations was replaced.
+        """
+        self.locations_by_name = {}
+        self.locations_by_folded_name = {}
+        self._filed_names = {}
+        for location in self.locations.values():
+            self._index_location(location)
+
+    def update_db_path(self, new_path: str) -> Future:
+        """
+        Switches to another database and reloads everything from it.
+        The setting is only saved once the new database has been opened.
+
+        Arguments:
+            new_path (str): path to the sqlite db
+
+        Returns:
+            future (Future): resolves when the new database is open, fails if it could not be opened
+        """
+        # the old database gets its pending writes before the switch, jobs run in order
+        self.flush_writes()
+
+        def opened():
+            self.pending_writes.db_path = new_path
+            config = {**self.settings, "db_path": new_path}
+            self.__save_config(config)
+            self.settings = config
+
+        return self._open(new_path, opened)
+
+    def poll_external_changes(self) -> Future:
+        """
+        Cheap check for commits made by other connections (other workstations), using
+        PRAGMA data_version, which only changes when someone else writes. Syncs if it changed.
+        A poll made while the previous one is still running returns the previous one.
+
+        Returns:
+            future (Future[bool]): True if anything was applied
+        """
+        if not self._opened:
+            return self._resolved(False)
+        if self._sync_future is not None and not self._sync_future.done():
+            return self._sync_future
+        self._sync_future = self.run(self._read_external_changes, self._change_log, self._data_version,
+                                     self._last_seq, name='poll_external_changes',
+                                     apply=self._apply_external_changes, flush=False)
+        return self._sync_future
+
+    def sync(self) -> Future:
+        """
+        Applies the rows changed since the last sync, as recorded in the change log.
+        Only the changed rows are read; existing Screen and Location objects are updated in place
+        and observers get one event per row whose data actually differs.
+        Falls back to a full reload if the change log is unavailable or was pruned past our position.
+
+        Returns:
+            future (Future[bool]): True if anything was applied
+        """
+        return self.run(self._read_external_changes, self._change_log, None, self._last_seq, name='sync',
+                        apply=self._apply_external_changes, flush=False)
+
+    def _read_external_changes(self, connection: sqlite3.Connection, change_log: bool,
+                               data_version: int | None, last_seq: int) -> dict | None:
+        """
+        Worker side of sync(): reads the change log and the rows it names.
+
+        Arguments:
+            connection (sqlite3.Connection): connection to database
+            change_log (bool): whether the database has a change log
+            data_version (int | None): the data_version seen last, None to read the change log regardless
+            last_seq (int): the last change log entry applied
 
-        self.connection = sqlite3.connect(new_path)
+        Returns:
+            changes (dict | None): None if nothing changed, otherwise the new data_version and either
+                the full 'reload' data or the change log 'seq' with the 'locations'/'screens' re-read
+        """
+        current_version = connection.execute("PRAGMA data_version").fetchone()[0]
+        if data_version is not None and current_version == data_version:
+            return None
+        changes = schema.read_changes(connection, last_seq) if change_log else None
+        if changes is not None and not changes:
+            return {'data_version': current_version}
+        if (changes is None or changes[0][0] != last_seq + 1
+                or len(changes) > self.get_setting('sync_reload_threshold', 5000)):
+            # no change log, entries we never saw were pruned, or so much changed (e.g. an import)
+            # that reading everything is cheaper than row by row
+            return {'data_version': current_version, 'reload': self._read_everything(connection, change_log)}
 
-        config = self.__load_config()
-        config["db_path"] = new_path
-        self.__save_config(config)
+        screen_ids = {row_id for _, table, row_id, _ in changes if table == 'Screens'}
+        location_ids = {row_id for _, table, row_id, _ in changes if table == 'Locations'}
+        return {
+            'data_version': current_version,
+            'seq': changes[-1][0],
+            'locations': (location_ids, Location.read_by_ids(connection, location_ids)),
+            'screens': (screen_ids, Screen.read_by_ids(connection, screen_ids)),
+        }
+
+    def _apply_external_changes(self, changes: dict | None) -> bool:
+        """
+        UI side of sync(): applies what _read_external_changes() read.
+        """
+        if changes is None:
+            return False
+        self._data_version = changes['data_version']
+        if 'reload' in changes:
+            self._apply_everything(changes['reload'])
+            return True
+        if 'seq' not in changes:
+            return False
+        with self.batch():
+            location_ids, fresh = changes['locations']
+            if location_ids:
+                self._sync_locations(location_ids, fresh)
+            screen_ids, fresh = changes['screens']
+            if screen_ids:
+                self._sync_screens(screen_ids, fresh)
+        self._last_seq = changes['seq']
+        return True
 
-        self.update_screen_list()
+    def _sync_locations(self, location_ids: set[int], fresh: dict[int, Location]):
+        """
+        Applies the re-read locations to self.locations, ids missing from fresh were deleted.
+        """
+        for location_id in location_ids:
+            new = fresh.get(location_id)
+            old = self.locations.get(location_id)
+            if new is not None and old is not None:
+                old.row_version = new.row_version
+                if new.description != old.description:
+                    old.description = new.description
+                    self._index_location(old)
+                    self.notify_observers(ChangeEvent(ChangeEvent.LOCATION_RENAMED, location_id=location_id))
+            elif new is not None:
+                self.locations[location_id] = new
+                self._index_location(new)
+                self.notify_observers(ChangeEvent(ChangeEvent.LOCATION_ADDED, location_id=location_id))
+            elif old is not None:
+                del self.locations[location_id]
+                self._unindex_location(location_id)
+                self.notify_observers(ChangeEvent(ChangeEvent.LOCATION_DELETED, location_id=location_id))
+        self._sort_locations()
 
-    def update_screen_list(self):
+    def _sync_screens(self, screen_ids: set[int], fresh: dict[int, Screen]):
+        """
+        Applies the re-read screens to self.screens, ids missing from fresh were deleted.
+        """
+        current = {s.screen_id: s for s in self.screens if s.screen_id in screen_ids}
+        deleted = set()
+        for screen_id in screen_ids:
+            new = fresh.get(screen_id)
+            old = current.get(screen_id)
+            if new is not None and old is not None:
+                pending = self.pending_writes.value(screen_id)
+                if pending is not None:
+                    # our own toggle wins, it is written after (or was written over) this read
+                    new.in_use = pending
+                if not old.same_data(new):
+                    old.copy_from(new)
+                    self._index_screen(old)
+                    self.notify_observers(ChangeEvent(ChangeEvent.SCREEN_UPDATED, screen_id, old.location_id))
+                else:
+                    old.row_version = new.row_version
+            elif new is not None:
+                if self.load_screens:
+                    self.screens.append(new)
+                    self._index_screen(new)
+                self.notify_observers(ChangeEvent(ChangeEvent.SCREEN_ADDED, screen_id, new.location_id))
+            elif old is not None:
+                deleted.add(screen_id)
+                self._unindex_screen(screen_id)
+                self.notify_observers(ChangeEvent(ChangeEvent.SCREEN_DELETED, screen_id, old.location_id))
+        if deleted:
+            self.screens = [s for s in self.screens if s.screen_id not in deleted]
+
+    def update_screen_list(self) -> Future:
         """
         Reads all screens from database and assigns that list to self.screens
         """
-        self.screens = Screen.read_all(self.connection)
-        self.notify_observers()
+        def apply(screens):
+            self.screens = screens
+            self._keep_pending(screens)
+            self._reindex_screens()
+            self.notify_observers()
+
+        return self.run(self._read_screens, name='update_screen_list', apply=apply, flush=False)
 
-    def add_screen(self, screen: Screen):
+    def _read_screens(self, connection: sqlite3.Connection) -> list[Screen]:
+        """
+        Worker side of update_screen_list(), reads nothing in paged mode.
+        """
+        return Screen.read_all(connection) if self.load_screens else []
+
+    def add_screen(self, screen: Screen) -> Future:
         """
         Add or update the provided screen's data to the db.
+        New screens are appended to self.screens, updated screens are expected to be
+        the objects already in it.
         
         Arguments:
             screen (Screen): the screen to update/add.
+
+        Returns:
+            future (Future): resolves once saved
         """
-        screen.add_to_db(self.connection)
-        self.update_screen_list()
-        self.notify_observers()
+        is_new = screen.screen_id == -1
 
-    def delete_screen(self, screen: Screen):
+        def apply(_):
+            if is_new:
+                self.screens.append(screen)
+                kind = ChangeEvent.SCREEN_ADDED
+            else:
+                kind = ChangeEvent.SCREEN_UPDATED
+            self._index_screen(screen)
+            self.notify_observers(ChangeEvent(kind, screen.screen_id, screen.location_id))
+
+        return self.run(screen.add_to_db, name='add_screen', apply=apply)
+
+    def delete_screen(self, screen: Screen) -> Future:
         """
         Delete the passed screen.
 
         Arguments:
             screen (Screen): the screen to delete
+
+        Returns:
+            future (Future): resolves once deleted
         """
-        screen.delete_from_db(self.connection)
-        self.update_screen_list()
-        self.notify_observers()
+        def apply(_):
+            self.screens = [s for s in self.screens if s.screen_id != screen.screen_id]
+            self._unindex_screen(screen.screen_id)
+            self.notify_observers(ChangeEvent(ChangeEvent.SCREEN_DELETED, screen.screen_id, screen.location_id))
 
-    def update_location_dict(self):
+        return self.run(screen.delete_from_db, name='delete_screen', apply=apply)
+
+    def resolve_conflict(self, screen: Screen, error: ConflictError, overwrite: bool) -> Future:
+        """
+        Settles a save of screen that failed with ConflictError.
+        Overwriting saves screen again on top of the stored version (which can conflict again if
+        it changes meanwhile), otherwise screen takes the stored data and local edits are lost.
+        A screen deleted meanwhile is dropped either way.
+
+        Arguments:
+            screen (Screen): the screen whose save failed
+            error (ConflictError): the failure, holding the stored row
+            overwrite (bool): True to keep local edits, False to take the stored data
+
+        Returns:
+            future (Future): resolves once settled
+        """
+        current = error.current.get(screen.screen_id)
+        if current is None:
+            self.screens = [s for s in self.screens if s.screen_id != screen.screen_id]
+            self._unindex_screen(screen.screen_id)
+            self.notify_observers(ChangeEvent(ChangeEvent.SCREEN_DELETED, screen.screen_id, screen.location_id))
+            return self._resolved()
+        if overwrite:
+            screen.row_version = current.row_version
+            return self.add_screen(screen)
+        screen.copy_from(current)
+        self._index_screen(screen)
+        self.notify_observers(ChangeEvent(ChangeEvent.SCREEN_UPDATED, screen.screen_id, screen.location_id))
+        return self._resolved()
+
+    def revert_screen(self, screen: Screen, previous: Screen):
+        """
+        Gives a screen whose save failed its values from before the edit back, and repaints it.
+
+        Arguments:
+            screen (Screen): the screen that was edited
+            previous (Screen): a copy of it taken before the edit
+        """
+        screen.copy_from(previous)
+        self._index_screen(screen)
+        self.notify_observers(ChangeEvent(ChangeEvent.SCREEN_UPDATED, screen.screen_id, screen.location_id))
+
+    def bulk_update(self, screen_ids, **fields) -> Future:
+        """
+        Sets the same fields on many screens in a single transaction, e.g.
+        bulk_update(ids, in_use=True). Nothing is changed if the write fails.
+        Observers are notified once.
+
+        Arguments:
+            screen_ids (Iterable[int] | dict[int, int]): the screens to update, or a mapping of id to the
+                row_version the caller saw, which fails with ConflictError if any was changed since
+            **fields: new values by Screen attribute name (location_id, quantity, design,
+                customer, description, in_use)
+
+        Returns:
+            future (Future[int]): number of screens changed in the database; on ConflictError the
+                conflicting screens have been reloaded from the database
+        """
+        return self._bulk_update(screen_ids, fields, Screen.update_many, 'bulk_update')
+
+    def _bulk_update(self, screen_ids, fields: dict, job, name: str) -> Future:
+        """
+        Body of bulk_update() and bulk_move(), runs job(connection, targets, fields) as the write.
+        """
+        targets = self._bulk_targets(screen_ids)
+        screen_ids = set(targets)
+        if not screen_ids or not fields:
+            return self._resolved(0)
+        location_id = fields.get('location_id')
+
+        def apply(updated):
+            with self.batch():
+                for screen in self.screens:
+                    if screen.screen_id in screen_ids:
+                        for name, value in fields.items():
+                            setattr(screen, name, bool(value) if name == 'in_use' else value)
+                        screen.row_version += 1
+                        self._index_screen(screen)
+                for screen_id in screen_ids:
+                    self.notify_observers(ChangeEvent(ChangeEvent.SCREEN_UPDATED, screen_id, location_id))
+            return updated
+
+        return self._reload_conflicts(self.run(job, targets, fields, name=name, apply=apply))
+
+    def bulk_move(self, screen_ids, location_id: int) -> Future:
+        """
+        Moves many screens to a location in a single transaction.
+
+        Arguments:
+            screen_ids (Iterable[int] | dict[int, int]): the screens to move, optionally with their
+                row versions (see bulk_update)
+            location_id (int): the destination location
+
+        Returns:
+            future (Future[int]): number of screens moved, fails with ValueError if the location does not exist
+        """
+        def move(connection, targets, fields):
+            # checked against the database, the location may have been added or deleted elsewhere
+            if not Location.read_by_ids(connection, [location_id]):
+                raise ValueError(f"Unknown location id: {location_id}")
+            return Screen.update_many(connection, targets, fields)
+
+        return self._bulk_update(screen_ids, {'location_id': location_id}, move, 'bulk_move')
+
+    def bulk_delete(self, screen_ids) -> Future:
+        """
+        Deletes many screens in a single transaction. Nothing is deleted if the write fails.
+        Observers are notified once.
+
+        Arguments:
+            screen_ids (Iterable[int] | dict[int, int]): the screens to delete, optionally with their
+                row versions (see bulk_update)
+
+        Returns:
+            future (Future[int]): number of screens deleted from the database; on ConflictError the
+                conflicting screens have been reloaded from the database
+        """
+        targets = self._bulk_targets(screen_ids)
+        screen_ids = set(targets)
+
+        def apply(deleted):
+            locations = {s.screen_id: s.location_id for s in self.screens if s.screen_id in screen_ids}
+            self.screens = [s for s in self.screens if s.screen_id not in screen_ids]
+            with self.batch():
+                for screen_id in screen_ids:
+                    self._unindex_screen(screen_id)
+                    self.notify_observers(ChangeEvent(ChangeEvent.SCREEN_DELETED, screen_id, locations.get(screen_id)))
+            return deleted
+
+        return self._reload_conflicts(self.run(Screen.delete_many, targets, name='bulk_delete', apply=apply))
+
+    def _bulk_targets(self, screen_ids):
+        """
+        The targets of a bulk write: the screen ids, or the ids with their row versions. In the
+        latter case the pending in-use changes are written first, and the versions of the screens
+        that write bumps are moved past it, since the caller read them before it.
+        """
+        if not isinstance(screen_ids, dict):
+            return set(screen_ids)
+        if not self.pending_writes.waiting():
+            return dict(screen_ids)
+        flushed = self.pending_writes.waiting_ids()
+        self.flush_writes()
+        return {screen_id: version + 1 if screen_id in flushed else version
+                for screen_id, version in screen_ids.items()}
+
+    def _reload_conflicts(self, future: Future) -> Future:
+        """
+        If a versioned bulk write fails with ConflictError, applies the rows it reports to the
+        model, so the view shows what is stored now and a retry uses the current row versions.
+        """
+        def done(f):
+            error = f.exception()
+            if isinstance(error, ConflictError):
+                with self.batch():
+                    self._sync_screens(set(error.row_ids), error.current)
+        future.add_done_callback(done)
+        return future
+
+    def update_location_dict(self) -> Future:
         """
         Reads all locations from the database and assigns to self.locations
         """
-        locations = Location.read_all(self.connection)
-        self.locations = dict(sorted(locations.items(), key=lambda item: item[1].description))
-        self.notify_observers()
+        def apply(locations):
+            self.locations = locations
+            self._sort_locations()
+            self._reindex_locations()
+            self.notify_observers()
+
+        return self.run(Location.read_all, name='update_location_dict', apply=apply, flush=False)
 
-    def delete_location(self, location: Location):
+    def _sort_locations(self):
+        """
+        Keeps self.locations (and location_names) ordered by description.
+        """
+        self.locations = dict(sorted(self.locations.items(), key=lambda item: item[1].description))
+        self.location_names = [location.description for location in self.locations.values()]
+
+    def delete_location(self, location: Location) -> Future:
         """
         Delete the location from the database.
 
         Arguments:
             location (Location): the location to delete
+
+        Returns:
+            future (Future): resolves once deleted
         """
-        location.delete_from_db(self.connection)
-        self.update_location_dict()
-        self.notify_observers()
+        def apply(_):
+            self.locations.pop(location.location_id, None)
+            self._sort_locations()
+            self._unindex_location(location.location_id)
+            self.notify_observers(ChangeEvent(ChangeEvent.LOCATION_DELETED, location_id=location.location_id))
+
+        return self.run(location.delete_from_db, name='delete_location', apply=apply)
 
-    def add_location(self, location: Location):
+    def add_location(self, location: Location) -> Future:
         """
         Add or update the provided location.
         
         Arguments:
             location (Location): the location to add/update
+
+        Returns:
+            future (Future): resolves once saved
         """
-        location.add_to_db(self.connection)
-        self.update_location_dict()
-        self.notify_observers()
+        is_new = location.location_id == -1
 
+        def apply(_):
+            self.locations[location.location_id] = location
+            self._sort_locations()
+            self._index_location(location)
+            kind = ChangeEvent.LOCATION_ADDED if is_new else ChangeEvent.LOCATION_RENAMED
+            self.notify_observers(ChangeEvent(kind, location_id=location.location_id))
 
-    def update_screens_and_locations(self):
+        return self.run(location.add_to_db, name='add_location', apply=apply)
+
+    def import_csv(self, path: str, progress=None, **options) -> Future:
         """
-        Runs both update_screen_list() and update_location_dict().
+        Imports screens from a CSV file (see model.csv_import) on the database worker,
+        then reloads, so observers are notified once when it finishes.
+
+        Arguments:
+            path (str): the CSV file
+            progress (Callable[[ImportReport], Any] | None): called after every chunk, on the worker thread
+            **options: passed to csv_import.import_screens (create_locations, chunk_size, rejects_path, ...)
+
+        Returns:
+            future (Future[ImportReport]): what was imported and rejected
+        """
+        # imported when first used, to keep start-up lean
+        from model import csv_import
+
+        def apply(report):
+            self.update_screens_and_locations()
+            return report
+
+        return self.run(lambda connection: csv_import.import_screens(connection, path, progress=progress, **options),
+                        name='import_csv', apply=apply)
+
+    def export_screens(self, query: ScreenQuery, path: str, fmt: str = 'csv', progress=None) -> Future:
+        """
+        Streams the screens matching query to a CSV or JSON Lines file (see model.export)
+        on the database worker.
+
+        Arguments:
+            query (ScreenQuery): the filters, e.g. the view's current ones
+            path (str): the file to write
+            fmt (str): 'csv' or 'jsonl'
+            progress (Callable[[int], Any] | None): called with the rows written so far, on the worker thread
+
+        Returns:
+            future (Future[int]): number of screens exported
+        """
+        # imported when first used, to keep start-up lean
+        from model import export
+        return self.run(lambda connection: export.export_screens(connection, query, path, fmt, progress=progress),
+                        name='export_screens')
+
+    def update_screens_and_locations(self) -> Future:
+        """
+        Reloads every location and screen in one database job.
         Critically, locations are updated before screens.
+        Observers are notified once.
+
+        Returns:
+            future (Future): resolves once reloaded
+        """
+        return self.run(self._read_everything, self._change_log, name='update_screens_and_locations',
+                        apply=self._apply_everything, flush=False)
+
+    def _read_everything(self, connection: sqlite3.Connection, change_log: bool) -> tuple:
+        """
+        Worker side of update_screens_and_locations().
+
+        Arguments:
+            connection (sqlite3.Connection): connection to database
+            change_log (bool): whether the database has a change log
+
+        Returns:
+            data (tuple): the change log position, the locations and the screens
+        """
+        # read the position first, anything committed meanwhile is simply applied again by sync()
+        last_seq = schema.latest_change_seq(connection) if change_log else 0
+        return last_seq, Location.read_all(connection), self._read_screens(connection)
+
+    def _apply_everything(self, data: tuple):
+        """
+        UI side of update_screens_and_locations().
         """
-        self.update_location_dict()
-        self.update_screen_list()
+        self._last_seq, self.locations, self.screens = data
+        self._keep_pending(self.screens)
+        self._sort_locations()
+        self._reindex_locations()
+        self._reindex_screens()
         self.notify_observers()
-    
-    
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import queue
+import threading
+from concurrent.futures import Future
+
+class DatabaseWorker:
+    """
+    Owns the sqlite connection on a dedicated thread, so a slow or locked database
+    never blocks the thread that queues the work (the Tk main loop).
+
+    Jobs run one at a time, in the order they were submitted, and each returns a Future.
+    The worker does not know about Tk; the Controller hands finished futures back to the UI.
+
+    Attributes:
+        connection (sqlite3.Connection | None): the connection, only touched on the worker thread
+    """
+
+    def __init__(self, name: str = "database"):
+        self.connection = None
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def open(self, connect, *args) -> Future:
+        """
+        Replaces the connection with connect(*args), closing the previous one.
+
+        Arguments:
+            connect (Callable[..., sqlite3.Connection]): opens the new connection, runs on the worker thread
+            *args: passed to connect
+
+        Returns:
+            future (Future[sqlite3.Connection]): resolves to the new connection
+        """
+        return self._put(self._open, (connect, args))
+
+    def submit(self, job, *args) -> Future:
+        """
+        Queues job(connection, *args).
+
+        Arguments:
+            job (Callable): the work, receives the connection as its first argument
+            *args: passed to job after the connection
+
+        Returns:
+            future (Future): resolves to the job's return value or exception
+        """
+        return self._put(job, args)
+
+    def close(self, timeout: float | None = None) -> None:
+        """
+        Finishes the queued jobs, closes the connection and stops the thread.
+
+        Arguments:
+            timeout (float | None): seconds to wait for the thread, None waits for as long as it takes
+        """
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _put(self, job, args) -> Future:
+        """
+        Queues a job with its future.
+        """
+        future = Future()
+        self._queue.put((future, job, args))
+        return future
+
+    def _open(self, connection, connect, args):
+        """
+        Job behind open(), swaps the connection.
+        """
+        if connection is not None:
+            connection.close()
+        self.connection = None
+        self.connection = connect(*args)
+        return self.connection
+
+    def _run(self) -> None:
+        """
+        The worker thread: runs queued jobs until close().
+        """
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            future, job, args = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = job(self.connection, *args)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
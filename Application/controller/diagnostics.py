@@ -0,0 +1,194 @@
+"""
+Performance instrumentation: named timers and gauges, shown in Help > Diagnostics and
+optionally written to a rotating log file.
+
+Enabled with "diagnostics": true in settings.json. When it is off, timer() hands back a
+shared do-nothing context manager and nothing is recorded, so instrumented code pays
+for one attribute check. Gauges are only read when a snapshot is taken.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import nullcontext
+
+_OFF = nullcontext()
+
+class Timing:
+    """
+    Running statistics of one timer.
+
+    Attributes:
+        count (int): samples recorded
+        total (float): seconds, summed
+        max (float): slowest sample in seconds
+        last (float): latest sample in seconds
+    """
+    __slots__ = ('count', 'total', 'max', 'last')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def add(self, seconds: float) -> None:
+        """
+        Records one sample.
+        """
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+class _Timer:
+    """
+    Context manager returned by Diagnostics.timer() while enabled.
+    """
+    __slots__ = ('_diagnostics', '_name', '_start')
+
+    def __init__(self, diagnostics: Diagnostics, name: str):
+        self._diagnostics = diagnostics
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._diagnostics.record(self._name, time.perf_counter() - self._start)
+        return False
+
+class Diagnostics:
+    """
+    Collects timings from the UI and database threads.
+
+    Attributes:
+        enabled (bool): whether timers record, may be switched at runtime
+        log_path (str | None): the rotating log file, None when not logging
+    """
+
+    def __init__(self, enabled: bool = False, log_path: str | None = None,
+                 max_bytes: int = 1_000_000, backups: int = 3):
+        """
+        Arguments:
+            enabled (bool): start recording right away
+            log_path (str | None): also write every sample to this file
+            max_bytes (int): size at which the log file is rotated
+            backups (int): rotated files to keep
+        """
+        self.enabled = enabled
+        self.log_path = log_path
+        self._timings = {}
+        self._gauges = {}
+        self._lock = threading.Lock()
+        self._logger = None
+        if log_path:
+            # only imported when logging, to keep start-up lean
+            import logging
+            from logging.handlers import RotatingFileHandler
+            try:
+                handler = RotatingFileHandler(log_path, maxBytes=max_bytes, backupCount=backups, encoding='utf-8')
+            except OSError as e:
+                print(f"Error opening diagnostics log: {e}")
+                self.log_path = None
+            else:
+                handler.setFormatter(logging.Formatter("%(asctime)s %(threadName)s %(message)s"))
+                self._logger = logging.getLogger(f"{__name__}.{id(self)}")
+                self._logger.propagate = False
+                self._logger.setLevel(logging.INFO)
+                self._logger.addHandler(handler)
+
+    def timer(self, name: str):
+        """
+        Times a with block under name.
+
+        Arguments:
+            name (str): the timer, e.g. "refresh.filter"
+
+        Returns:
+            context (ContextManager): records the block's duration, does nothing while disabled
+        """
+        return _Timer(self, name) if self.enabled else _OFF
+
+    def wrap(self, name: str, fn):
+        """
+        Returns fn timed under name, or fn itself while disabled.
+        """
+        if not self.enabled:
+            return fn
+        def timed(*args, **kwargs):
+            with self.timer(name):
+                return fn(*args, **kwargs)
+        return timed
+
+    def record(self, name: str, seconds: float) -> None:
+        """
+        Adds a sample to a timer, and to the log if there is one. Safe from any thread.
+        """
+        with self._lock:
+            timing = self._timings.get(name)
+            if timing is None:
+                timing = self._timings[name] = Timing()
+            timing.add(seconds)
+        if self._logger is not None:
+            self._logger.info("%s %.2f ms", name, seconds * 1000)
+
+    def gauge(self, name: str, read) -> None:
+        """
+        Registers a value read whenever a snapshot is taken, e.g. the number of live widgets.
+
+        Arguments:
+            name (str): the gauge
+            read (Callable[[], int | float]): returns the current value
+        """
+        self._gauges[name] = read
+
+    def read_gauges(self) -> dict[str, int | float | None]:
+        """
+        Returns:
+            gauges (dict[str, int | float | None]): every gauge's current value, None if reading it failed
+        """
+        values = {}
+        for name, read in self._gauges.items():
+            try:
+                values[name] = read()
+            except Exception:
+                values[name] = None
+        return values
+
+    def snapshot(self) -> dict:
+        """
+        Returns:
+            snapshot (dict): 'timers' (name -> count, total_ms, mean_ms, max_ms, last_ms) and 'gauges'
+        """
+        with self._lock:
+            timers = {name: {'count': t.count, 'total_ms': t.total * 1000, 'mean_ms': t.total / t.count * 1000,
+                             'max_ms': t.max * 1000, 'last_ms': t.last * 1000}
+                      for name, t in sorted(self._timings.items())}
+        return {'timers': timers, 'gauges': self.read_gauges()}
+
+    def log_gauges(self) -> None:
+        """
+        Writes the gauges to the log, if enabled and logging.
+        """
+        if self.enabled and self._logger is not None:
+            self._logger.info("gauges %s", " ".join(f"{k}={v}" for k, v in self.read_gauges().items()))
+
+    def reset(self) -> None:
+        """
+        Forgets every recorded timing.
+        """
+        with self._lock:
+            self._timings.clear()
+
+    def close(self) -> None:
+        """
+        Closes the log file.
+        """
+        if self._logger is not None:
+            for handler in self._logger.handlers[:]:
+                self._logger.removeHandler(handler)
+                handler.close()
+            self._logger = None
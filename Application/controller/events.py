@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+class ChangeEvent:
+    """
+    Describes a single change to the controller's data.
+    A list of these is passed to each observer's data_updated().
+
+    Attributes:
+        kind (str): one of the kind constants below
+        screen_id (int | None): the affected screen, for screen events
+        location_id (int | None): the affected location, or the screen's location for screen events
+    """
+    RELOADED = "reloaded"  # everything may have changed, redraw from scratch
+    SCREEN_ADDED = "screen_added"
+    SCREEN_UPDATED = "screen_updated"
+    SCREEN_DELETED = "screen_deleted"
+    LOCATION_ADDED = "location_added"
+    LOCATION_RENAMED = "location_renamed"
+    LOCATION_DELETED = "location_deleted"
+
+    SCREEN_KINDS = (SCREEN_ADDED, SCREEN_UPDATED, SCREEN_DELETED)
+    LOCATION_KINDS = (LOCATION_ADDED, LOCATION_RENAMED, LOCATION_DELETED)
+
+    def __init__(self, kind: str, screen_id: int | None = None, location_id: int | None = None):
+        self.kind = kind
+        self.screen_id = screen_id
+        self.location_id = location_id
+
+    def __repr__(self) -> str:
+        return f"ChangeEvent({self.kind!r}, screen_id={self.screen_id}, location_id={self.location_id})"
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+from model.screen import Screen
+
+class TrigramIndex:
+    """
+    In-memory substring index over the searchable screen fields.
+
+    Each field keeps its distinct casefolded values (numbered), the screen ids holding
+    each value, and a posting list of value numbers per trigram. A query only checks the
+    values in the shortest posting list of its trigrams, instead of lowercasing and
+    scanning every screen. Indexing distinct values keeps repeated customer names and
+    descriptions cheap.
+
+    Posting lists are append-only: a value that no longer belongs to any screen is
+    retired and skipped by queries, and rebuild() compacts the lists.
+
+    Attributes:
+        FIELDS (tuple[str, ...]): the searchable fields, named like the view's search parameters
+    """
+    FIELDS = ('design', 'customer', 'description')
+
+    def __init__(self):
+        self._screen_values: dict[int, tuple[int, ...]] = {}  # screen id -> value number per field
+        self._fields = {f: _FieldIndex() for f in self.FIELDS}
+
+    def rebuild(self, screens: list[Screen]) -> None:
+        """
+        Replaces the index contents with the given screens.
+
+        Arguments:
+            screens (list[Screen]): every loaded screen
+        """
+        self.__init__()
+        for screen in screens:
+            self.add(screen)
+
+    def add(self, screen: Screen) -> None:
+        """
+        Indexes a screen. Re-adding an indexed screen updates it.
+
+        Arguments:
+            screen (Screen): the screen to index
+        """
+        if screen.screen_id in self._screen_values:
+            self.remove(screen.screen_id)
+        self._screen_values[screen.screen_id] = tuple(
+            self._fields[f].add(_fold(getattr(screen, f)), screen.screen_id) for f in self.FIELDS)
+
+    def update(self, screen: Screen) -> None:
+        """
+        Re-indexes a screen whose fields changed.
+
+        Arguments:
+            screen (Screen): the changed screen
+        """
+        self.add(screen)
+
+    def remove(self, screen_id: int) -> None:
+        """
+        Drops a screen from the index, no-op if it was never indexed.
+
+        Arguments:
+            screen_id (int): id of the screen to drop
+        """
+        numbers = self._screen_values.pop(screen_id, None)
+        if numbers is None:
+            return
+        for field, number in zip(self.FIELDS, numbers):
+            self._fields[field].remove(number, screen_id)
+
+    def search(self, text: str, fields) -> set[int]:
+        """
+        Finds the screens containing text as a substring of any of the given fields (case-insensitive).
+
+        Arguments:
+            text (str): the search text
+            fields (Iterable[str]): any of FIELDS
+
+        Returns:
+            screen_ids (set[int]): ids of the matching screens
+        """
+        text = _fold(text)
+        if not text:
+            return set(self._screen_values)
+        matches: set[int] = set()
+        for field in fields:
+            if field in self._fields:
+                self._fields[field].search(text, matches)
+        return matches
+
+    def search_within(self, text: str, fields, screen_ids) -> set[int]:
+        """
+        Like search(), but only checks the given screens. Used to narrow a previous
+        result when the new search text contains the previous one.
+
+        Arguments:
+            text (str): the search text
+            fields (Iterable[str]): any of FIELDS
+            screen_ids (Iterable[int]): the candidate screens
+
+        Returns:
+            screen_ids (set[int]): ids of the candidates that match
+        """
+        text = _fold(text)
+        positions = [(i, self._fields[f].values) for i, f in enumerate(self.FIELDS) if f in fields]
+        matches = set()
+        for screen_id in screen_ids:
+            numbers = self._screen_values.get(screen_id)
+            if numbers is None:
+                continue
+            for i, values in positions:
+                if text in values[numbers[i]]:
+                    matches.add(screen_id)
+                    break
+        return matches
+
+class _FieldIndex:
+    """
+    Distinct values and trigram postings of one field, see TrigramIndex.
+    """
+
+    def __init__(self):
+        self.numbers: dict[str, int] = {}      # live value -> value number
+        self.values: list[str | None] = []     # value number -> value, None once retired
+        self.holders: list[list[int]] = []     # value number -> screen ids with that value
+        self.postings: dict[str, list[int]] = {}
+
+    def add(self, value: str, screen_id: int) -> int:
+        """
+        Records that the screen has this value, returns the value number.
+        """
+        number = self.numbers.get(value)
+        if number is None:
+            number = self.numbers[value] = len(self.values)
+            self.values.append(value)
+            self.holders.append([])
+            postings = self.postings
+            for gram in _trigrams(value):
+                posting = postings.get(gram)
+                if posting is None:
+                    postings[gram] = [number]
+                else:
+                    posting.append(number)
+        self.holders[number].append(screen_id)
+        return number
+
+    def remove(self, number: int, screen_id: int) -> None:
+        """
+        Records that the screen no longer has value number, retiring the value if unused.
+        """
+        holders = self.holders[number]
+        holders.remove(screen_id)
+        if not holders:
+            del self.numbers[self.values[number]]
+            self.values[number] = None
+
+    def search(self, text: str, matches: set[int]) -> None:
+        """
+        Adds the ids of screens whose value contains text to matches.
+        """
+        values, holders = self.values, self.holders
+        grams = _trigrams(text)
+        if grams:
+            shortest = min((self.postings.get(gram, ()) for gram in grams), key=len)
+        else:
+            # shorter than a trigram, every live value is a candidate
+            shortest = self.numbers.values()
+        for number in shortest:
+            value = values[number]
+            if value is not None and text in value:
+                matches.update(holders[number])
+
+def _fold(value) -> str:
+    """
+    Casefolds a field value, treating None as empty.
+    """
+    return value.casefold() if value else ""
+
+def _trigrams(value: str) -> set[str]:
+    """
+    Every three-character slice of value.
+    """
+    return {value[i:i + 3] for i in range(len(value) - 2)}
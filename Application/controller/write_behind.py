@@ -0,0 +1,292 @@
+"""
+Write-behind buffer for in-use toggles.
+
+Toggling a screen changes the model at once; the database write waits in PendingWrites
+so a burst of toggles (a print-room changeover) is written in one transaction, and a
+screen toggled on and off again is not written at all.
+
+Every change is also appended to a journal file (one JSON object per line, flushed to
+disk by a writer thread, so a toggle never waits for the disk; a burst of toggles is
+written with one fsync). The journal is only cut back once the write has been
+committed, so changes still in it after a crash are replayed when that database is
+opened next (see recover()). Only one session journals at a time: the journal is
+locked while in use, and a session that cannot get the lock keeps its changes in memory.
+"""
+from __future__ import annotations
+
+import json
+import os
+import queue
+import threading
+
+class PendingWrites:
+    """
+    In-use values waiting to be written, by screen id. Safe from any thread: the UI
+    thread adds changes, the database worker reports them committed. The journal file
+    is only touched by the writer thread, see sync() and close().
+
+    Attributes:
+        db_path (str): the database the changes belong to, recorded in the journal
+        journal_path (str | None): the journal file, None keeps changes in memory only
+            (also when another session holds the journal)
+    """
+
+    def __init__(self, db_path: str, journal_path: str | None = None):
+        self.db_path = db_path
+        self._lock_file = _lock_journal(journal_path) if journal_path else None
+        if journal_path and self._lock_file is None:
+            print("Another session is using the unsaved changes journal, in-use changes are not journaled")
+            journal_path = None
+        self.journal_path = journal_path
+        self._pending = {}   # screen id -> in_use to write
+        self._original = {}  # screen id -> in_use as last written, to drop changes that cancel out
+        self._flushing = {}  # screen id -> in_use taken by a write that has not committed yet
+        self._lock = threading.Lock()
+        self._queue = queue.SimpleQueue()  # journal work for the writer thread, None stops it
+        self._writer = None
+        if journal_path:
+            self._writer = threading.Thread(target=self._write_journal, name="journal", daemon=True)
+            self._writer.start()
+
+    def __len__(self) -> int:
+        """
+        Returns the number of screens with changes not yet committed, including those being written.
+        """
+        with self._lock:
+            return len(self._pending.keys() | self._flushing.keys())
+
+    def waiting(self) -> bool:
+        """
+        Returns True if there are changes no write has taken yet.
+        """
+        return bool(self._pending)
+
+    def waiting_ids(self) -> set[int]:
+        """
+        Returns the screens with changes no write has taken yet.
+        """
+        with self._lock:
+            return set(self._pending)
+
+    def value(self, screen_id: int) -> bool | None:
+        """
+        Returns the uncommitted in-use value of a screen, None if it has none.
+        """
+        with self._lock:
+            if screen_id in self._pending:
+                return self._pending[screen_id]
+            return self._flushing.get(screen_id)
+
+    def set(self, screen_id: int, in_use: bool, original: bool) -> None:
+        """
+        Records a change and journals it. Setting a screen back to the value it had
+        before its first pending change drops the change.
+
+        Arguments:
+            screen_id (int): the screen
+            in_use (bool): its new value
+            original (bool): its value before this change
+        """
+        with self._lock:
+            first = self._original.setdefault(screen_id, original)
+            if in_use == first and screen_id not in self._flushing:
+                self._pending.pop(screen_id, None)
+                del self._original[screen_id]
+            else:
+                self._pending[screen_id] = in_use
+            self._queue.put(('append', self.db_path, screen_id, in_use))
+
+    def take(self) -> dict[int, bool]:
+        """
+        Hands the pending changes to a write. They count as unsaved until committed() or restore().
+
+        Returns:
+            changes (dict[int, bool]): in-use value by screen id
+        """
+        with self._lock:
+            changes, self._pending, self._original = self._pending, {}, {}
+            self._flushing.update(changes)
+            return changes
+
+    def committed(self, changes: dict[int, bool]) -> None:
+        """
+        Forgets changes taken by a write that has committed, and has the journal cut back
+        to what is still unsaved. Called on the database worker.
+        """
+        with self._lock:
+            for screen_id, in_use in changes.items():
+                if self._flushing.get(screen_id) == in_use:
+                    del self._flushing[screen_id]
+            self._queue.put(('rewrite', self.db_path))
+
+    def restore(self, changes: dict[int, bool]) -> None:
+        """
+        Puts back changes whose write failed, unless the screen was changed again meanwhile.
+        """
+        with self._lock:
+            for screen_id, in_use in changes.items():
+                if self._flushing.get(screen_id) == in_use:
+                    del self._flushing[screen_id]
+                self._pending.setdefault(screen_id, in_use)
+
+    def recover(self) -> dict[int, bool]:
+        """
+        Reads the changes left in the journal for this database, e.g. by a crash.
+        They stay in the journal until committed(recovered) is called.
+
+        Returns:
+            changes (dict[int, bool]): the latest in-use value by screen id
+        """
+        if not self.journal_path:
+            return {}
+        # changes journaled this session must be on disk before the file is read
+        self.sync()
+        if not os.path.exists(self.journal_path):
+            return {}
+        changes = {}
+        try:
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # the last line may be cut short if the crash came mid-write
+                        continue
+                    if entry.get('db') == self.db_path:
+                        changes[int(entry['screen_id'])] = bool(entry['in_use'])
+        except OSError as e:
+            print(f"Error reading unsaved changes journal: {e}")
+            return {}
+        with self._lock:
+            self._flushing.update(changes)
+        return changes
+
+    def sync(self) -> None:
+        """
+        Waits until every change journaled so far is on disk.
+        """
+        if self._writer is None:
+            return
+        written = threading.Event()
+        self._queue.put(('sync', written))
+        written.wait()
+
+    def close(self) -> None:
+        """
+        Writes what is still queued for the journal, stops the writer thread and releases the journal.
+        """
+        if self._writer is None:
+            return
+        self._queue.put(None)
+        self._writer.join()
+        self._writer = None
+        # closing the file releases the lock
+        self._lock_file.close()
+        self._lock_file = None
+
+    def _write_journal(self) -> None:
+        """
+        The writer thread: appends queued changes, a batch at a time with one fsync,
+        and cuts the journal back when asked, until close().
+        """
+        while True:
+            batch = [self._queue.get()]
+            # take whatever else has queued up meanwhile, e.g. the rest of a changeover
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            lines = []
+            for item in batch:
+                if item is None or item[0] != 'append':
+                    # appends queued before a rewrite or sync must be on disk first
+                    self._append(lines)
+                    lines = []
+                if item is None:
+                    return
+                if item[0] == 'append':
+                    _, db_path, screen_id, in_use = item
+                    lines.append(json.dumps({'db': db_path, 'screen_id': screen_id, 'in_use': in_use}) + "\n")
+                elif item[0] == 'rewrite':
+                    self._rewrite(item[1])
+                else:
+                    item[1].set()
+            self._append(lines)
+
+    def _append(self, lines: list[str]) -> None:
+        """
+        Adds lines to the journal and forces them to disk. Writer thread only.
+        """
+        if not lines:
+            return
+        try:
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                f.writelines(lines)
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError as e:
+            print(f"Error writing unsaved changes journal: {e}")
+
+    def _rewrite(self, db_path: str) -> None:
+        """
+        Replaces the journal with the changes still unsaved, removing it if there are none.
+        Entries for other databases are kept. Writer thread only.
+        """
+        if not os.path.exists(self.journal_path):
+            return
+        with self._lock:
+            unsaved = {**self._flushing, **self._pending}
+        try:
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                others = [line for line in f if line.strip() and not self._belongs_to(line, db_path)]
+            if not unsaved and not others:
+                os.remove(self.journal_path)
+                return
+            # write the new journal beside the old one and swap, so a crash leaves one or the other
+            temp_path = self.journal_path + ".tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.writelines(others)
+                for screen_id, in_use in unsaved.items():
+                    f.write(json.dumps({'db': db_path, 'screen_id': screen_id, 'in_use': in_use}) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.journal_path)
+        except OSError as e:
+            print(f"Error compacting unsaved changes journal: {e}")
+
+    @staticmethod
+    def _belongs_to(line: str, db_path: str) -> bool:
+        """
+        Returns True if a journal line is for db_path (or unreadable, and so dropped).
+        """
+        try:
+            return json.loads(line).get('db') == db_path
+        except ValueError:
+            return True
+
+def _lock_journal(journal_path: str):
+    """
+    Takes an exclusive lock for the journal, without waiting. The lock is on a file beside it,
+    as the journal itself is replaced when cut back.
+
+    Returns:
+        lock_file (IO | None): open lock file, held until closed; None if another session holds the lock
+    """
+    try:
+        lock_file = open(journal_path + ".lock", 'a+b')
+    except OSError as e:
+        print(f"Error opening unsaved changes journal lock: {e}")
+        return None
+    try:
+        if os.name == 'nt':
+            import msvcrt
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+    return lock_file
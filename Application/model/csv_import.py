@@ -0,0 +1,158 @@
+"""
+Streaming import of screens from CSV.
+
+The file is read one row at a time and written in chunks of executemany() inserts,
+one transaction per chunk, so memory stays flat however long the file is. Rows are
+validated with Screen.validate_fields(), the same rules as the edit form. Locations are
+resolved by description (case-insensitive) and created when missing.
+
+Expected header (case-insensitive, any order): design, customer, quantity, location,
+and optionally description and in_use (1/true/yes/y/x for in use).
+"""
+from __future__ import annotations
+
+import csv
+import sqlite3
+from model.location import Location
+from model.screen import Screen
+
+REQUIRED_COLUMNS = ('design', 'customer', 'quantity', 'location')
+OPTIONAL_COLUMNS = ('description', 'in_use')
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 'x'}
+
+class ImportReport:
+    """
+    Outcome of import_screens().
+
+    Attributes:
+        rows_read (int): data rows read from the file
+        imported (int): screens written
+        locations_created (list[str]): descriptions of the locations the import created
+        rejected (int): rows skipped because they failed validation
+        rejections (list[tuple[int, str]]): (line number, reason) of the first max_rejections rejected rows
+    """
+
+    def __init__(self, max_rejections: int):
+        self.rows_read = 0
+        self.imported = 0
+        self.locations_created = []
+        self.rejected = 0
+        self.rejections = []
+        self._max_rejections = max_rejections
+
+    def reject(self, line: int, reason: str) -> None:
+        """
+        Counts a rejected row, keeping the reason if fewer than max_rejections are kept.
+        """
+        self.rejected += 1
+        if len(self.rejections) < self._max_rejections:
+            self.rejections.append((line, reason))
+
+    def as_dict(self) -> dict:
+        """
+        Returns:
+            report (dict): the report as plain data, e.g. for JSON
+        """
+        return {
+            'rows_read': self.rows_read,
+            'imported': self.imported,
+            'locations_created': self.locations_created,
+            'rejected': self.rejected,
+            'rejections': [{'line': line, 'reason': reason} for line, reason in self.rejections],
+        }
+
+def import_screens(conn: sqlite3.Connection, path: str, create_locations: bool = True,
+                   chunk_size: int = 1000, progress=None, rejects_path: str | None = None,
+                   max_rejections: int = 100) -> ImportReport:
+    """
+    Imports the screens in a CSV file.
+    Each chunk is its own transaction: if the import fails part way, the chunks before stay imported.
+
+    Arguments:
+        conn (sqlite3.Connection): connection to database
+        path (str): the CSV file
+        create_locations (bool): create locations that don't exist yet, otherwise reject their rows
+        chunk_size (int): rows per transaction
+        progress (Callable[[ImportReport], Any] | None): called after every chunk
+        rejects_path (str | None): if given, every rejected row is written there as CSV with a reason column
+        max_rejections (int): how many rejection reasons the report keeps
+
+    Returns:
+        report (ImportReport): what was imported and rejected
+
+    Raises:
+        ValueError: the header lacks a required column
+    """
+    report = ImportReport(max_rejections)
+    locations = {location.description.casefold(): location.location_id
+                 for location in Location.read_all(conn).values()}
+    with open(path, newline='', encoding='utf-8-sig') as source:
+        reader = csv.reader(source)
+        header = [name.strip().lower() for name in next(reader, [])]
+        missing = [name for name in REQUIRED_COLUMNS if name not in header]
+        if missing:
+            raise ValueError(f"CSV is missing the column(s): {', '.join(missing)}")
+        columns = {name: header.index(name) for name in REQUIRED_COLUMNS + OPTIONAL_COLUMNS if name in header}
+
+        rejects_file = open(rejects_path, 'w', newline='', encoding='utf-8') if rejects_path else None
+        try:
+            rejects = csv.writer(rejects_file) if rejects_file else None
+            if rejects:
+                rejects.writerow(['line'] + header + ['reason'])
+            chunk = []
+            for row in reader:
+                report.rows_read += 1
+                if not any(cell.strip() for cell in row):
+                    continue
+                line = reader.line_num
+                values = {name: row[i].strip() if i < len(row) else "" for name, i in columns.items()}
+                error = Screen.validate_fields(values['design'], values['customer'],
+                                               values['quantity'], values['location'])
+                if error is None and not create_locations and values['location'].casefold() not in locations:
+                    error = f"Location {values['location']!r} does not exist."
+                if error is not None:
+                    report.reject(line, error)
+                    if rejects:
+                        rejects.writerow([line] + row + [error])
+                    continue
+                chunk.append(values)
+                if len(chunk) >= chunk_size:
+                    _write_chunk(conn, chunk, locations, report)
+                    chunk = []
+                    if progress is not None:
+                        progress(report)
+            if chunk:
+                _write_chunk(conn, chunk, locations, report)
+        finally:
+            if rejects_file:
+                rejects_file.close()
+    if progress is not None:
+        progress(report)
+    return report
+
+def _write_chunk(conn: sqlite3.Connection, chunk: list[dict], locations: dict[str, int],
+                 report: ImportReport) -> None:
+    """
+    Writes a chunk of validated rows, and the locations they need, in one transaction.
+    """
+    created = {}
+    created_names = []
+    with conn:
+        cursor = conn.cursor()
+        for values in chunk:
+            key = values['location'].casefold()
+            if key not in locations and key not in created:
+                cursor.execute("INSERT INTO Locations (Description) VALUES (?)", (values['location'],))
+                created[key] = cursor.lastrowid
+                created_names.append(values['location'])
+        location_ids = {**locations, **created}
+        cursor.executemany("""
+            INSERT INTO Screens (Design, LocationID, CustomerName, Quantity, Description, InUse)
+            VALUES (?, ?, ?, ?, ?, ?)""",
+            [(values['design'], location_ids[values['location'].casefold()], values['customer'],
+              int(values['quantity']), values.get('description', ""),
+              1 if values.get('in_use', "").lower() in TRUE_VALUES else 0) for values in chunk])
+    # only once committed
+    locations.update(created)
+    report.locations_created.extend(created_names)
+    report.imported += len(chunk)
@@ -0,0 +1,21 @@
+class ConflictError(Exception):
+    """
+    Raised when a row was changed or deleted by another workstation since it was read,
+    so writing it would overwrite changes the writer never saw. Nothing was written.
+
+    Attributes:
+        row_ids (list[int]): the conflicting rows
+        current (dict[int, Any]): the rows as now stored, by id (Screen or Location); deleted rows are left out
+    """
+
+    def __init__(self, row_ids, current: dict):
+        self.row_ids = list(row_ids)
+        self.current = current
+        if len(self.row_ids) == 1:
+            message = f"Row {self.row_ids[0]} was changed by someone else"
+        else:
+            shown = ", ".join(str(row_id) for row_id in self.row_ids[:10])
+            if len(self.row_ids) > 10:
+                shown += f" and {len(self.row_ids) - 10} more"
+            message = f"Rows {shown} were changed by someone else"
+        super().__init__(message)
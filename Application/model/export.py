@@ -0,0 +1,57 @@
+"""
+Streaming export of screens to CSV or JSON Lines.
+
+Rows come from a ScreenQuery (so any filters the view supports), with the location
+description joined in SQL, and are read with fetchmany() straight into the writer.
+No Screen objects are built, so memory stays flat however many rows match.
+The CSV columns match what model.csv_import reads, so an export can be imported again.
+"""
+from __future__ import annotations
+
+import csv
+import json
+import sqlite3
+from model.screen_query import ScreenQuery
+
+FORMATS = ('csv', 'jsonl')
+COLUMNS = ('screen_id', 'design', 'customer', 'quantity', 'description', 'in_use', 'location_id', 'location')
+
+def export_screens(conn: sqlite3.Connection, query: ScreenQuery, path: str, fmt: str = 'csv',
+                   batch_size: int = 1000, progress=None) -> int:
+    """
+    Writes every screen matching query to path, ordered like the view.
+
+    Arguments:
+        conn (sqlite3.Connection): connection to database
+        query (ScreenQuery): the filters
+        path (str): the file to write
+        fmt (str): 'csv' or 'jsonl'
+        batch_size (int): rows fetched at a time
+        progress (Callable[[int], Any] | None): called with the rows written so far after every batch
+
+    Returns:
+        exported (int): number of rows written
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt!r}, expected one of {FORMATS}")
+    sql, params = query.sql()
+    cursor = conn.execute(sql, params)
+    exported = 0
+    with open(path, 'w', newline='', encoding='utf-8') as target:
+        if fmt == 'csv':
+            writer = csv.writer(target)
+            writer.writerow(COLUMNS)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            # row: ScreenID, LocationID, Quantity, Design, CustomerName, Description, InUse, RowVersion, location
+            records = [(r[0], r[3], r[4], r[2], r[5], bool(r[6]), r[1], r[8]) for r in rows]
+            if fmt == 'csv':
+                writer.writerows((*r[:5], 1 if r[5] else 0, *r[6:]) for r in records)
+            else:
+                target.writelines(json.dumps(dict(zip(COLUMNS, r))) + "\n" for r in records)
+            exported += len(rows)
+            if progress is not None:
+                progress(exported)
+    return exported
@@ -1,5 +1,5 @@
 import sqlite3
-from typing import Dict, List
+from model.errors import ConflictError
 
 class Location:
     """
@@ -8,8 +8,11 @@ class Location:
     Attributes:       
         description (str): the name or identifier of the location
         location_id (int): the id in the db, default to -1 (new location)
+        row_version (int): the RowVersion read from the database, updates only apply if it is still current
     """
 
+    __slots__ = ('location_id', 'description', 'row_version')
+
     """
     Constructor, do not pass id argument if not reading from db!
     
@@ -17,9 +20,10 @@ class Location:
         description (str): the description/identifer of the location
         location_id (int): the id in the db, defaults to -1, do not pass ID from views.
     """
-    def __init__(self, description: str, location_id: int=-1):
+    def __init__(self, description: str, location_id: int=-1, row_version: int=0):
         self.location_id = location_id
         self.description = description
+        self.row_version = row_version
 
     @classmethod
     def read_all(cls, conn: sqlite3.Connection) -> dict[int, "Location"]:
@@ -37,16 +41,41 @@ class Location:
             cursor = conn.cursor()
 
             locations = dict()
-            cursor.execute("""SELECT LocationID, Description FROM Locations""")
+            cursor.execute("""SELECT LocationID, Description, RowVersion FROM Locations""")
             rows = cursor.fetchall()
 
             for row in rows:
                 location_id = row[0]
                 description = row[1]
-                location = cls(description, location_id)
+                row_version = row[2]
+                location = cls(description, location_id, row_version)
                 locations[location_id] = location
 
         return locations
+
+    @classmethod
+    def read_by_ids(cls, conn: sqlite3.Connection, location_ids) -> dict[int, "Location"]:
+        """
+        Reads the given locations from the database, ids that no longer exist are left out.
+        
+        Arguments:
+            conn (sqlite3.Connection): the db connection to use
+            location_ids (Iterable[int]): the ids to read
+        
+        Returns:
+            locations (dict[int, "Location"]): maps id to Location
+        """
+        location_ids = list(location_ids)
+        locations = dict()
+        cursor = conn.cursor()
+        for start in range(0, len(location_ids), 500):
+            chunk = location_ids[start:start + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            cursor.execute(f"""SELECT LocationID, Description, RowVersion FROM Locations
+            WHERE LocationID IN ({placeholders})""", chunk)
+            for location_id, description, row_version in cursor.fetchall():
+                locations[location_id] = cls(description, location_id, row_version)
+        return locations
     
     def delete_from_db(self, conn: sqlite3.Connection) -> None:
         """
@@ -65,9 +94,13 @@ class Location:
     def add_to_db(self, conn: sqlite3.Connection) -> None:
         """
         Adds a location to the db (location.id == -1), updates otherwise.
+        An update only applies if the row is still at self.row_version.
         
         Arguments:
             conn (sqlite3.Connection): connection to database
+
+        Raises:
+            ConflictError: the location was changed or deleted since it was read
         """
         with(conn):
             cursor = conn.cursor()
@@ -77,10 +110,14 @@ class Location:
                 INSERT INTO Locations (Description)
                 VALUES (?)
                 """, (self.description,))
+                self.location_id = cursor.lastrowid
             # else, update in DB
             else:
                 cursor.execute("""
                 UPDATE Locations
-                SET Description = ?
-                WHERE LocationID = ?""", 
-                (self.description, self.location_id,))
\ No newline at end of file
+                SET Description = ?, RowVersion = RowVersion + 1
+                WHERE LocationID = ? AND RowVersion = ?""", 
+                (self.description, self.location_id, self.row_version))
+                if cursor.rowcount == 0:
+                    raise ConflictError([self.location_id], Location.read_by_ids(conn, [self.location_id]))
+                self.row_version += 1
\ No newline at end of file
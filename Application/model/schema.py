@@ -0,0 +1,415 @@
+"""
+Database schema, connection setup and migrations.
+
+connect() opens the database and applies the connection tunables from settings.json,
+migrate() brings the schema up to date. Each migration runs once, in its own
+transaction, and records its number in PRAGMA user_version.
+
+ChangeLog gets one row per insert, update or delete on either table, written by
+triggers so that every workstation's writes are recorded no matter which code made them.
+Seq increases monotonically, so a reader only needs to remember the last Seq it applied.
+
+ScreensFTS is an optional FTS5 index over Design, CustomerName and Description, also
+kept current by triggers. It only exists while search_mode is "prefix", as its triggers
+add to every write. Builds of SQLite without FTS5 simply do without it.
+"""
+from __future__ import annotations
+
+import os
+import re
+import sqlite3
+
+CHANGE_LOG_SQL = """
+CREATE TABLE IF NOT EXISTS ChangeLog (
+    Seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    TableName TEXT NOT NULL,
+    RowID INTEGER NOT NULL,
+    Op TEXT NOT NULL
+);
+
+CREATE TRIGGER IF NOT EXISTS ScreensLogInsert AFTER INSERT ON Screens BEGIN
+    INSERT INTO ChangeLog (TableName, RowID, Op) VALUES ('Screens', NEW.ScreenID, 'I');
+END;
+CREATE TRIGGER IF NOT EXISTS ScreensLogUpdate AFTER UPDATE ON Screens BEGIN
+    INSERT INTO ChangeLog (TableName, RowID, Op) VALUES ('Screens', NEW.ScreenID, 'U');
+END;
+CREATE TRIGGER IF NOT EXISTS ScreensLogDelete AFTER DELETE ON Screens BEGIN
+    INSERT INTO ChangeLog (TableName, RowID, Op) VALUES ('Screens', OLD.ScreenID, 'D');
+END;
+
+CREATE TRIGGER IF NOT EXISTS LocationsLogInsert AFTER INSERT ON Locations BEGIN
+    INSERT INTO ChangeLog (TableName, RowID, Op) VALUES ('Locations', NEW.LocationID, 'I');
+END;
+CREATE TRIGGER IF NOT EXISTS LocationsLogUpdate AFTER UPDATE ON Locations BEGIN
+    INSERT INTO ChangeLog (TableName, RowID, Op) VALUES ('Locations', NEW.LocationID, 'U');
+END;
+CREATE TRIGGER IF NOT EXISTS LocationsLogDelete AFTER DELETE ON Locations BEGIN
+    INSERT INTO ChangeLog (TableName, RowID, Op) VALUES ('Locations', OLD.LocationID, 'D');
+END;
+"""
+
+BASE_TABLES_SQL = """
+CREATE TABLE IF NOT EXISTS Locations (
+    LocationID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Description TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS Screens (
+    ScreenID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Design TEXT NOT NULL,
+    LocationID INTEGER NOT NULL REFERENCES Locations (LocationID) ON DELETE RESTRICT,
+    CustomerName TEXT,
+    Quantity INTEGER,
+    Description TEXT,
+    InUse INTEGER DEFAULT 0
+);
+"""
+
+INDEXES_SQL = """
+CREATE INDEX IF NOT EXISTS ScreensLocationID ON Screens (LocationID);
+CREATE INDEX IF NOT EXISTS ScreensInUse ON Screens (InUse);
+CREATE INDEX IF NOT EXISTS ScreensCustomerName ON Screens (CustomerName COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS LocationsDescription ON Locations (Description COLLATE NOCASE);
+"""
+
+# settings.json key -> (PRAGMA, default, allowed values or a converter)
+# journal_mode stays delete by default: the database usually lives on a network share, where WAL's
+# shared-memory index does not work; wal is only safe when every workstation opens a local file
+TUNABLES = {
+    'journal_mode': ('journal_mode', 'delete', ('delete', 'truncate', 'persist', 'memory', 'wal')),
+    'synchronous': ('synchronous', 'normal', ('off', 'normal', 'full', 'extra')),
+    'cache_size': ('cache_size', -20000, int),
+    'mmap_size': ('mmap_size', 0, int),
+    'busy_timeout': ('busy_timeout', 5000, int),
+}
+
+def connect(db_path: str, settings: dict | None = None, read_only: bool = False) -> sqlite3.Connection:
+    """
+    Opens the database with foreign keys enforced and the tunables from settings.json applied:
+    journal_mode (default delete), synchronous (normal), cache_size (-20000, i.e. ~20 MB),
+    mmap_size (0) and busy_timeout (5000 ms).
+
+    Arguments:
+        db_path (str): path to the sqlite db
+        settings (dict | None): the loaded settings.json
+        read_only (bool): open with mode=ro, which fails if the file is missing and never writes;
+            journal_mode is left as the database has it
+
+    Returns:
+        connection (sqlite3.Connection): the open connection
+    """
+    settings = settings or {}
+    if read_only:
+        # an empty authority (file:///...) keeps drive letters and UNC share paths intact;
+        # only the characters that end or escape a URI path need quoting
+        path = os.path.abspath(db_path).replace(os.sep, '/')
+        path = path.replace('%', '%25').replace('?', '%3F').replace('#', '%23')
+        conn = sqlite3.connect(f"file://{path if path.startswith('/') else '/' + path}?mode=ro", uri=True)
+    else:
+        conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA foreign_keys = ON")
+    for key, (pragma, default, allowed) in TUNABLES.items():
+        if read_only and key == 'journal_mode':
+            continue
+        value = settings.get(key, default)
+        if callable(allowed):
+            value = allowed(value)
+        else:
+            value = str(value).lower()
+            if value not in allowed:
+                raise ValueError(f"Invalid {key} in settings: {value!r}, expected one of {allowed}")
+        conn.execute(f"PRAGMA {pragma} = {value}").fetchall()
+    return conn
+
+def _execute_script(conn: sqlite3.Connection, sql: str) -> None:
+    """
+    Executes several statements inside the current transaction.
+    Unlike executescript(), this does not commit first.
+    """
+    statement = ""
+    for line in sql.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            conn.execute(statement)
+            statement = ""
+
+# where _migration_1 files screens whose location does not exist
+ORPHAN_LOCATION = "Unknown location"
+
+def _adopt_orphans(conn: sqlite3.Connection) -> None:
+    """
+    Moves screens whose location is missing (or NULL) to the ORPHAN_LOCATION location,
+    creating it if needed, so every screen belongs to a location once the foreign key holds.
+    """
+    orphaned = ("FROM Screens WHERE LocationID IS NULL"
+                " OR LocationID NOT IN (SELECT LocationID FROM Locations)")
+    count = conn.execute(f"SELECT COUNT(*) {orphaned}").fetchone()[0]
+    if not count:
+        return
+    row = conn.execute("SELECT LocationID FROM Locations WHERE Description = ?", (ORPHAN_LOCATION,)).fetchone()
+    location_id = row[0] if row else conn.execute(
+        "INSERT INTO Locations (Description) VALUES (?)", (ORPHAN_LOCATION,)).lastrowid
+    conn.execute(f"UPDATE Screens SET LocationID = ? WHERE ScreenID IN (SELECT ScreenID {orphaned})", (location_id,))
+    print(f"Moved {count} screens whose location does not exist to \"{ORPHAN_LOCATION}\"")
+
+def _migration_1(conn: sqlite3.Connection) -> None:
+    """
+    Creates the base tables if missing, adds the Screens -> Locations foreign key
+    (ON DELETE RESTRICT) to existing databases and creates the lookup indexes.
+    Screens whose location is missing are moved to ORPHAN_LOCATION first.
+    """
+    _execute_script(conn, BASE_TABLES_SQL)
+    _adopt_orphans(conn)
+
+    references = [row[2] for row in conn.execute("PRAGMA foreign_key_list(Screens)")]
+    if "Locations" not in references:
+        # SQLite can't add a constraint to an existing table, rebuild it keeping every column and row;
+        # dropping the old table drops its indexes and triggers, recreate them afterwards
+        dependents = [sql for (sql,) in conn.execute(
+            "SELECT sql FROM sqlite_master WHERE tbl_name = 'Screens' AND type IN ('index', 'trigger')"
+            " AND sql IS NOT NULL")]
+        columns = conn.execute("PRAGMA table_info(Screens)").fetchall()
+        definitions = []
+        for _, name, col_type, notnull, default, pk in columns:
+            if pk:
+                definitions.append(f"{name} INTEGER PRIMARY KEY AUTOINCREMENT")
+                continue
+            definition = f"{name} {col_type}".strip()
+            if notnull:
+                definition += " NOT NULL"
+            if default is not None:
+                definition += f" DEFAULT {default}"
+            if name == "LocationID":
+                definition += " REFERENCES Locations (LocationID) ON DELETE RESTRICT"
+            definitions.append(definition)
+        names = ", ".join(column[1] for column in columns)
+        conn.execute(f"CREATE TABLE Screens_new ({', '.join(definitions)})")
+        conn.execute(f"INSERT INTO Screens_new ({names}) SELECT {names} FROM Screens")
+        conn.execute("DROP TABLE Screens")
+        conn.execute("ALTER TABLE Screens_new RENAME TO Screens")
+        for sql in dependents:
+            conn.execute(sql)
+
+    _execute_script(conn, INDEXES_SQL)
+
+def _migration_2(conn: sqlite3.Connection) -> None:
+    """
+    Creates the ChangeLog table and its triggers.
+    """
+    _execute_script(conn, CHANGE_LOG_SQL)
+
+ROW_VERSION_SQL = """
+ALTER TABLE Screens ADD COLUMN RowVersion INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE Locations ADD COLUMN RowVersion INTEGER NOT NULL DEFAULT 0;
+
+-- writers that predate RowVersion don't bump it, do it for them so their edits still count as changes
+CREATE TRIGGER IF NOT EXISTS ScreensRowVersion AFTER UPDATE ON Screens
+WHEN NEW.RowVersion = OLD.RowVersion
+BEGIN
+    UPDATE Screens SET RowVersion = OLD.RowVersion + 1 WHERE ScreenID = NEW.ScreenID;
+END;
+
+CREATE TRIGGER IF NOT EXISTS LocationsRowVersion AFTER UPDATE ON Locations
+WHEN NEW.RowVersion = OLD.RowVersion
+BEGIN
+    UPDATE Locations SET RowVersion = OLD.RowVersion + 1 WHERE LocationID = NEW.LocationID;
+END;
+"""
+
+def _migration_3(conn: sqlite3.Connection) -> None:
+    """
+    Adds the RowVersion columns used for optimistic concurrency: every update bumps the
+    row's version and only applies if the version is still the one the writer read.
+    """
+    _execute_script(conn, ROW_VERSION_SQL)
+
+def _migration_4(conn: sqlite3.Connection) -> None:
+    """
+    Indexes designs for exact, case-insensitive lookups (the command line's locate).
+    """
+    conn.execute("CREATE INDEX IF NOT EXISTS ScreensDesign ON Screens (Design COLLATE NOCASE)")
+
+# migration n brings user_version from n - 1 to n
+MIGRATIONS = [_migration_1, _migration_2, _migration_3, _migration_4]
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """
+    Applies the migrations the database has not had yet, each in its own transaction.
+    Safe to run from several workstations at once: the version is re-checked under the write lock.
+
+    Arguments:
+        conn (sqlite3.Connection): connection to database
+
+    Returns:
+        version (int): the schema version after migrating
+    """
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for number, step in enumerate(MIGRATIONS, start=1):
+        if version >= number:
+            continue
+        # table rebuilds need foreign key enforcement off, which can't change inside a transaction
+        conn.execute("PRAGMA foreign_keys = OFF")
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("PRAGMA user_version").fetchone()[0] < number:
+                step(conn)
+                conn.execute(f"PRAGMA user_version = {number}")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.execute("PRAGMA foreign_keys = ON")
+        version = number
+    return version
+
+def is_current(conn: sqlite3.Connection) -> bool:
+    """
+    Returns True if the database has had every migration, for connections that may not migrate it.
+    """
+    return conn.execute("PRAGMA user_version").fetchone()[0] >= len(MIGRATIONS)
+
+def has_change_log(conn: sqlite3.Connection) -> bool:
+    """
+    Returns:
+        exists (bool): True if the ChangeLog table exists
+    """
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'ChangeLog'").fetchone() is not None
+
+def latest_change_seq(conn: sqlite3.Connection) -> int:
+    """
+    Returns:
+        seq (int): the newest Seq in the ChangeLog, 0 if it is empty
+    """
+    return conn.execute("SELECT COALESCE(MAX(Seq), 0) FROM ChangeLog").fetchone()[0]
+
+def read_changes(conn: sqlite3.Connection, since: int) -> list[tuple[int, str, int, str]]:
+    """
+    Reads the ChangeLog entries newer than since.
+
+    Arguments:
+        conn (sqlite3.Connection): connection to database
+        since (int): the last Seq already applied
+
+    Returns:
+        changes (list[tuple[int, str, int, str]]): (Seq, TableName, RowID, Op) in Seq order
+    """
+    return conn.execute("""
+        SELECT Seq, TableName, RowID, Op FROM ChangeLog
+        WHERE Seq > ? ORDER BY Seq""", (since,)).fetchall()
+
+def prune_change_log(conn: sqlite3.Connection, keep: int) -> None:
+    """
+    Deletes all but the newest keep entries. Readers that fall further behind
+    notice the gap in Seq and reload everything instead.
+
+    Arguments:
+        conn (sqlite3.Connection): connection to database
+        keep (int): number of entries to retain
+    """
+    with conn:
+        conn.execute("""
+            DELETE FROM ChangeLog
+            WHERE Seq <= (SELECT MAX(Seq) FROM ChangeLog) - ?""", (keep,))
+
+# Maps the view's search parameter names to Screens columns
+SEARCH_COLUMNS = {
+    'design': 'Design',
+    'customer': 'CustomerName',
+    'description': 'Description',
+}
+
+SEARCH_INDEX_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS ScreensFTS USING fts5(
+    Design, CustomerName, Description,
+    content='Screens', content_rowid='ScreenID'
+);
+
+CREATE TRIGGER IF NOT EXISTS ScreensFTSInsert AFTER INSERT ON Screens BEGIN
+    INSERT INTO ScreensFTS (rowid, Design, CustomerName, Description)
+    VALUES (NEW.ScreenID, NEW.Design, NEW.CustomerName, NEW.Description);
+END;
+CREATE TRIGGER IF NOT EXISTS ScreensFTSDelete AFTER DELETE ON Screens BEGIN
+    INSERT INTO ScreensFTS (ScreensFTS, rowid, Design, CustomerName, Description)
+    VALUES ('delete', OLD.ScreenID, OLD.Design, OLD.CustomerName, OLD.Description);
+END;
+CREATE TRIGGER IF NOT EXISTS ScreensFTSUpdate AFTER UPDATE OF Design, CustomerName, Description ON Screens BEGIN
+    INSERT INTO ScreensFTS (ScreensFTS, rowid, Design, CustomerName, Description)
+    VALUES ('delete', OLD.ScreenID, OLD.Design, OLD.CustomerName, OLD.Description);
+    INSERT INTO ScreensFTS (rowid, Design, CustomerName, Description)
+    VALUES (NEW.ScreenID, NEW.Design, NEW.CustomerName, NEW.Description);
+END;
+"""
+
+def ensure_search_index(conn: sqlite3.Connection) -> bool:
+    """
+    Creates the ScreensFTS full-text index and the triggers that keep it in sync with Screens,
+    filling it from the existing rows the first time.
+
+    Arguments:
+        conn (sqlite3.Connection): connection to database
+
+    Returns:
+        available (bool): False if this SQLite build has no FTS5 module
+    """
+    exists = has_search_index(conn)
+    try:
+        with conn:
+            conn.executescript(SEARCH_INDEX_SQL)
+            if not exists:
+                conn.execute("INSERT INTO ScreensFTS (ScreensFTS) VALUES ('rebuild')")
+    except sqlite3.OperationalError as e:
+        if "fts5" in str(e):
+            return False
+        raise
+    return True
+
+def drop_search_index(conn: sqlite3.Connection) -> None:
+    """
+    Drops the ScreensFTS index and its triggers, so writes stop maintaining an index no search uses.
+
+    Arguments:
+        conn (sqlite3.Connection): connection to database
+    """
+    with conn:
+        conn.execute("DROP TRIGGER IF EXISTS ScreensFTSInsert")
+        conn.execute("DROP TRIGGER IF EXISTS ScreensFTSDelete")
+        conn.execute("DROP TRIGGER IF EXISTS ScreensFTSUpdate")
+        conn.execute("DROP TABLE IF EXISTS ScreensFTS")
+
+def has_search_index(conn: sqlite3.Connection) -> bool:
+    """
+    Returns True if the ScreensFTS index exists (see ensure_search_index()).
+    """
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'ScreensFTS'").fetchone() is not None
+
+def build_search_query(text: str, fields) -> str | None:
+    """
+    Turns search text into an FTS5 MATCH expression: every word must appear as a
+    word prefix in one of the chosen columns.
+
+    Arguments:
+        text (str): the text typed by the user
+        fields (Iterable[str]): keys of SEARCH_COLUMNS to search
+
+    Returns:
+        query (str | None): the MATCH expression, None if text has no searchable words
+    """
+    words = re.findall(r"\w+", text.lower())
+    columns = [SEARCH_COLUMNS[f] for f in fields if f in SEARCH_COLUMNS]
+    if not words or not columns:
+        return None
+    terms = " AND ".join(f'"{word}"*' for word in words)
+    return f"{{{' '.join(columns)}}} : ({terms})"
+
+def search_screen_ids(conn: sqlite3.Connection, query: str) -> set[int]:
+    """
+    Runs a MATCH expression from build_search_query() against ScreensFTS.
+
+    Returns:
+        screen_ids (set[int]): ids of the matching screens
+    """
+    rows = conn.execute("SELECT rowid FROM ScreensFTS WHERE ScreensFTS MATCH ?", (query,))
+    return {row[0] for row in rows}
@@ -1,4 +1,8 @@
+from __future__ import annotations
+
 import sqlite3
+import sys
+from model.errors import ConflictError
 
 class Screen:
     """
@@ -14,9 +18,25 @@ class Screen:
         customer (str): the owner of the design
         description (str): other data relevant to the screen
         in_use (bool): is the screen in use
+        row_version (int): the RowVersion read from the database, updates only apply if it is still current
     """
+    # no per-instance __dict__, a loaded database holds one of these per row
+    __slots__ = ('screen_id', 'location_id', 'quantity', 'design', 'customer', 'description',
+                 'in_use', 'row_version')
+
+    # attribute -> column, for the fields update_many() can set
+    FIELD_COLUMNS = {
+        'location_id': 'LocationID',
+        'quantity': 'Quantity',
+        'design': 'Design',
+        'customer': 'CustomerName',
+        'description': 'Description',
+        'in_use': 'InUse',
+    }
+
     def __init__(self, location_id: int, quantity: int, design: str, 
-                 customer: str, description: str, in_use: bool, screen_id: int = -1):
+                 customer: str, description: str, in_use: bool, screen_id: int = -1,
+                 row_version: int = 0):
         self.screen_id = screen_id
         self.location_id = location_id
         self.quantity = quantity
@@ -24,6 +44,36 @@ class Screen:
         self.customer = customer
         self.description = description
         self.in_use = in_use
+        self.row_version = row_version
+
+    @staticmethod
+    def validate_fields(design: str, customer: str, quantity: str, location: str) -> str | None:
+        """
+        Checks the fields a user (or an import file) supplies for a screen.
+        Shared by the edit form, the new screen bar and the CSV import.
+
+        Arguments:
+            design (str): the design, required
+            customer (str): the customer, required
+            quantity (str): the quantity as typed, must be a whole number
+            location (str): the location description, required
+
+        Returns:
+            error (str | None): the first problem found, None if the fields are valid
+        """
+        if not design.strip():
+            return "Design cannot be empty."
+        if not customer.strip():
+            return "Customer cannot be empty."
+        quantity = quantity.strip()
+        if not quantity:
+            return "Quantity cannot be empty."
+        # isdigit() alone also accepts digits such as "²" or "٣" that int() rejects
+        if not (quantity.isascii() and quantity.isdigit()):
+            return "Quantity must be an integer."
+        if not location.strip():
+            return "Location must be selected."
+        return None
 
     @classmethod
     def read_all(cls, conn: sqlite3.Connection) -> list["Screen"]:
@@ -40,23 +90,189 @@ class Screen:
         with(conn):
             cursor = conn.cursor()
             query = """SELECT ScreenID, LocationID, Quantity, 
-            Design, CustomerName, Description, InUse FROM Screens"""
+            Design, CustomerName, Description, InUse, RowVersion FROM Screens"""
 
             cursor.execute(query)
             rows = cursor.fetchall()
 
             screens = []
             for row in rows:
-                screen_id = row[0]
-                location_id = row[1]
-                quantity = row[2]
-                design = row[3]
-                customer = row[4]
-                description = row[5]
-                in_use = bool(row[6])
-                screen = cls(location_id, quantity, design, customer, description, in_use, screen_id)
-                screens.append(screen)
+                screens.append(cls._from_row(row))
             return screens
+
+    @classmethod
+    def read_by_ids(cls, conn: sqlite3.Connection, screen_ids) -> dict[int, "Screen"]:
+        """
+        Reads the given screens from the database, ids that no longer exist are left out.
+        
+        Arguments:
+            conn (sqlite3.Connection): connection to database
+            screen_ids (Iterable[int]): the ids to read
+        
+        Returns:
+            screens (dict[int, Screen]): maps id to the screen read
+        """
+        screen_ids = list(screen_ids)
+        screens = {}
+        cursor = conn.cursor()
+        # stay well below SQLite's bound parameter limit
+        for start in range(0, len(screen_ids), 500):
+            chunk = screen_ids[start:start + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            cursor.execute(f"""SELECT ScreenID, LocationID, Quantity, 
+            Design, CustomerName, Description, InUse, RowVersion FROM Screens
+            WHERE ScreenID IN ({placeholders})""", chunk)
+            for row in cursor.fetchall():
+                screens[row[0]] = cls._from_row(row)
+        return screens
+
+    @classmethod
+    def update_many(cls, conn: sqlite3.Connection, screen_ids, fields: dict) -> int:
+        """
+        Sets the same field values on many screens in one transaction.
+        Either every screen is updated or, on error, none are.
+
+        Arguments:
+            conn (sqlite3.Connection): connection to database
+            screen_ids (Iterable[int] | dict[int, int]): the screens to update, or a mapping of id to
+                the row version the caller read, to refuse the update if any of them has changed since
+            fields (dict[str, Any]): attribute name (see FIELD_COLUMNS) -> new value
+
+        Returns:
+            updated (int): number of rows changed
+
+        Raises:
+            ConflictError: a versioned screen was changed or deleted since it was read
+        """
+        unknown = set(fields) - set(cls.FIELD_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown screen fields: {', '.join(sorted(unknown))}")
+        values = [(1 if value else 0) if name == 'in_use' else value for name, value in fields.items()]
+        assignments = ", ".join(f"{cls.FIELD_COLUMNS[name]} = ?" for name in fields)
+        assignments += ", RowVersion = RowVersion + 1"
+        if isinstance(screen_ids, dict):
+            versions = screen_ids
+            with conn:
+                cursor = conn.cursor()
+                conflicts = []
+                for screen_id, version in versions.items():
+                    cursor.execute(f"UPDATE Screens SET {assignments} WHERE ScreenID = ? AND RowVersion = ?",
+                                   values + [screen_id, version])
+                    if cursor.rowcount == 0:
+                        conflicts.append(screen_id)
+                if conflicts:
+                    raise ConflictError(conflicts, cls.read_by_ids(conn, conflicts))
+            return len(versions)
+        screen_ids = list(screen_ids)
+        updated = 0
+        with conn:
+            cursor = conn.cursor()
+            for start in range(0, len(screen_ids), 500):
+                chunk = screen_ids[start:start + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                cursor.execute(f"UPDATE Screens SET {assignments} WHERE ScreenID IN ({placeholders})",
+                               values + chunk)
+                updated += cursor.rowcount
+        return updated
+
+    @classmethod
+    def set_in_use_many(cls, conn: sqlite3.Connection, changes: dict) -> int:
+        """
+        Writes each screen's own in-use value in one transaction, touching no other column.
+        Unlike update_many() there is no row version check: the value is the user's latest choice.
+
+        Arguments:
+            conn (sqlite3.Connection): connection to database
+            changes (dict[int, bool]): in-use value by screen id
+
+        Returns:
+            updated (int): number of rows changed, screens deleted meanwhile are skipped
+        """
+        with conn:
+            cursor = conn.cursor()
+            cursor.executemany("UPDATE Screens SET InUse = ?, RowVersion = RowVersion + 1 WHERE ScreenID = ?",
+                               [(1 if in_use else 0, screen_id) for screen_id, in_use in changes.items()])
+            return cursor.rowcount
+
+    @classmethod
+    def delete_many(cls, conn: sqlite3.Connection, screen_ids) -> int:
+        """
+        Deletes many screens in one transaction.
+        Either every screen is deleted or, on error, none are.
+
+        Arguments:
+            conn (sqlite3.Connection): connection to database
+            screen_ids (Iterable[int] | dict[int, int]): the screens to delete, or a mapping of id to
+                the row version the caller read, to refuse the delete if any of them has changed since
+
+        Returns:
+            deleted (int): number of rows deleted
+
+        Raises:
+            ConflictError: a versioned screen was changed since it was read
+        """
+        if isinstance(screen_ids, dict):
+            versions = screen_ids
+            with conn:
+                cursor = conn.cursor()
+                deleted = 0
+                missed = []
+                for screen_id, version in versions.items():
+                    cursor.execute("DELETE FROM Screens WHERE ScreenID = ? AND RowVersion = ?", (screen_id, version))
+                    deleted += cursor.rowcount
+                    if cursor.rowcount == 0:
+                        missed.append(screen_id)
+                # rows someone else already deleted are fine, rows still here were changed
+                current = cls.read_by_ids(conn, missed)
+                if current:
+                    raise ConflictError(list(current), current)
+            return deleted
+        screen_ids = list(screen_ids)
+        deleted = 0
+        with conn:
+            cursor = conn.cursor()
+            for start in range(0, len(screen_ids), 500):
+                chunk = screen_ids[start:start + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                cursor.execute(f"DELETE FROM Screens WHERE ScreenID IN ({placeholders})", chunk)
+                deleted += cursor.rowcount
+        return deleted
+
+    @classmethod
+    def _from_row(cls, row) -> "Screen":
+        """
+        Builds a screen from a (ScreenID, LocationID, Quantity, Design, CustomerName, Description, InUse,
+        RowVersion) row. Customer names repeat across many screens, so they are interned
+        to share one string per name.
+        """
+        screen_id = row[0]
+        location_id = row[1]
+        quantity = row[2]
+        design = row[3]
+        customer = sys.intern(row[4]) if row[4] else row[4]
+        description = row[5]
+        in_use = bool(row[6])
+        row_version = row[7]
+        return cls(location_id, quantity, design, customer, description, in_use, screen_id, row_version)
+
+    def same_data(self, other: "Screen") -> bool:
+        """
+        Returns True if every stored field matches the other screen.
+        """
+        return (self.location_id, self.quantity, self.design, self.customer, self.description, self.in_use) == \
+            (other.location_id, other.quantity, other.design, other.customer, other.description, other.in_use)
+
+    def copy_from(self, other: "Screen") -> None:
+        """
+        Copies every stored field and the row version (not the id) from the other screen.
+        """
+        self.location_id = other.location_id
+        self.quantity = other.quantity
+        self.design = other.design
+        self.customer = other.customer
+        self.description = other.description
+        self.in_use = other.in_use
+        self.row_version = other.row_version
         
     def delete_from_db(self, conn: sqlite3.Connection) -> None:
         """
@@ -79,12 +295,17 @@ class Screen:
         """
         Adds a new screen to the database (if id==-1) or updates
         existing screen if id != -1.
+        An update only applies if the row is still at self.row_version, i.e. nobody
+        else saved it since it was read.
         
         Arguments:
             conn (sqlite3.Connection): connection to database
             
         Returns:
             added (bool): True if operation completed, otherwise false.
+
+        Raises:
+            ConflictError: the screen was changed or deleted since it was read
         """
         try:
             with conn:
@@ -103,11 +324,16 @@ class Screen:
                     cursor.execute("""
                         UPDATE Screens
                         SET Design = ?, LocationID = ?, CustomerName = ?, Quantity = ?, 
-                            Description = ?, InUse = ?
-                        WHERE ScreenID = ?
+                            Description = ?, InUse = ?, RowVersion = RowVersion + 1
+                        WHERE ScreenID = ? AND RowVersion = ?
                     """, (self.design, self.location_id, self.customer,
                         self.quantity, self.description, 1 if self.in_use else 0,
-                        self.screen_id))
+                        self.screen_id, self.row_version))
+                    if cursor.rowcount == 0:
+                        raise ConflictError([self.screen_id], Screen.read_by_ids(conn, [self.screen_id]))
+                    self.row_version += 1
+        except ConflictError:
+            raise
         except Exception as e:
             print(f"Error saving to database: {e}")
             raise
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import sqlite3
+from model.screen import Screen
+from model import schema
+
+class ScreenQuery:
+    """
+    Builds a single parameterized SELECT over Screens for the filters the main view offers,
+    ordered the way the view groups screens (location description, then location, then screen id).
+    Results are read in keyset-paginated pages, so callers never need the whole table in memory.
+
+    Attributes:
+        location_ids (set[int] | None): only screens in these locations, None for all
+        in_use (bool | None): only screens with this in-use state, None for both
+        search (str): search text, empty for no search
+        fields (list[str]): which of 'design', 'customer', 'description' the search looks in
+        prefix (bool): match search words as FTS5 prefixes instead of a substring (needs the ScreensFTS index)
+        design (str | None): only screens with exactly this design (case-insensitive), None for any
+    """
+
+    COLUMNS = """s.ScreenID, s.LocationID, s.Quantity, s.Design, s.CustomerName,
+        s.Description, s.InUse, s.RowVersion"""
+    # every query reads from the same join, so counts agree with the pages
+    FROM = "Screens s JOIN Locations l ON l.LocationID = s.LocationID"
+
+    def __init__(self, location_ids=None, in_use: bool | None = None, search: str = "",
+                 fields=('design', 'customer', 'description'), prefix: bool = False,
+                 design: str | None = None):
+        self.location_ids = set(location_ids) if location_ids is not None else None
+        self.in_use = in_use
+        self.search = search.strip()
+        self.fields = list(fields)
+        self.prefix = prefix
+        self.design = design
+
+    def where(self) -> tuple[str, list]:
+        """
+        Builds the WHERE clause for the filters.
+
+        Returns:
+            clause (tuple[str, list]): SQL starting with "WHERE" (or empty) and its parameters
+        """
+        conditions = []
+        params = []
+        if self.location_ids is not None:
+            if not self.location_ids:
+                conditions.append("0")
+            else:
+                conditions.append(f"s.LocationID IN ({', '.join('?' * len(self.location_ids))})")
+                params.extend(sorted(self.location_ids))
+        if self.in_use is not None:
+            conditions.append("s.InUse = ?")
+            params.append(1 if self.in_use else 0)
+        if self.design is not None:
+            conditions.append("s.Design = ? COLLATE NOCASE")
+            params.append(self.design)
+        if self.search:
+            columns = [schema.SEARCH_COLUMNS[f] for f in self.fields if f in schema.SEARCH_COLUMNS]
+            match = schema.build_search_query(self.search, self.fields) if self.prefix else None
+            if not columns:
+                conditions.append("0")
+            elif match is not None:
+                conditions.append("s.ScreenID IN (SELECT rowid FROM ScreensFTS WHERE ScreensFTS MATCH ?)")
+                params.append(match)
+            else:
+                # LIKE is case-insensitive for ASCII, matching the in-memory search
+                pattern = "%" + self.search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+                conditions.append("(" + " OR ".join(f"s.{c} LIKE ? ESCAPE '\\'" for c in columns) + ")")
+                params.extend([pattern] * len(columns))
+        if not conditions:
+            return "", params
+        return "WHERE " + " AND ".join(conditions), params
+
+    def sql(self, after: tuple | None = None, limit: int | None = None) -> tuple[str, list]:
+        """
+        Builds the full SELECT.
+
+        Arguments:
+            after (tuple | None): the key of the last row of the previous page, None for the first page
+            limit (int | None): maximum number of rows, None for no limit
+
+        Returns:
+            query (tuple[str, list]): the SQL and its parameters
+        """
+        where, params = self.where()
+        if after is not None:
+            keyset = "(l.Description COLLATE NOCASE, s.LocationID, s.ScreenID) > (?, ?, ?)"
+            where = f"{where} AND {keyset}" if where else f"WHERE {keyset}"
+            params.extend(after)
+        sql = f"""SELECT {self.COLUMNS}, l.Description
+            FROM {self.FROM}
+            {where}
+            ORDER BY l.Description COLLATE NOCASE, s.LocationID, s.ScreenID"""
+        if limit is not None:
+            sql += "\nLIMIT ?"
+            params.append(limit)
+        return sql, params
+
+    def fetch_page(self, conn: sqlite3.Connection, after: tuple | None = None,
+                   limit: int | None = 200) -> tuple[list[Screen], tuple | None]:
+        """
+        Reads one page of matching screens.
+
+        Arguments:
+            conn (sqlite3.Connection): connection to database
+            after (tuple | None): key returned with the previous page, None for the first page
+            limit (int | None): page size, None reads every remaining row
+
+        Returns:
+            page (tuple[list[Screen], tuple | None]): the screens and the key to pass for the
+                next page, which is None when this was the last page
+        """
+        sql, params = self.sql(after, limit)
+        rows = conn.execute(sql, params).fetchall()
+        screens = [Screen._from_row(row) for row in rows]
+        if limit is None or len(rows) < limit:
+            return screens, None
+        last = rows[-1]
+        return screens, (last[8], last[1], last[0])
+
+    def count(self, conn: sqlite3.Connection) -> int:
+        """
+        Returns:
+            count (int): number of screens matching the filters
+        """
+        where, params = self.where()
+        return conn.execute(f"SELECT COUNT(*) FROM {self.FROM} {where}", params).fetchone()[0]
+
+    def count_by_location(self, conn: sqlite3.Connection) -> dict[int, int]:
+        """
+        Returns:
+            counts (dict[int, int]): number of matching screens per location id, locations without any are left out
+        """
+        where, params = self.where()
+        rows = conn.execute(f"SELECT s.LocationID, COUNT(*) FROM {self.FROM} {where} GROUP BY s.LocationID", params)
+        return dict(rows.fetchall())
+
+    def contains(self, conn: sqlite3.Connection, screen_id: int) -> bool:
+        """
+        Returns:
+            matches (bool): True if the screen exists and passes the filters
+        """
+        where, params = self.where()
+        where = f"{where} AND s.ScreenID = ?" if where else "WHERE s.ScreenID = ?"
+        return conn.execute(f"SELECT 1 FROM {self.FROM} {where}", params + [screen_id]).fetchone() is not None
@@ -0,0 +1,102 @@
+"""
+Versioned bulk writes: a batch whose rows were changed elsewhere since they were read is
+refused as a whole with ConflictError, and nothing of it is written.
+"""
+import pytest
+
+from benchmarks.synthetic import generate
+from controller.controller import Controller
+from model import schema
+from model.errors import ConflictError
+from model.screen import Screen
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(generate(str(tmp_path / "screens.db"), 20, 2))
+
+@pytest.fixture
+def conn(db_path):
+    conn = schema.connect(db_path)
+    yield conn
+    conn.close()
+
+def _versions(conn, screen_ids):
+    return {s.screen_id: s.row_version for s in Screen.read_by_ids(conn, screen_ids).values()}
+
+def _quantities(conn, screen_ids):
+    return {s.screen_id: s.quantity for s in Screen.read_by_ids(conn, screen_ids).values()}
+
+def _changed_elsewhere(db_path, screen_id, quantity=777):
+    other = schema.connect(db_path)
+    try:
+        Screen.update_many(other, [screen_id], {'quantity': quantity})
+    finally:
+        other.close()
+
+def test_update_many_applies_current_versions(conn):
+    versions = _versions(conn, [1, 2, 3])
+    assert Screen.update_many(conn, versions, {'quantity': 5}) == 3
+    assert _quantities(conn, [1, 2, 3]) == {1: 5, 2: 5, 3: 5}
+    assert _versions(conn, [1, 2, 3]) == {i: v + 1 for i, v in versions.items()}
+
+def test_update_many_conflict_rolls_back_the_batch(conn, db_path):
+    versions = _versions(conn, [1, 2, 3])
+    before = _quantities(conn, [1, 2, 3])
+    _changed_elsewhere(db_path, 2)
+    with pytest.raises(ConflictError) as raised:
+        Screen.update_many(conn, versions, {'quantity': 5})
+    assert raised.value.row_ids == [2]
+    assert raised.value.current[2].quantity == 777
+    # the rows before and after the conflicting one are untouched
+    assert _quantities(conn, [1, 3]) == {1: before[1], 3: before[3]}
+    assert _versions(conn, [1, 3]) == {1: versions[1], 3: versions[3]}
+
+def test_update_many_of_a_deleted_row_conflicts(conn):
+    versions = _versions(conn, [4, 5])
+    Screen.delete_many(conn, [5])
+    with pytest.raises(ConflictError) as raised:
+        Screen.update_many(conn, versions, {'quantity': 5})
+    assert raised.value.row_ids == [5]
+    assert raised.value.current == {}
+    assert _versions(conn, [4]) == {4: versions[4]}
+
+def test_delete_many_ignores_rows_already_deleted(conn, db_path):
+    versions = _versions(conn, [6, 7, 8])
+    other = schema.connect(db_path)
+    Screen.delete_many(other, [7])
+    other.close()
+    assert Screen.delete_many(conn, versions) == 2
+    assert Screen.read_by_ids(conn, [6, 7, 8]) == {}
+
+def test_delete_many_conflict_rolls_back_the_batch(conn, db_path):
+    versions = _versions(conn, [9, 10, 11])
+    _changed_elsewhere(db_path, 10)
+    with pytest.raises(ConflictError) as raised:
+        Screen.delete_many(conn, versions)
+    assert raised.value.row_ids == [10]
+    assert set(Screen.read_by_ids(conn, [9, 10, 11])) == {9, 10, 11}
+
+def test_conflict_message_lists_at_most_ten_rows():
+    assert str(ConflictError([3], {})) == "Row 3 was changed by someone else"
+    message = str(ConflictError(range(1, 14), {}))
+    assert message == "Rows 1, 2, 3, 4, 5, 6, 7, 8, 9, 10 and 3 more were changed by someone else"
+
+def test_controller_reloads_the_conflicting_rows(db_path):
+    controller = Controller(settings={'db_path': db_path, 'write_behind_journal': None})
+    try:
+        screens = {s.screen_id: s for s in controller.screens[:3]}
+        versions = {screen_id: s.row_version for screen_id, s in screens.items()}
+        conflicting, *others = versions
+        quantities = {screen_id: screens[screen_id].quantity for screen_id in others}
+        _changed_elsewhere(db_path, conflicting, quantity=321)
+
+        with pytest.raises(ConflictError):
+            controller.bulk_update(versions, quantity=5).result()
+        assert screens[conflicting].quantity == 321
+        assert {screen_id: screens[screen_id].quantity for screen_id in others} == quantities
+
+        with pytest.raises(ConflictError):
+            controller.bulk_delete(versions).result()
+        assert set(screens) <= {s.screen_id for s in controller.screens}
+    finally:
+        controller.close()
@@ -0,0 +1,80 @@
+"""
+Command line: each subcommand run through main() against a small synthetic database,
+reading its JSON output.
+"""
+import json
+import sqlite3
+
+import pytest
+
+import cli
+from benchmarks.synthetic import generate
+
+@pytest.fixture
+def settings(tmp_path):
+    return {'db_path': str(generate(str(tmp_path / "screens.db"), 30, 3)), 'write_behind_journal': None}
+
+@pytest.fixture
+def run(settings, capsys):
+    def run(*argv):
+        status = cli.main(list(argv), settings=dict(settings))
+        return status, json.loads(capsys.readouterr().out)
+    return run
+
+def _db(settings, sql, params=()):
+    conn = sqlite3.connect(settings['db_path'])
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+def _location_names(settings):
+    return [row[0] for row in _db(settings, "SELECT Description FROM Locations ORDER BY LocationID")]
+
+def test_stats(run, settings):
+    status, result = run('stats')
+    assert status == 0
+    assert result['screens'] == 30
+    assert result['locations'] == 3
+    assert sum(result['by_location'].values()) == 30
+    assert result['in_use'] == _db(settings, "SELECT COUNT(*) FROM Screens WHERE InUse = 1")[0][0]
+
+def test_search_and_locate(run, settings):
+    screen_id, design = _db(settings, "SELECT ScreenID, Design FROM Screens ORDER BY ScreenID LIMIT 1")[0]
+    status, result = run('locate', design.lower())
+    assert status == 0
+    assert screen_id in [s['screen_id'] for s in result['screens']]
+    assert all(s['design'].casefold() == design.casefold() for s in result['screens'])
+
+    status, result = run('search', design, '--fields', 'design', '--limit', '1')
+    assert status == 0
+    assert len(result['screens']) == 1
+    assert design.casefold() in result['screens'][0]['design'].casefold()
+
+def test_move_and_set_in_use(run, settings):
+    target = _location_names(settings)[-1]
+    status, result = run('move', '1', '2', '2', '--to', target.upper())
+    assert (status, result) == (0, {'requested': 2, 'moved': 2})
+    status, result = run('set-in-use', '1', '2', '--off')
+    assert (status, result) == (0, {'requested': 2, 'updated': 2, 'in_use': False})
+    assert _db(settings, """SELECT l.Description, s.InUse FROM Screens s JOIN Locations l USING (LocationID)
+                            WHERE ScreenID IN (1, 2)""") == [(target, 0), (target, 0)]
+
+def test_export_then_import(run, settings, tmp_path):
+    path = str(tmp_path / "out.csv")
+    status, result = run('export', path)
+    assert (status, result) == (0, {'file': path, 'format': 'csv', 'exported': 30})
+    status, result = run('import', path, '--no-create-locations')
+    assert status == 0
+    assert (result['imported'], result['rejected'], result['locations_created']) == (30, 0, [])
+    assert _db(settings, "SELECT COUNT(*) FROM Screens")[0][0] == 60
+
+    status, result = run('export', str(tmp_path / "out.jsonl"), '--in-use')
+    assert status == 0 and result['format'] == 'jsonl'
+    assert result['exported'] == _db(settings, "SELECT COUNT(*) FROM Screens WHERE InUse = 1")[0][0]
+
+def test_errors_are_reported_as_json(run, settings):
+    status, result = run('move', '1', '--to', 'No such rack')
+    assert status == 1
+    assert result == {'error': "Unknown location: No such rack"}
+    assert _db(settings, "SELECT COUNT(*) FROM Screens WHERE ScreenID = 1")[0][0] == 1
@@ -0,0 +1,46 @@
+"""
+Streaming CSV import: valid rows are written, invalid ones are reported and skipped
+without stopping the import.
+"""
+import pytest
+
+from benchmarks.synthetic import generate
+from model import csv_import, schema
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = schema.connect(str(generate(str(tmp_path / "screens.db"), 10, 2)))
+    yield conn
+    conn.close()
+
+def _write_csv(tmp_path, text):
+    path = tmp_path / "screens.csv"
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+def _count(conn):
+    return conn.execute("SELECT COUNT(*) FROM Screens").fetchone()[0]
+
+def test_non_ascii_digits_are_rejected(conn, tmp_path):
+    path = _write_csv(tmp_path, "design,customer,quantity,location\n"
+                                "A-1,Acme,3,Rack 1\n"
+                                "A-2,Acme,²,Rack 1\n"
+                                "A-3,Acme,٣,Rack 1\n"
+                                "A-4,Acme,12,Rack 1\n")
+    before = _count(conn)
+    report = csv_import.import_screens(conn, path)
+    assert report.imported == 2
+    assert report.rejected == 2
+    assert [line for line, _ in report.rejections] == [3, 4]
+    assert _count(conn) == before + 2
+
+def test_rejects_file_lists_the_skipped_rows(conn, tmp_path):
+    path = _write_csv(tmp_path, "design,customer,quantity,location\n"
+                                "B-1,,1,Rack 1\n"
+                                "B-2,Bolt,x,Rack 1\n"
+                                "B-3,Bolt,2,Nowhere\n")
+    rejects = str(tmp_path / "rejects.csv")
+    report = csv_import.import_screens(conn, path, create_locations=False, rejects_path=rejects)
+    assert (report.imported, report.rejected) == (0, 3)
+    with open(rejects, encoding='utf-8') as f:
+        assert len(f.read().splitlines()) == 4
@@ -0,0 +1,96 @@
+"""
+Schema migrations: a database from before the migrations is brought to the current version
+without losing rows, indexes, triggers or screens whose location is missing.
+"""
+import sqlite3
+
+import pytest
+
+from model import schema
+from view.filtering import group_by_location
+from model.location import Location
+from model.screen import Screen
+
+LEGACY_SQL = """
+CREATE TABLE Locations (LocationID INTEGER PRIMARY KEY AUTOINCREMENT, Description TEXT);
+CREATE TABLE Screens (ScreenID INTEGER PRIMARY KEY AUTOINCREMENT, Design TEXT, LocationID INTEGER,
+                      CustomerName TEXT, Quantity INTEGER, Description TEXT, InUse INTEGER);
+CREATE INDEX LegacyQuantity ON Screens (Quantity);
+CREATE TABLE Audit (ScreenID INTEGER);
+CREATE TRIGGER LegacyAudit AFTER INSERT ON Screens BEGIN INSERT INTO Audit VALUES (NEW.ScreenID); END;
+INSERT INTO Locations (Description) VALUES ('Rack A'), ('Rack B');
+INSERT INTO Screens (Design, LocationID, CustomerName, Quantity, Description, InUse) VALUES
+    ('D1', 1, 'Acme', 1, 'mesh', 0),
+    ('D2', 2, 'Acme', 2, NULL, 1),
+    ('D3', 7, NULL, 3, 'gone', 0),
+    ('D4', NULL, 'Bolt', 4, 'none', 0);
+"""
+
+@pytest.fixture
+def legacy_db(tmp_path):
+    path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(LEGACY_SQL)
+    conn.close()
+    return path
+
+def _names(conn, kind):
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = ?", (kind,))}
+
+def test_legacy_database_migrates_to_latest(legacy_db):
+    conn = schema.connect(legacy_db)
+    assert schema.migrate(conn) == len(schema.MIGRATIONS)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == len(schema.MIGRATIONS)
+    assert schema.is_current(conn)
+    assert "Locations" in [row[2] for row in conn.execute("PRAGMA foreign_key_list(Screens)")]
+    assert conn.execute("SELECT COUNT(*) FROM Screens").fetchone()[0] == 4
+    assert schema.has_change_log(conn)
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(Screens)")]
+    assert "RowVersion" in columns
+
+def test_rebuild_keeps_indexes_and_triggers(legacy_db):
+    conn = schema.connect(legacy_db)
+    schema.migrate(conn)
+    assert {"LegacyQuantity", "ScreensLocationID", "ScreensDesign"} <= _names(conn, 'index')
+    assert {"LegacyAudit", "ScreensLogInsert", "ScreensRowVersion"} <= _names(conn, 'trigger')
+    audited = conn.execute("SELECT COUNT(*) FROM Audit").fetchone()[0]
+    with conn:
+        conn.execute("INSERT INTO Screens (Design, LocationID) VALUES ('D5', 1)")
+    assert conn.execute("SELECT COUNT(*) FROM Audit").fetchone()[0] == audited + 1
+
+def test_orphans_move_to_placeholder_location(legacy_db):
+    conn = schema.connect(legacy_db)
+    schema.migrate(conn)
+    assert conn.execute("PRAGMA foreign_key_check(Screens)").fetchall() == []
+    locations = Location.read_all(conn)
+    placeholder = [loc for loc in locations.values() if loc.description == schema.ORPHAN_LOCATION]
+    assert len(placeholder) == 1
+    screens = Screen.read_all(conn)
+    moved = {s.design for s in screens if s.location_id == placeholder[0].location_id}
+    assert moved == {"D3", "D4"}
+    ordered_ids, grouped = group_by_location(screens, locations)
+    assert sum(len(grouped[lid]) for lid in ordered_ids) == 4
+
+def test_migrate_is_idempotent(legacy_db):
+    conn = schema.connect(legacy_db)
+    schema.migrate(conn)
+    before = conn.execute("SELECT type, name, sql FROM sqlite_master ORDER BY name").fetchall()
+    assert schema.migrate(conn) == len(schema.MIGRATIONS)
+    assert conn.execute("SELECT type, name, sql FROM sqlite_master ORDER BY name").fetchall() == before
+
+def test_new_database_gets_every_migration(tmp_path):
+    conn = schema.connect(str(tmp_path / "new.db"))
+    assert schema.migrate(conn) == len(schema.MIGRATIONS)
+    assert {"Screens", "Locations", "ChangeLog"} <= _names(conn, 'table')
+
+def test_read_only_connection_does_not_write(legacy_db):
+    conn = schema.connect(legacy_db, read_only=True)
+    assert not schema.is_current(conn)
+    with pytest.raises(sqlite3.OperationalError):
+        schema.migrate(conn)
+    conn.close()
+    assert sqlite3.connect(legacy_db).execute("PRAGMA user_version").fetchone()[0] == 0
+
+def test_journal_mode_defaults_to_delete(tmp_path):
+    conn = schema.connect(str(tmp_path / "new.db"))
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
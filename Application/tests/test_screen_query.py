@@ -0,0 +1,109 @@
+"""
+ScreenQuery: keyset pagination in display order, counts that agree with the pages, and the
+WHERE clause built for the view's filters.
+"""
+import pytest
+
+from model import schema
+from model.screen_query import ScreenQuery
+
+LOCATIONS = ["Rack B", "rack a", "Rack A", "Shelf", "RACK A"]
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = schema.connect(str(tmp_path / "query.db"))
+    schema.migrate(conn)
+    with conn:
+        location_ids = [conn.execute("INSERT INTO Locations (Description) VALUES (?)", (name,)).lastrowid
+                        for name in LOCATIONS]
+        rows = []
+        for i in range(37):
+            description = ["mesh 50%", "mesh 50 x", "a_b", "axb", "back\\slash", "plain"][i % 6]
+            rows.append((f"D-{i:02}", location_ids[i % len(location_ids)], f"Cust {i % 4}", i,
+                         description, i % 2))
+        conn.executemany("""INSERT INTO Screens (Design, LocationID, CustomerName, Quantity, Description, InUse)
+                            VALUES (?, ?, ?, ?, ?, ?)""", rows)
+    yield conn
+    conn.close()
+
+def _expected_order(conn):
+    rows = conn.execute("""SELECT s.ScreenID, s.LocationID, l.Description FROM Screens s
+                           JOIN Locations l ON l.LocationID = s.LocationID""").fetchall()
+    return [row[0] for row in sorted(rows, key=lambda row: (row[2].lower(), row[1], row[0]))]
+
+def _walk(conn, query, limit):
+    ids, after = [], None
+    while True:
+        screens, after = query.fetch_page(conn, after, limit)
+        ids.extend(s.screen_id for s in screens)
+        if after is None:
+            return ids
+
+@pytest.mark.parametrize('limit', [1, 2, 5, 7, 36, 37, 100])
+def test_pages_cover_every_row_once_in_order(conn, limit):
+    query = ScreenQuery()
+    ids = _walk(conn, query, limit)
+    assert ids == _expected_order(conn)
+    assert len(ids) == query.count(conn) == 37
+
+def test_duplicate_location_descriptions_stay_grouped(conn):
+    ids = _walk(conn, ScreenQuery(), 3)
+    locations = dict(conn.execute("SELECT ScreenID, LocationID FROM Screens").fetchall())
+    runs = [locations[ids[0]]]
+    for screen_id in ids[1:]:
+        if locations[screen_id] != runs[-1]:
+            runs.append(locations[screen_id])
+    # each location is one contiguous run, even those sharing a description
+    assert len(runs) == len(set(runs)) == len(LOCATIONS)
+
+@pytest.mark.parametrize('query', [
+    ScreenQuery(in_use=True),
+    ScreenQuery(location_ids=[1, 2]),
+    ScreenQuery(search="mesh", fields=['description']),
+    ScreenQuery(design="d-07"),
+])
+def test_filtered_pages_agree_with_count(conn, query):
+    ids = _walk(conn, query, 4)
+    assert len(ids) == len(set(ids)) == query.count(conn)
+    assert sum(query.count_by_location(conn).values()) == query.count(conn)
+    assert all(query.contains(conn, screen_id) for screen_id in ids)
+
+def test_count_skips_screens_the_pages_cannot_show(conn):
+    conn.execute("PRAGMA foreign_keys = OFF")
+    with conn:
+        conn.execute("INSERT INTO Screens (Design, LocationID, CustomerName, Quantity) VALUES ('X', 999, 'C', 1)")
+    query = ScreenQuery()
+    assert query.count(conn) == len(_walk(conn, query, 10)) == 37
+
+def _descriptions(conn, query):
+    ids = _walk(conn, query, None)
+    return {row[0] for row in conn.execute(
+        f"SELECT Description FROM Screens WHERE ScreenID IN ({', '.join('?' * len(ids))})", ids)}
+
+def test_like_wildcards_are_matched_literally(conn):
+    assert _descriptions(conn, ScreenQuery(search="50%", fields=['description'])) == {"mesh 50%"}
+    assert _descriptions(conn, ScreenQuery(search="a_b", fields=['description'])) == {"a_b"}
+    assert _descriptions(conn, ScreenQuery(search="k\\s", fields=['description'])) == {"back\\slash"}
+
+def test_search_is_case_insensitive_and_limited_to_fields(conn):
+    assert ScreenQuery(search="CUST 1", fields=['customer']).count(conn) == 9
+    assert ScreenQuery(search="cust 1", fields=['design']).count(conn) == 0
+    assert ScreenQuery(search="cust", fields=[]).count(conn) == 0
+
+def test_where_clause(conn):
+    assert ScreenQuery().where() == ("", [])
+    assert ScreenQuery(location_ids=[]).where() == ("WHERE 0", [])
+    clause, params = ScreenQuery(location_ids=[3, 1], in_use=False).where()
+    assert clause == "WHERE s.LocationID IN (?, ?) AND s.InUse = ?"
+    assert params == [1, 3, 0]
+
+def test_prefix_search_uses_the_fts_index(conn):
+    if not schema.ensure_search_index(conn):
+        pytest.skip("SQLite built without FTS5")
+    query = ScreenQuery(search="mes 50", fields=['description'], prefix=True)
+    clause, params = query.where()
+    assert "ScreensFTS MATCH ?" in clause
+    assert params == [schema.build_search_query("mes 50", ['description'])]
+    assert _descriptions(conn, query) == {"mesh 50%", "mesh 50 x"}
+    # text without words falls back to a substring search
+    assert "LIKE" in ScreenQuery(search="%", prefix=True).where()[0]
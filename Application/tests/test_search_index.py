@@ -0,0 +1,105 @@
+"""
+TrigramIndex: substring search over the screen fields, checked against a plain scan,
+including text shorter than a trigram, case, and screens added, changed and removed.
+"""
+import random
+
+import pytest
+
+from benchmarks.synthetic import generate
+from controller.controller import Controller
+from controller.search_index import TrigramIndex
+from model.screen import Screen
+
+FIELDS = TrigramIndex.FIELDS
+
+def _screen(screen_id, design, customer="", description=None):
+    return Screen(location_id=1, quantity=1, design=design, customer=customer, description=description,
+                  in_use=False, screen_id=screen_id)
+
+def _scan(screens, text, fields):
+    text = text.casefold()
+    return {s.screen_id for s in screens.values()
+            if any(text in (getattr(s, f) or "").casefold() for f in fields)}
+
+@pytest.fixture
+def screens():
+    return {1: _screen(1, "AB-100", "Acme", "Mesh 120"),
+            2: _screen(2, "ab-200", "ACME Corp", None),
+            3: _screen(3, "X", "Bolt", "mesh"),
+            4: _screen(4, "Straße", "bolt", "")}
+
+@pytest.fixture
+def index(screens):
+    index = TrigramIndex()
+    index.rebuild(list(screens.values()))
+    return index
+
+@pytest.mark.parametrize('text', ["", "a", "A", "ab", "x", "-1", "me", "ACM", "acme c", "mesh 1", "zzz", "ss"])
+def test_matches_a_plain_scan(index, screens, text):
+    for fields in (FIELDS, ['design'], ['customer', 'description'], []):
+        expected = _scan(screens, text, fields) if text else set(screens)
+        assert index.search(text, fields) == expected, (text, fields)
+
+def test_short_text_matches_inside_values(index):
+    assert index.search("x", ['design']) == {3}
+    assert index.search("00", ['design']) == {1, 2}
+    assert index.search("-", ['customer']) == set()
+
+def test_case_insensitive(index):
+    assert index.search("MESH", ['description']) == index.search("mesh", ['description']) == {1, 3}
+    # casefolding, not just lower(): "ß" folds to "ss"
+    assert index.search("STRASSE", ['design']) == {4}
+
+def test_update_and_remove(index, screens):
+    screens[1].customer = "Zenith"
+    index.update(screens[1])
+    assert index.search("acme", ['customer']) == {2}
+    assert index.search("zen", ['customer']) == {1}
+    index.remove(2)
+    assert index.search("acme", ['customer']) == set()
+    assert index.search("ab-", ['design']) == {1}
+    # removing twice, or a screen never indexed, is a no-op
+    index.remove(2)
+    index.remove(99)
+    index.add(_screen(5, "Acme-5", "acme"))
+    assert index.search("acme", FIELDS) == {5}
+
+def test_search_within(index):
+    assert index.search_within("mesh", FIELDS, {1, 2, 99}) == {1}
+    assert index.search_within("ab", ['design'], {2, 3}) == {2}
+
+def test_random_changes_stay_in_step():
+    rng = random.Random(7)
+    words = ["ab", "abc", "Abcd", "bcd", "MESH", "mesh 50", "acme", "x", ""]
+    index, screens = TrigramIndex(), {}
+    for step in range(600):
+        screen_id = rng.randrange(40)
+        if screen_id in screens and rng.random() < 0.3:
+            del screens[screen_id]
+            index.remove(screen_id)
+        else:
+            screens[screen_id] = _screen(screen_id, *(rng.choice(words) + rng.choice(words) for _ in FIELDS))
+            index.add(screens[screen_id])
+        if step % 50 == 0:
+            index.rebuild(list(screens.values()))
+        for text in ("a", "bc", "abc", "cdm", "MESH", "h 5", "xx"):
+            assert index.search(text, FIELDS) == _scan(screens, text, FIELDS), (step, text)
+
+def test_controller_keeps_the_index_in_step(tmp_path):
+    path = str(generate(str(tmp_path / "screens.db"), 30, 3))
+    controller = Controller(settings={'db_path': path, 'write_behind_journal': None})
+    try:
+        first, second = controller.screens[0], controller.screens[1]
+        # builds the index
+        assert first.screen_id in controller.search(first.design, ['design']).result()
+        controller.bulk_update([first.screen_id], customer="Quirkily Unique").result()
+        assert controller.search("quirkily", ['customer']).result() == {first.screen_id}
+        controller.bulk_delete([first.screen_id]).result()
+        assert controller.search("quirkily", ['customer']).result() == set()
+        added = Screen(design="ZZ-NEW", location_id=second.location_id, customer="c", quantity=1,
+                       description="", in_use=False)
+        controller.add_screen(added).result()
+        assert controller.search("zz-n", ['design']).result() == {added.screen_id}
+    finally:
+        controller.close()
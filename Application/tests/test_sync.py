@@ -0,0 +1,104 @@
+"""
+Change-log sync: two controllers on the same database file stand in for two workstations.
+Each sees the other's commits through poll_external_changes() without reloading everything.
+"""
+import pytest
+
+from benchmarks.synthetic import generate
+from controller.controller import Controller
+from controller.events import ChangeEvent
+from model import schema
+from model.screen import Screen
+
+class Recorder:
+    """
+    Observer collecting the events a controller sends.
+    """
+
+    def __init__(self):
+        self.events = []
+
+    def data_updated(self, events):
+        self.events.extend(events or [ChangeEvent(ChangeEvent.RELOADED)])
+
+@pytest.fixture
+def pair(tmp_path):
+    path = str(generate(str(tmp_path / "shared.db"), 40, 4))
+    settings = {'db_path': path, 'write_behind_journal': None}
+    here, there = Controller(settings=dict(settings)), Controller(settings=dict(settings))
+    yield here, there
+    here.close()
+    there.close()
+
+def _screen(controller, screen_id):
+    return next((s for s in controller.screens if s.screen_id == screen_id), None)
+
+def test_poll_without_changes_applies_nothing(pair):
+    here, _ = pair
+    assert here.poll_external_changes().result() is False
+
+def test_updates_are_applied_in_place(pair):
+    here, there = pair
+    recorder = Recorder()
+    here.observers.append(recorder)
+    screen_id = here.screens[0].screen_id
+    before = _screen(here, screen_id)
+
+    there.bulk_update([screen_id], quantity=99).result()
+    assert here.poll_external_changes().result() is True
+
+    assert _screen(here, screen_id) is before
+    assert before.quantity == 99
+    assert [(e.kind, e.screen_id) for e in recorder.events] == [(ChangeEvent.SCREEN_UPDATED, screen_id)]
+    assert here.poll_external_changes().result() is False
+
+def test_added_and_deleted_screens(pair):
+    here, there = pair
+    recorder = Recorder()
+    here.observers.append(recorder)
+    doomed = here.screens[1].screen_id
+    location_id = next(iter(there.locations))
+
+    added = Screen(design="SYNC-1", location_id=location_id, customer="Acme", quantity=1, description="", in_use=False)
+    there.add_screen(added).result()
+    there.bulk_delete([doomed]).result()
+    assert here.poll_external_changes().result() is True
+
+    assert _screen(here, added.screen_id).design == "SYNC-1"
+    assert _screen(here, doomed) is None
+    assert doomed not in here.screen_ids_by_location.get(here.screens[0].location_id, set())
+    kinds = {(e.kind, e.screen_id) for e in recorder.events}
+    assert kinds == {(ChangeEvent.SCREEN_ADDED, added.screen_id), (ChangeEvent.SCREEN_DELETED, doomed)}
+
+def test_location_rename(pair):
+    here, there = pair
+    location = next(iter(there.locations.values()))
+    location.description = "Renamed rack"
+    there.add_location(location).result()
+    here.sync().result()
+    assert here.locations[location.location_id].description == "Renamed rack"
+    assert "Renamed rack" in here.location_names
+
+def test_pruned_change_log_falls_back_to_reload(pair):
+    here, there = pair
+    recorder = Recorder()
+    here.observers.append(recorder)
+    ids = [s.screen_id for s in there.screens[:3]]
+    for quantity in (5, 6, 7):
+        there.bulk_update(ids, quantity=quantity).result()
+    # entries this controller never saw are gone
+    there.run(lambda connection: schema.prune_change_log(connection, 1), name='prune').result()
+
+    assert here.poll_external_changes().result() is True
+    assert ChangeEvent.RELOADED in [e.kind for e in recorder.events]
+    assert all(_screen(here, screen_id).quantity == 7 for screen_id in ids)
+
+def test_own_writes_are_not_applied_twice(pair):
+    here, _ = pair
+    screen_id = here.screens[2].screen_id
+    here.bulk_update([screen_id], quantity=3).result()
+    recorder = Recorder()
+    here.observers.append(recorder)
+    here.sync().result()
+    assert recorder.events == []
+    assert _screen(here, screen_id).quantity == 3
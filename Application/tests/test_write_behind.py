@@ -0,0 +1,157 @@
+"""
+Write-behind for in-use toggles: the journal, its lock, and recovery of changes a session
+left unsaved.
+"""
+import json
+import os
+import sqlite3
+
+import pytest
+
+from benchmarks.synthetic import generate
+from controller.controller import Controller
+from controller.write_behind import PendingWrites
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(generate(str(tmp_path / "screens.db"), 20, 2))
+
+@pytest.fixture
+def journal_path(tmp_path):
+    return str(tmp_path / "unsaved.jsonl")
+
+def _journal(journal_path):
+    with open(journal_path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+def _in_use(db_path, screen_id):
+    conn = sqlite3.connect(db_path)
+    try:
+        return bool(conn.execute("SELECT InUse FROM Screens WHERE ScreenID = ?", (screen_id,)).fetchone()[0])
+    finally:
+        conn.close()
+
+def test_changes_are_journaled(db_path, journal_path):
+    pending = PendingWrites(db_path, journal_path)
+    pending.set(1, True, original=False)
+    pending.set(2, False, original=True)
+    pending.sync()
+    assert [(e['db'], e['screen_id'], e['in_use']) for e in _journal(journal_path)] == [
+        (db_path, 1, True), (db_path, 2, False)]
+    assert len(pending) == 2
+    pending.close()
+
+def test_toggling_back_drops_the_change(db_path, journal_path):
+    pending = PendingWrites(db_path, journal_path)
+    pending.set(1, True, original=False)
+    pending.set(1, False, original=True)
+    assert len(pending) == 0
+    assert pending.take() == {}
+    pending.close()
+
+def test_commit_cuts_the_journal_back(db_path, journal_path):
+    pending = PendingWrites(db_path, journal_path)
+    pending.set(1, True, original=False)
+    changes = pending.take()
+    pending.set(2, True, original=False)
+    pending.committed(changes)
+    pending.sync()
+    assert [e['screen_id'] for e in _journal(journal_path)] == [2]
+    pending.committed(pending.take())
+    pending.sync()
+    assert not os.path.exists(journal_path)
+    pending.close()
+
+def test_other_databases_entries_are_kept(db_path, journal_path):
+    other = PendingWrites("other.db", journal_path)
+    other.set(5, True, original=False)
+    other.close()
+    pending = PendingWrites(db_path, journal_path)
+    pending.set(1, True, original=False)
+    pending.committed(pending.take())
+    pending.sync()
+    assert [(e['db'], e['screen_id']) for e in _journal(journal_path)] == [("other.db", 5)]
+    pending.close()
+
+def test_second_session_runs_without_journal(db_path, journal_path):
+    first = PendingWrites(db_path, journal_path)
+    second = PendingWrites(db_path, journal_path)
+    assert first.journal_path == journal_path
+    assert second.journal_path is None
+    first.close()
+    third = PendingWrites(db_path, journal_path)
+    assert third.journal_path == journal_path
+    third.close()
+    second.close()
+
+def test_unsaved_changes_are_recovered(db_path, journal_path):
+    settings = {'db_path': db_path, 'write_behind_journal': journal_path}
+    # a session that toggles and stops before its delayed write, like a crash
+    crashed = PendingWrites(db_path, journal_path)
+    was = _in_use(db_path, 3)
+    crashed.set(3, not was, original=was)
+    crashed.close()
+    assert _in_use(db_path, 3) == was
+
+    controller = Controller(settings=dict(settings), maintain=True)
+    try:
+        assert _in_use(db_path, 3) == (not was)
+        assert next(s for s in controller.screens if s.screen_id == 3).in_use == (not was)
+        controller.pending_writes.sync()
+        assert not os.path.exists(journal_path)
+    finally:
+        controller.close()
+
+def test_only_the_maintaining_session_recovers(db_path, journal_path):
+    settings = {'db_path': db_path, 'write_behind_journal': journal_path}
+    crashed = PendingWrites(db_path, journal_path)
+    was = _in_use(db_path, 4)
+    crashed.set(4, not was, original=was)
+    crashed.close()
+
+    Controller(settings=dict(settings)).close()
+    assert _in_use(db_path, 4) == was
+    assert [e['screen_id'] for e in _journal(journal_path)] == [4]
+
+def test_toggles_wait_for_the_flush(db_path, journal_path):
+    settings = {'db_path': db_path, 'write_behind_journal': journal_path, 'write_behind_ms': 1500}
+    controller = Controller(settings=dict(settings), maintain=True)
+    timers = []
+    controller.set_dispatcher(lambda ms, callback: timers.append((ms, callback)))
+    screen = controller.screens[5]
+    was = screen.in_use
+    controller.set_in_use(screen, not was)
+    controller.set_in_use(controller.screens[6], not controller.screens[6].in_use)
+    assert [ms for ms, _ in timers] == [1500]
+    assert _in_use(db_path, screen.screen_id) == was
+    assert len(controller.pending_writes) == 2
+
+    # closing writes what is still pending
+    controller.close()
+    assert _in_use(db_path, screen.screen_id) == (not was)
+    assert not os.path.exists(journal_path)
+
+@pytest.mark.parametrize('action', ['bulk_update', 'bulk_move', 'bulk_delete'])
+def test_bulk_write_after_a_toggle(db_path, journal_path, action):
+    settings = {'db_path': db_path, 'write_behind_journal': journal_path, 'write_behind_ms': 1500}
+    controller = Controller(settings=dict(settings), maintain=True)
+    try:
+        controller.set_dispatcher(lambda ms, callback: None)
+        screen = controller.screens[7]
+        controller.set_in_use(screen, not screen.in_use)
+        # the versions are read while the toggle is still pending, as the bulk buttons do
+        versions = {screen.screen_id: screen.row_version}
+        controller.set_dispatcher(None)
+        if action == 'bulk_update':
+            assert controller.bulk_update(versions, quantity=42).result() == 1
+            assert screen.quantity == 42
+        elif action == 'bulk_move':
+            location_id = next(lid for lid in controller.locations if lid != screen.location_id)
+            assert controller.bulk_move(versions, location_id).result() == 1
+            assert screen.location_id == location_id
+        else:
+            assert controller.bulk_delete(versions).result() == 1
+            assert screen.screen_id not in {s.screen_id for s in controller.screens}
+        assert len(controller.pending_writes) == 0
+    finally:
+        controller.close()
@@ -0,0 +1,88 @@
+"""diagnostics_window.py
+Help > Diagnostics: the timings and gauges collected by controller.diagnostics,
+refreshed every second while the window is open.
+"""
+from __future__ import annotations
+
+import tkinter as tk
+from tkinter import ttk
+from controller.diagnostics import Diagnostics
+
+TIMER_COLUMNS = (('count', "Count", 70), ('mean_ms', "Mean ms", 90), ('max_ms', "Max ms", 90),
+                 ('last_ms', "Last ms", 90), ('total_ms', "Total ms", 100))
+
+class DiagnosticsWindow(tk.Toplevel):
+    """
+    Window listing every timer (database jobs, notifications, refresh phases) and gauge
+    (live widgets, loaded screens), with a switch to turn recording on and off.
+    """
+
+    def __init__(self, parent: tk.Misc, diagnostics: Diagnostics, interval_ms: int = 1000):
+        super().__init__(parent)
+        self.diagnostics = diagnostics
+        self.interval_ms = interval_ms
+        self.title("Diagnostics")
+        self.geometry("640x560")
+
+        top = ttk.Frame(self, padding=8)
+        top.pack(fill='x')
+        self.enabled_var = tk.BooleanVar(value=diagnostics.enabled)
+        ttk.Checkbutton(top, text="Record timings", variable=self.enabled_var,
+                        command=self._toggle).pack(side='left')
+        ttk.Button(top, text="Reset", command=self._reset).pack(side='right')
+        log = diagnostics.log_path or 'off (set "diagnostics_log" in settings.json)'
+        ttk.Label(self, text=f"Log file: {log}", padding=(8, 0)).pack(fill='x')
+
+        ttk.Label(self, text="Timers", font=("Segoe UI", 10, "bold"), padding=(8, 8, 8, 2)).pack(fill='x')
+        self.timers = ttk.Treeview(self, columns=[c for c, _, _ in TIMER_COLUMNS], height=14)
+        self.timers.heading('#0', text="Name")
+        self.timers.column('#0', width=180)
+        for column, heading, width in TIMER_COLUMNS:
+            self.timers.heading(column, text=heading)
+            self.timers.column(column, width=width, anchor='e')
+        self.timers.pack(fill='both', expand=True, padx=8)
+
+        ttk.Label(self, text="Gauges", font=("Segoe UI", 10, "bold"), padding=(8, 8, 8, 2)).pack(fill='x')
+        self.gauges = ttk.Treeview(self, columns=('value',), height=6)
+        self.gauges.heading('#0', text="Name")
+        self.gauges.column('#0', width=180)
+        self.gauges.heading('value', text="Value")
+        self.gauges.column('value', width=100, anchor='e')
+        self.gauges.pack(fill='x', padx=8, pady=(0, 8))
+
+        self._update()
+
+    def _toggle(self) -> None:
+        """
+        Turns recording on or off for the running session.
+        """
+        self.diagnostics.enabled = self.enabled_var.get()
+
+    def _reset(self) -> None:
+        """
+        Clears the timers.
+        """
+        self.diagnostics.reset()
+        self._show()
+
+    def _update(self) -> None:
+        """
+        Shows the latest snapshot and schedules the next update while the window exists.
+        """
+        if not self.winfo_exists():
+            return
+        self._show()
+        self.after(self.interval_ms, self._update)
+
+    def _show(self) -> None:
+        """
+        Fills both tables from a snapshot.
+        """
+        snapshot = self.diagnostics.snapshot()
+        self.timers.delete(*self.timers.get_children())
+        for name, timing in snapshot['timers'].items():
+            values = [timing['count']] + [f"{timing[column]:.2f}" for column, _, _ in TIMER_COLUMNS[1:]]
+            self.timers.insert('', 'end', text=name, values=values)
+        self.gauges.delete(*self.gauges.get_children())
+        for name, value in snapshot['gauges'].items():
+            self.gauges.insert('', 'end', text=name, values=["n/a" if value is None else value])
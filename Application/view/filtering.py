@@ -0,0 +1,56 @@
+"""
+The filter and group step of MainView.refresh_display(), kept free of tkinter
+so it can be timed and reused without a display.
+"""
+from __future__ import annotations
+
+from model.location import Location
+from model.screen import Screen
+
+def screen_matches(screen: Screen, criteria: dict) -> bool:
+    """
+    Returns True if the screen passes the filters.
+
+    Arguments:
+        screen (Screen): the screen to check
+        criteria (dict): search_ids (set[int] | None), loc_ids (set[int], empty for all)
+            and in_use (bool | None), as built by MainView._with_criteria()
+    """
+    loc_ids = criteria['loc_ids']
+    if loc_ids and screen.location_id not in loc_ids:
+        return False
+    if criteria['in_use'] is not None and screen.in_use != criteria['in_use']:
+        return False
+    search_ids = criteria['search_ids']
+    if search_ids is not None and screen.screen_id not in search_ids:
+        return False
+    return True
+
+def filter_screens(screens: list[Screen], criteria: dict) -> list[Screen]:
+    """
+    Returns the screens that pass the filters, in their original order.
+
+    Arguments:
+        screens (list[Screen]): the screens to filter, e.g. Controller.screens
+        criteria (dict): the filters, see screen_matches()
+    """
+    return [screen for screen in screens if screen_matches(screen, criteria)]
+
+def group_by_location(screens: list[Screen],
+                      locations: dict[int, Location]) -> tuple[list[int], dict[int, list[Screen]]]:
+    """
+    Groups screens by location.
+
+    Arguments:
+        screens (list[Screen]): the screens to group, e.g. from filter_screens()
+        locations (dict[int, Location]): every location by id
+
+    Returns:
+        ordered_ids (list[int]): ids of the locations holding screens, by description (case-insensitive)
+        grouped (dict[int, list[Screen]]): the screens of each location, in their original order
+    """
+    grouped = {}
+    for screen in screens:
+        grouped.setdefault(screen.location_id, []).append(screen)
+    ordered_ids = sorted(grouped, key=lambda lid: locations[lid].description.lower())
+    return ordered_ids, grouped
@@ -1,7 +1,9 @@
 """location_frame.py
 A frame representing a single location and its associated screens.
-Each LocationFrame shows a heading label and dynamically creates a
-ScreenFrame for every screen stored in the given location.
+Each LocationFrame shows a heading with the screen count and can be collapsed;
+the ScreenFrames of its screens are only created while it is expanded.
+LocationHeader is the heading on its own, so the windowed display in
+MainView can place headers as individual rows.
 """
 from __future__ import annotations
 
@@ -10,31 +12,194 @@ from tkinter import ttk
 from controller.controller import Controller
 from model.location import Location
 from model.screen import Screen
-from .screen_frame import ScreenFrame
+from .screen_frame import ScreenFrame, ScreenFramePool
 
-class LocationFrame(tk.Frame):
+class LocationHeader(tk.Frame):
     """
-    UI component that groups screens by location.
+    Bold "LOCATION: ..." heading shown above a location's screens.
+    Given on_toggle it also shows an expand/collapse arrow and the screen count,
+    and clicking it calls on_toggle.
     """
 
-    def __init__(self, parent: tk.Widget, controller: Controller, location: Location, screens: list[Screen], select_callback=None):
+    def __init__(self, parent: tk.Widget, location: Location, on_toggle=None):
         super().__init__(parent)
-        self.controller = controller
         self.location = location
-        self.screens = screens
-        self.select_callback = select_callback
+        self.on_toggle = on_toggle
 
         # Styling bold title for location header
         header_bg = self.cget("bg")
-        header = tk.Label(
+        self.label = tk.Label(
             self,
             text=f"LOCATION: {self.location.description}",
             font=("Segoe UI", 10, "bold"),
             bg=header_bg
         )
-        header.pack(anchor="w", padx=2, pady=(4, 2))
+        self.label.pack(anchor="w", padx=2, pady=(4, 2))
+        if on_toggle is not None:
+            self.label.configure(cursor="hand2")
+            self.label.bind("<Button-1>", lambda e: self.on_toggle())
+
+    def show_state(self, expanded: bool, count: int) -> None:
+        """
+        Updates the arrow and screen count of a collapsible header.
+
+        Arguments:
+            expanded (bool): whether the screens are shown
+            count (int): screens in the group
+        """
+        arrow = "▾" if expanded else "▸"
+        noun = "screen" if count == 1 else "screens"
+        self.label.configure(text=f"{arrow} LOCATION: {self.location.description} ({count} {noun})")
+
+class LocationFrame(tk.Frame):
+    """
+    UI component that groups screens by location.
+    """
+
+    def __init__(self, parent: tk.Widget, controller: Controller, location: Location, screens: list[Screen],
+                 select_callback=None, pool: ScreenFramePool | None = None, expanded: bool = True,
+                 on_toggle=None):
+        """
+        Arguments:
+            expanded (bool): build the screen rows now, otherwise only on expand()
+            on_toggle (Callable[[LocationFrame], Any] | None): called when the header is clicked,
+                None makes clicking the header toggle the frame itself
+        """
+        super().__init__(parent)
+        self.controller = controller
+        self.location = location
+        self.screens = screens
+        self._screen_ids = {screen.screen_id for screen in screens}
+        self.select_callback = select_callback
+        self.pool = pool
+        self.expanded = False
+
+        self.header = LocationHeader(self, self.location,
+                                     on_toggle=(lambda: on_toggle(self)) if on_toggle is not None else self.toggle)
+        self.header.pack(anchor="w")
+
+        # ScreenFrames of the screens, only while expanded
+        self.frames: dict[int, ScreenFrame] = {}
+        if expanded:
+            self.expand()
+        else:
+            self._show_state()
+
+    def contains(self, screen_id: int) -> bool:
+        """
+        Returns True if the screen is in this group, built or not.
+        """
+        return screen_id in self._screen_ids
+
+    def toggle(self) -> None:
+        """
+        Expands a collapsed frame, collapses an expanded one.
+        """
+        if self.expanded:
+            self.collapse()
+        else:
+            self.expand()
+
+    def expand(self) -> None:
+        """
+        Builds and shows the screen rows.
+        """
+        for _ in self.expand_steps():
+            pass
+
+    def expand_steps(self):
+        """
+        Generator version of expand() that yields after each row, for the ProgressiveRenderer.
+        """
+        if self.expanded:
+            return
+        self.expanded = True
+        self._show_state()
+        for screen in list(self.screens):
+            if not self.expanded:
+                # collapsed while the rows were being built
+                return
+            # a screen may have been removed meanwhile, or its row built by a later expand
+            if screen.screen_id in self._screen_ids and screen.screen_id not in self.frames:
+                self._build_screen_frame(screen)
+                yield
+
+    def collapse(self) -> None:
+        """
+        Hides the screen rows, handing their frames back (to the pool, if any).
+        """
+        if not self.expanded:
+            return
+        self.expanded = False
+        for sf in self.frames.values():
+            self._drop_screen_frame(sf)
+        self.frames = {}
+        self._show_state()
+
+    def _show_state(self) -> None:
+        """
+        Updates the header's arrow and count.
+        """
+        self.header.show_state(self.expanded, len(self.screens))
+
+    def _build_screen_frame(self, screen: Screen) -> None:
+        """
+        Creates (or takes from the pool) the ScreenFrame for a screen and packs it at the bottom.
+        """
+        if self.pool is None:
+            sf = ScreenFrame(self, self.controller, screen, select_callback=self.select_callback)
+            sf.pack(anchor="w", pady=1, padx=20)
+        else:
+            # pooled frames belong to our parent, pack them into this frame and raise them above it
+            sf = self.pool.acquire(screen)
+            sf.pack(in_=self, anchor="w", pady=1, padx=20)
+            sf.lift(self)
+        self.frames[screen.screen_id] = sf
+
+    def _drop_screen_frame(self, sf: ScreenFrame) -> None:
+        """
+        Destroys a ScreenFrame, or releases it to the pool.
+        """
+        if self.pool is None:
+            sf.destroy()
+        else:
+            self.pool.release(sf)
+
+    def add_screen(self, screen: Screen) -> None:
+        """
+        Appends a screen that now belongs in this location, with a row if expanded.
+
+        Arguments:
+            screen (Screen): the screen to show
+        """
+        self.screens.append(screen)
+        self._screen_ids.add(screen.screen_id)
+        if self.expanded:
+            self._build_screen_frame(screen)
+        self._show_state()
+
+    def update_screen(self, screen: Screen, selected: bool = False) -> None:
+        """
+        Rebinds the row of a screen that changed but stays in this location.
+
+        Arguments:
+            screen (Screen): the changed screen
+            selected (bool): whether the screen is among the selected screens
+        """
+        sf = self.frames.get(screen.screen_id)
+        if sf is not None:
+            sf.bind_screen(screen, selected)
+
+    def remove_screen(self, screen_id: int) -> None:
+        """
+        Removes a screen that was deleted or no longer belongs here, with its row if built.
 
-        # Build individual ScreenFrames
-        for screen in self.screens:
-            sf = ScreenFrame(self, controller, screen, select_callback=self.select_callback)
-            sf.pack(anchor="w", pady=1, padx=20)
\ No newline at end of file
+        Arguments:
+            screen_id (int): the id of the screen to remove
+        """
+        self.screens = [s for s in self.screens if s.screen_id != screen_id]
+        self._screen_ids.discard(screen_id)
+        sf = self.frames.pop(screen_id, None)
+        if sf is not None:
+            self._drop_screen_frame(sf)
+        self._show_state()
@@ -1,11 +1,24 @@
+from __future__ import annotations
+
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from controller.controller import Controller
+from controller.events import ChangeEvent
 from tkinter import font as tkfont
 from model.location import Location
 from model.screen import Screen
-from view.location_frame import LocationFrame
-from view.screen_frame import ScreenFrame
+from model.screen_query import ScreenQuery
+from pathlib import Path
+import time
+from view.filtering import filter_screens, group_by_location, screen_matches
+from view.location_frame import LocationFrame, LocationHeader
+from view.progressive import ProgressiveRenderer
+from view.screen_frame import ScreenFrame, ScreenFramePool
+from view.screen_table import ScreenTable
+from view.virtual_list import VirtualList
+
+STANDARD_FONTS = ('TkDefaultFont', 'TkTextFont', 'TkFixedFont', 'TkMenuFont', 'TkHeadingFont',
+                  'TkCaptionFont', 'TkSmallCaptionFont', 'TkIconFont', 'TkTooltipFont')
 
 class MainView(tk.Tk):
     """
@@ -13,15 +26,17 @@ class MainView(tk.Tk):
     """
     def __init__(self, controller: Controller):
         super().__init__()
-        # enlarge default fonts
-        for fname in self.tk.call('font','names'):
-            f=tkfont.nametofont(fname)
-            try:
-                f.configure(size=f.cget('size')+2)
-            except Exception:
-                pass
+        # enlarge the standard fonts every widget defaults to, negative sizes are in pixels
+        for fname in STANDARD_FONTS:
+            f = tkfont.nametofont(fname)
+            size = f.cget('size')
+            f.configure(size=size + 2 if size >= 0 else size - 2)
 
         self.controller = controller
+        # "virtual" only builds widgets for visible rows, "paged" also reads screens from the
+        # database a page at a time as the user scrolls, "full" builds every row,
+        # "table" shows the screens as rows of a single Treeview
+        self.display_mode = self.controller.get_setting('display_mode', 'virtual')
         self.title("Screen Locator")
         self.state("zoomed")
         # scale window to 85% of current monitor and expose a scale factor for child widgets
@@ -29,12 +44,20 @@ class MainView(tk.Tk):
         w, h = int(sw*0.85), int(sh*0.85)
         x, y = (sw-w)//2, (sh-h)//2
 
-        # menubar with settings
+        # menubar with file and settings
         menubar = tk.Menu(self)
+        file_menu = tk.Menu(menubar, tearoff=0)
+        file_menu.add_command(label="Import Screens from CSV...", command=self._import_csv)
+        file_menu.add_command(label="Export Current View...", command=self._export_view)
+        menubar.add_cascade(label="File", menu=file_menu)
         settings_menu = tk.Menu(menubar, tearoff=0)
         settings_menu.add_command(label="Change Database Path", command=self._change_db_path)
         menubar.add_cascade(label="Settings", menu=settings_menu)
+        help_menu = tk.Menu(menubar, tearoff=0)
+        help_menu.add_command(label="Diagnostics", command=self._show_diagnostics)
+        menubar.add_cascade(label="Help", menu=help_menu)
         self.config(menu=menubar)
+        self._diagnostics_window = None
 
         # layout
         root = ttk.Frame(self); root.pack(fill='both', expand=True)
@@ -54,6 +77,19 @@ class MainView(tk.Tk):
         # register as observer so we refresh when data changes
         if hasattr(self.controller, 'observers'):
             self.controller.observers.append(self)
+        # deliver coalesced change notifications from the Tk idle loop
+        self.controller.set_scheduler(self.after_idle)
+        # run database work on the controller's worker thread, results come back through after()
+        self.controller.set_dispatcher(self.after)
+        # pick up edits made by other workstations
+        self._schedule_sync_poll()
+
+        diagnostics = self.controller.diagnostics
+        diagnostics.gauge('widgets.screen_frames', lambda: len(self._live_screen_frames()))
+        # only the full display has LocationFrames
+        diagnostics.gauge('widgets.location_frames', lambda: len(getattr(self, '_location_frames', ())))
+        diagnostics.gauge('widgets.total', self._count_widgets)
+        diagnostics.gauge('screens.shown', self._count_shown_screens)
 
         # first paint
         self.refresh_display()
@@ -64,11 +100,134 @@ class MainView(tk.Tk):
         """
         new_path = filedialog.askopenfilename(title="Select SQLite DB", filetypes=[("SQLite DB","*.db"), ("All","*.*")])
         if new_path:
-            try:
-                self.controller.update_db_path(new_path)
-                messagebox.showinfo("Database Updated", f"Database path updated to:\n{new_path}")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to switch database:\n{e}")
+            def done(future):
+                if future.exception() is not None:
+                    messagebox.showerror("Error", f"Failed to switch database:\n{future.exception()}")
+                else:
+                    messagebox.showinfo("Database Updated", f"Database path updated to:\n{new_path}")
+            self.controller.update_db_path(new_path).add_done_callback(done)
+
+    def _import_csv(self) -> None:
+        """
+        Prompts for a CSV file and imports its screens in the background, showing progress in
+        the busy indicator and a summary when done. Rejected rows are written next to the file.
+        """
+        path = filedialog.askopenfilename(title="Import Screens", filetypes=[("CSV","*.csv"), ("All","*.*")])
+        if not path:
+            return
+        rejects_path = str(Path(path).with_name(Path(path).stem + "_rejected.csv"))
+        # written by the worker thread, read by _show_import_progress
+        self._import_rows = 0
+        def progress(report):
+            self._import_rows = report.rows_read
+        future = self.controller.import_csv(path, progress=progress, rejects_path=rejects_path)
+        self._show_import_progress(future)
+
+        def done(f):
+            if f.exception() is not None:
+                messagebox.showerror("Import Failed", f"The import stopped:\n{f.exception()}\n\n"
+                                     "Rows before the failure were imported.")
+                return
+            report = f.result()
+            summary = f"Imported {report.imported} of {report.rows_read} rows."
+            if report.locations_created:
+                summary += f"\nCreated {len(report.locations_created)} new locations."
+            if report.rejected:
+                reasons = "\n".join(f"line {line}: {reason}" for line, reason in report.rejections[:10])
+                summary += f"\n\n{report.rejected} rows were rejected and saved to:\n{rejects_path}\n\n{reasons}"
+            messagebox.showinfo("Import Finished", summary)
+        future.add_done_callback(done)
+
+    def _show_import_progress(self, future) -> None:
+        """
+        Shows the import's row count in the busy indicator until it finishes.
+        """
+        if future.done():
+            return
+        self.busy_text.set(f"Importing... {self._import_rows} rows")
+        self.after(250, lambda: self._show_import_progress(future))
+
+    def _export_view(self) -> None:
+        """
+        Prompts for a file and exports the screens matching the current filters to it,
+        as JSON Lines if the name ends in .jsonl, otherwise CSV. Rows are streamed from the
+        database, so this works for result sets far larger than what is loaded.
+        """
+        path = filedialog.asksaveasfilename(title="Export Screens", defaultextension=".csv",
+                                            filetypes=[("CSV","*.csv"), ("JSON Lines","*.jsonl")])
+        if not path:
+            return
+        fmt = 'jsonl' if path.lower().endswith('.jsonl') else 'csv'
+        # written by the worker thread, read by _show_export_progress
+        self._export_rows = 0
+        def progress(rows):
+            self._export_rows = rows
+        future = self.controller.export_screens(self._build_screen_query(), path, fmt, progress=progress)
+        self._show_export_progress(future)
+
+        def done(f):
+            if f.exception() is not None:
+                messagebox.showerror("Export Failed", f"The export failed:\n{f.exception()}")
+            else:
+                messagebox.showinfo("Export Finished", f"Exported {f.result()} screens to:\n{path}")
+        future.add_done_callback(done)
+
+    def _show_export_progress(self, future) -> None:
+        """
+        Shows the export's row count in the busy indicator until it finishes.
+        """
+        if future.done():
+            return
+        self.busy_text.set(f"Exporting... {self._export_rows} rows")
+        self.after(250, lambda: self._show_export_progress(future))
+
+    def _report_failure(self, future, message: str) -> None:
+        """
+        Shows an error dialog if the database operation behind future fails.
+
+        Arguments:
+            future (Future): returned by a controller operation
+            message (str): first line of the dialog
+        """
+        def done(f):
+            if f.exception() is not None:
+                messagebox.showerror('Error', f'{message}\n{f.exception()}')
+        future.add_done_callback(done)
+
+    def busy_changed(self, busy: bool) -> None:
+        """
+        Callback triggered by Controller when database work starts or finishes.
+        The indicator only appears if the work takes longer than busy_delay_ms, so quick writes don't flicker it.
+        """
+        if self._busy_job is not None:
+            self.after_cancel(self._busy_job)
+            self._busy_job = None
+        if busy:
+            self._busy_job = self.after(self.controller.get_setting('busy_delay_ms', 200), self._show_busy)
+        else:
+            self.busy_progress.stop()
+            self.busy_bar.pack_forget()
+            self.busy_text.set("Working...")
+
+    def _show_busy(self) -> None:
+        """
+        Shows the busy indicator, see busy_changed().
+        """
+        self._busy_job = None
+        self.busy_bar.pack(side='bottom', fill='x', pady=(6,0))
+        self.busy_progress.start(15)
+
+    def unsaved_changed(self, count: int) -> None:
+        """
+        Called by the Controller when the number of screens with unsaved in-use changes changes.
+        Shows the count until they are written.
+        """
+        if count:
+            noun = "change" if count == 1 else "changes"
+            self.unsaved_text.set(f"\u25cf {count} unsaved {noun}")
+            self.unsaved_bar.pack(side='bottom', fill='x', pady=(6,0))
+        else:
+            self.unsaved_bar.pack_forget()
 
     def _build_sidebar(self, parent):
         """
@@ -77,10 +236,30 @@ class MainView(tk.Tk):
         ttk.Label(parent, text="Screen Locator",
                   font=('Segoe UI', 14, 'bold')).pack(anchor='w', pady=(0,10))
 
+        # busy indicator, packed at the bottom while database work is pending
+        self._busy_job = None
+        self.busy_bar = ttk.Frame(parent)
+        self.busy_text = tk.StringVar(value="Working...")
+        ttk.Label(self.busy_bar, textvariable=self.busy_text).pack(side='left')
+        self.busy_progress = ttk.Progressbar(self.busy_bar, mode='indeterminate', length=100)
+        self.busy_progress.pack(side='left', fill='x', expand=True, padx=(6,0))
+
+        # unsaved indicator, packed at the bottom while in-use toggles wait to be written
+        self.unsaved_bar = ttk.Frame(parent)
+        self.unsaved_text = tk.StringVar()
+        ttk.Label(self.unsaved_bar, textvariable=self.unsaved_text, foreground='#b35900').pack(side='left')
+        ttk.Button(self.unsaved_bar, text="Save Now", command=self.controller.flush_writes).pack(side='right')
+
         # search widgets
         search_row = ttk.Frame(parent); search_row.pack(fill='x', pady=(0,6))
         ttk.Label(search_row, text="Search").pack(side='left')
         self.search_var = tk.StringVar()
+        # live search: re-filter shortly after the user stops typing
+        self._search_job = None
+        self._last_search = None
+        self._refresh_generation = 0  # bumped by every rebuild, drops searches started before it
+        if self.controller.get_setting('live_search', True):
+            self.search_var.trace_add('write', lambda *args: self._on_search_changed())
         search_entry = ttk.Entry(search_row, textvariable=self.search_var)
         search_entry.pack(side='left', fill='x', expand=True)
         search_entry.bind('<Return>', lambda e: self.refresh_display())
@@ -139,6 +318,22 @@ class MainView(tk.Tk):
         self.loc_rows={}  # mapping loc_id -> row frame
         self._update_location_filter_widgets()
 
+    def _on_search_changed(self) -> None:
+        """
+        Debounces keystrokes in the search box: every keystroke cancels the search still
+        waiting from the previous one, so only the latest text is searched.
+        """
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(self.controller.get_setting('search_debounce_ms', 250), self._run_live_search)
+
+    def _run_live_search(self) -> None:
+        """
+        Runs the search scheduled by _on_search_changed().
+        """
+        self._search_job = None
+        self.refresh_display()
+
     def _build_display_area(self, parent):
         """
         Creates the frames for the various groups of UI components.
@@ -162,6 +357,16 @@ class MainView(tk.Tk):
         self.action_bar.grid(row=2, column=0, columnspan=2, sticky='ew')
         self._build_action_bar()
 
+        if self.display_mode == 'table':
+            # the Treeview scrolls itself and has no row widgets to pool or render
+            self.table = ScreenTable(parent, self.controller, on_select=self._table_selection_changed,
+                                     expand_default=not self.controller.get_setting('collapse_locations', True))
+            self.table.grid(row=3, column=0, columnspan=2, sticky='nsew')
+            self.screen_pool = None
+            self.renderer = None
+            return
+        self.table = None
+
         # scrollable canvas (row 3)
         self.display_canvas = tk.Canvas(parent, borderwidth=0)
         vsb = ttk.Scrollbar(parent, orient="vertical", command=self.display_canvas.yview)
@@ -169,16 +374,56 @@ class MainView(tk.Tk):
 
         self.display_canvas.grid(row=3, column=0, sticky='nsew')
         vsb.grid(row=3, column=1, sticky='ns')
+        # mouse wheel binding (reuse code you already added)
+        self._bind_mousewheel(self.display_canvas)
+
+        if self.display_mode in ('virtual', 'paged'):
+            # screen rows come from a pool of reusable frames
+            self.screen_pool = ScreenFramePool(self.display_canvas, self.controller, select_callback=self._select_callback)
+            self.virtual_list = VirtualList(
+                self.display_canvas, vsb,
+                factories={'location': LocationHeader, 'screen': self._build_screen_row},
+                releasers={'screen': self.screen_pool.release},
+                indents={'location': 4, 'screen': 24},
+                on_near_end=self._load_next_page if self.display_mode == 'paged' else None,
+                keys={'location': lambda location: location.location_id, 'screen': lambda screen: screen.screen_id},
+                # a row being edited would lose its unsaved edits if it were rebound
+                pinned={'screen': lambda sf: sf.editing},
+            )
+            self.renderer = None
+            return
 
         self.scroll_frame = ttk.Frame(self.display_canvas)
+        # pooled frames are children of scroll_frame and packed into each LocationFrame
+        self.screen_pool = ScreenFramePool(self.scroll_frame, self.controller, select_callback=self._select_callback)
+        self._location_frames: dict[int, LocationFrame] = {}
+        # location id -> expanded, for groups the user toggled; the rest follow _expand_default
+        self._expanded_locations: dict[int, bool] = {}
+        self._expand_default = not self.controller.get_setting('collapse_locations', True)
+        # builds the rows a slice at a time so the first screenful shows at once
+        self.renderer = ProgressiveRenderer(self, self.controller.get_setting('render_slice_ms', 15))
+        # ids of screens changed while the display is being rebuilt, patched in once the render is done
+        self._deferred_patches: set[int] | None = None
         self.display_canvas.create_window((0,0), window=self.scroll_frame, anchor='nw')
 
         self.scroll_frame.bind(
             "<Configure>",
             lambda e: self.display_canvas.configure(scrollregion=self.display_canvas.bbox("all"))
         )
-        # mouse wheel binding (reuse code you already added)
-        self._bind_mousewheel(self.display_canvas)
+
+    def _build_screen_row(self, parent, screen: Screen) -> ScreenFrame:
+        """
+        Row factory for the virtual list, keeps the checkbox in sync with selected_screens.
+        """
+        sf = self.screen_pool.acquire(screen)
+        sf.selected_var.set(screen in self.selected_screens)
+        return sf
+
+    def _live_screen_frames(self) -> list[ScreenFrame]:
+        """
+        Returns the ScreenFrames currently shown, none in the table display.
+        """
+        return self.screen_pool.in_use() if self.screen_pool is not None else []
 
     def _bind_mousewheel(self, canvas):
         def _on(event, target_canvas=canvas, root_widget=canvas):
@@ -211,11 +456,12 @@ class MainView(tk.Tk):
         """
         Prompts to confirm deletion, prevents deletion if screens still attributed to that location.
         """
-        if any(s.location_id == loc.location_id for s in self.controller.screens):
+        # in paged mode not every screen is loaded, the database's foreign key still refuses the delete
+        if self.controller.screen_count(loc.location_id):
             messagebox.showerror('Cannot Delete', 'There are screens assigned to this location. Move or delete them first.')
             return
         if messagebox.askyesno('Delete Location', f'Delete location "{loc.description}"?'):
-            self.controller.delete_location(loc)
+            self._report_failure(self.controller.delete_location(loc), 'The location was not deleted:')
 
     def _update_location_filter_widgets(self) -> None:
         """
@@ -249,11 +495,180 @@ class MainView(tk.Tk):
             var.set(not val)
         self.refresh_display()
 
-    def data_updated(self) -> None:
+    def _schedule_sync_poll(self) -> None:
+        """
+        Schedules the next check for changes from other workstations, sync_poll_ms of 0 disables it.
+        """
+        interval = self.controller.get_setting('sync_poll_ms', 2000)
+        if interval:
+            self.after(interval, self._poll_external_changes)
+
+    def _poll_external_changes(self) -> None:
+        """
+        Applies changes committed by other workstations, if any. A locked or unreachable
+        database is simply retried on the next poll.
+        """
+        # failures are logged by the controller
+        self.controller.poll_external_changes()
+        self._schedule_sync_poll()
+
+    def data_updated(self, events: list[ChangeEvent] | None = None) -> None:
         """
         Callback triggered by Controller when underlying data changes.
+        Screen events are patched into the display row by row, anything else rebuilds it.
+
+        Arguments:
+            events (list[ChangeEvent] | None): what changed, None rebuilds everything
         """
-        self.refresh_display()
+        # cached search results may no longer be accurate
+        self._last_search = None
+        if self.display_mode == 'paged':
+            # rows are copies read from the database, re-read what is loaded
+            if events is not None and any(e.kind in ChangeEvent.LOCATION_KINDS for e in events):
+                self._update_location_filter_widgets()
+                self._refresh_create_dropdowns()
+            self._refresh_paged(keep_position=True)
+            return
+        if events is None or any(e.kind in (ChangeEvent.RELOADED, ChangeEvent.LOCATION_RENAMED) for e in events):
+            self.refresh_display()
+            return
+
+        if any(e.kind in ChangeEvent.LOCATION_KINDS for e in events):
+            self._update_location_filter_widgets()
+            self._refresh_create_dropdowns()
+
+        screen_ids = {e.screen_id for e in events if e.kind in ChangeEvent.SCREEN_KINDS}
+        if not screen_ids:
+            return
+        if self.renderer is not None and self._deferred_patches is not None:
+            # rows not built yet would come from the data the render started with
+            self._deferred_patches.update(screen_ids)
+            return
+        self._patch_screens(screen_ids)
+
+    def _patch_screens(self, screen_ids: set[int]) -> None:
+        """
+        Patches the rows of the given screens with the current filters, see _patch_screen().
+        """
+        def patch(criteria):
+            screens = {s.screen_id: s for s in self.controller.screens if s.screen_id in screen_ids}
+            for screen_id in screen_ids:
+                self._patch_screen(screen_id, screens.get(screen_id), criteria)
+            self._update_action_bar_state()
+        self._with_criteria(patch)
+
+    def _patch_screen(self, screen_id: int, screen: Screen | None, criteria: dict) -> None:
+        """
+        Brings a single screen's row in line with the model: rebinds it in place,
+        moves it to another location group, or removes it.
+
+        Arguments:
+            screen_id (int): the changed screen
+            screen (Screen | None): the screen as now in the controller, None if deleted
+            criteria (dict): the current filters from _with_criteria()
+        """
+        matches = screen is not None and self._screen_matches(screen, criteria)
+
+        if self.display_mode == 'table':
+            # the table drops the screen from its selection, which updates selected_screens
+            self.table.patch(screen_id, screen, matches)
+            return
+        if self.display_mode == 'virtual':
+            vl = self.virtual_list
+            idx = vl.position('screen', screen_id)
+            if idx != -1:
+                if matches and self._group_location_id(idx) == screen.location_id:
+                    self._carry_selection(vl.rows[idx][1], screen)
+                    vl.update_row(idx, screen)
+                    return
+                self.selected_screens.discard(vl.rows[idx][1])
+                self._remove_screen_row(idx)
+            if matches:
+                self._insert_screen_row(screen)
+            return
+
+        current = next((lf for lf in self._location_frames.values() if lf.contains(screen_id)), None)
+        if current is not None:
+            if matches and current.location.location_id == screen.location_id:
+                old = current.frames[screen_id].screen if screen_id in current.frames else None
+                current.update_screen(screen, self._carry_selection(old, screen))
+                return
+            if screen_id in current.frames:
+                self.selected_screens.discard(current.frames[screen_id].screen)
+            current.remove_screen(screen_id)
+            if not current.screens:
+                del self._location_frames[current.location.location_id]
+                current.destroy()
+        if matches:
+            self._insert_screen_frame(screen)
+
+    def _group_location_id(self, idx: int) -> int:
+        """
+        Returns the location id of the header above row idx in the virtual list.
+        """
+        rows = self.virtual_list.rows
+        while idx >= 0 and rows[idx][0] != 'location':
+            idx -= 1
+        return rows[idx][1].location_id if idx >= 0 else -1
+
+    def _remove_screen_row(self, idx: int) -> None:
+        """
+        Removes a screen row from the virtual list, along with its header if the group becomes empty.
+        """
+        rows = self.virtual_list.rows
+        header_above = idx > 0 and rows[idx - 1][0] == 'location'
+        group_ends = idx + 1 == len(rows) or rows[idx + 1][0] == 'location'
+        if header_above and group_ends:
+            self.virtual_list.remove_rows(idx - 1, 2)
+        else:
+            self.virtual_list.remove_rows(idx)
+
+    def _insert_screen_row(self, screen: Screen) -> None:
+        """
+        Appends a screen row to its location group in the virtual list, creating the group if needed.
+        """
+        vl = self.virtual_list
+        # the group ends where the next shown location's header starts
+        end = self._next_header_position(screen.location_id)
+        if vl.position('location', screen.location_id) != -1:
+            vl.insert_rows(end, [('screen', screen)])
+        else:
+            vl.insert_rows(end, [('location', self.controller.locations[screen.location_id]), ('screen', screen)])
+
+    def _next_header_position(self, location_id: int) -> int:
+        """
+        Returns the row of the first header in the virtual list that sorts after the location,
+        or the end of the list if there is none.
+        """
+        vl = self.virtual_list
+        name = self.controller.locations[location_id].description.lower()
+        following = [location for location in self.controller.locations.values()
+                     if location.description.lower() > name]
+        for location in sorted(following, key=lambda location: location.description.lower()):
+            idx = vl.position('location', location.location_id)
+            if idx != -1:
+                return idx
+        return len(vl.rows)
+
+    def _insert_screen_frame(self, screen: Screen) -> None:
+        """
+        Adds a screen to its LocationFrame in the full display, creating the LocationFrame if needed.
+        """
+        lf = self._location_frames.get(screen.location_id)
+        if lf is not None:
+            lf.add_screen(screen)
+            return
+        location = self.controller.locations[screen.location_id]
+        name = location.description.lower()
+        after = [f for f in self._location_frames.values() if f.location.description.lower() > name]
+        lf = LocationFrame(self.scroll_frame, self.controller, location, [screen], pool=self.screen_pool,
+                           expanded=self._is_expanded(location.location_id), on_toggle=self._toggle_location)
+        if after:
+            before = min(after, key=lambda f: f.location.description.lower())
+            lf.pack(fill='x', pady=2, padx=4, anchor='n', before=before)
+        else:
+            lf.pack(fill='x', pady=2, padx=4, anchor='n')
+        self._location_frames[screen.location_id] = lf
 
     def _build_location_create_bar(self) -> None:
         ttk.Label(self.loc_create_bar, text='New Location:').pack(side='left')
@@ -299,18 +714,22 @@ class MainView(tk.Tk):
         # Move to location dropdown
         ttk.Label(self.action_bar, text='Move to:').pack(side='left', padx=(20,2))
         self.move_loc_var = tk.StringVar()
-        loc_names=[loc.description for loc in self.controller.locations.values()]
+        loc_names=self.controller.location_names
         self.move_combo=ttk.Combobox(self.action_bar, values=loc_names, state='readonly', width=25, textvariable=self.move_loc_var)
         self.move_combo.pack(side='left')
         move_btn = ttk.Button(self.action_bar, text='Move', command=self._bulk_move, state='disabled')
         move_btn.pack(side='left', padx=2)
         self.action_bar_buttons['Move']=move_btn
+        if self.display_mode not in ('virtual', 'paged'):
+            # the full and table displays group screens under collapsible locations
+            ttk.Button(self.action_bar, text='Collapse All', command=lambda: self._expand_all(False)).pack(side='right', padx=2, pady=2)
+            ttk.Button(self.action_bar, text='Expand All', command=lambda: self._expand_all(True)).pack(side='right', padx=2, pady=2)
 
     def _refresh_create_dropdowns(self) -> None:
         """
         Refreshes the dropdown for creating a new location.
         """
-        loc_names=[loc.description for loc in self.controller.locations.values()]
+        loc_names=self.controller.location_names
         self.new_loc_combo['values']=loc_names
         self.move_combo['values']=loc_names
 
@@ -322,10 +741,10 @@ class MainView(tk.Tk):
         if not desc:
             messagebox.showerror('Error','Description cannot be empty')
             return
-        if desc.lower() in [l.description.lower() for l in self.controller.locations.values()]:
+        if desc.casefold() in self.controller.locations_by_folded_name:
             messagebox.showerror('Error','Location description must be unique')
             return
-        self.controller.add_location(Location(desc))
+        self._report_failure(self.controller.add_location(Location(desc)), 'The location was not saved:')
         self.new_loc_var.set('')
 
     def _create_screen(self) -> None:
@@ -337,20 +756,15 @@ class MainView(tk.Tk):
         qty=self.new_qty_var.get().strip()
         desc=self.new_desc_var.get().strip()
         loc_name=self.new_loc_choice.get().strip()
-        # validations similar to ScreenFrame.validate_entries
-        if not design:
-            messagebox.showerror('Validation Error','Design cannot be empty.'); return
-        if not customer:
-            messagebox.showerror('Validation Error','Customer cannot be empty.'); return
-        if not qty:
-            messagebox.showerror('Validation Error','Quantity cannot be empty.'); return
-        if not qty.isdigit():
-            messagebox.showerror('Validation Error','Quantity must be an integer.'); return
-        if not loc_name:
-            messagebox.showerror('Validation Error','Location must be selected.'); return
-        location_id=[l.location_id for l in self.controller.locations.values() if l.description==loc_name][0]
-        screen=Screen(location_id,int(qty),design,customer,desc,self.new_inuse_var.get())
-        self.controller.add_screen(screen)
+        # same rules as ScreenFrame.validate_entries and the CSV import
+        error=Screen.validate_fields(design, customer, qty, loc_name)
+        if error is not None:
+            messagebox.showerror('Validation Error', error); return
+        location=self.controller.locations_by_name.get(loc_name)
+        if location is None:
+            messagebox.showerror('Validation Error','Location no longer exists.'); return
+        screen=Screen(location.location_id,int(qty),design,customer,desc,self.new_inuse_var.get())
+        self._report_failure(self.controller.add_screen(screen), 'The screen was not saved:')
         # clear
         self.new_design_var.set(''); self.new_customer_var.set(''); self.new_qty_var.set(''); self.new_desc_var.set(''); self.new_inuse_var.set(False)
 
@@ -368,23 +782,39 @@ class MainView(tk.Tk):
         else:
             self.selected_screens.discard(screen)
         self._update_action_bar_state()
+
+    def _carry_selection(self, old: Screen | None, screen: Screen) -> bool:
+        """
+        Keeps a screen selected when its row is rebound to a newer object for it.
+
+        Returns:
+            selected (bool): whether the screen is selected
+        """
+        if old is None or old not in self.selected_screens:
+            return screen in self.selected_screens
+        self.selected_screens.discard(old)
+        self.selected_screens.add(screen)
+        return True
+
+    def _table_selection_changed(self, screens: list[Screen]) -> None:
+        """
+        Makes the table's selected rows the selected screens.
+        """
+        self.selected_screens.clear()
+        self.selected_screens.update(screens)
+        self._update_action_bar_state()
         
     def _deselect_all(self) -> None:
         """
         Deselects all currently selected screens.
         """
-        # Get all screen frames from the scroll frame
-        screen_frames = []
-        for loc_frame in self.scroll_frame.winfo_children():
-            for child in loc_frame.winfo_children():
-                if isinstance(child, ScreenFrame):
-                    screen_frames.append(child)
-        
         # Deselect each screen that is currently selected
-        for frame in screen_frames:
+        for frame in self._live_screen_frames():
             if frame.screen in self.selected_screens:
                 frame.selected_var.set(False)
                 self._select_callback(frame.screen, False)
+        if self.table is not None:
+            self.table.clear_selection()
         
         # Clear the selected screens set
         self.selected_screens.clear()
@@ -392,29 +822,11 @@ class MainView(tk.Tk):
 
     def _bulk_update_usage(self, in_use: bool) -> None:
         """
-        Updates all selected screens to be in use or not in use.
-        Only updates the database and the visual state of affected screens without refreshing the entire view.
+        Updates all selected screens to be in use or not in use, in one transaction.
+        Only the affected rows are repainted, through the controller's change events.
         """
-
-        # Get all screen frames from the scroll frame
-        screen_frames = []
-        for loc_frame in self.scroll_frame.winfo_children():
-            for child in loc_frame.winfo_children():
-                if isinstance(child, ScreenFrame):
-                    screen_frames.append(child)
-        
-        # Update database and visual state for each selected screen
-        for s in list(self.selected_screens):
-            # Update model and database
-            s.in_use = in_use
-            s.add_to_db(self.controller.connection)
-            
-            for frame in screen_frames:
-                if frame.screen.screen_id == s.screen_id:
-                    # Update the in_use variable and toggle background color
-                    frame.in_use_var.set(in_use)
-                    frame.toggle_bg_color()
-                    break
+        future = self.controller.bulk_update({s.screen_id: s.row_version for s in self.selected_screens}, in_use=in_use)
+        self._report_failure(future, 'No screens were updated:')
 
     def _bulk_delete(self) -> None:
         """
@@ -427,11 +839,11 @@ class MainView(tk.Tk):
                                    f'Delete {len(self.selected_screens)} selected screens? This cannot be undone.'):
             return
         
-        # delete screens, clear list of selected screens, update the screen list
-        for s in list(self.selected_screens):
-            s.delete_from_db(self.controller.connection)
+        # delete screens and clear list of selected screens, the rows are removed by the change events
+        future = self.controller.bulk_delete({s.screen_id: s.row_version for s in self.selected_screens})
+        self._report_failure(future, 'No screens were deleted:')
         self.selected_screens.clear()
-        self.controller.update_screen_list()
+        self._update_action_bar_state()
 
     def _bulk_move(self) -> None:
         """
@@ -439,20 +851,58 @@ class MainView(tk.Tk):
         """
         # validate selected location
         dest_name=self.move_loc_var.get()
-        if not dest_name or dest_name not in [l.description for l in self.controller.locations.values()]:
+        dest_loc=self.controller.locations_by_name.get(dest_name)
+        if dest_loc is None:
+            return
+
+        # write to db in one transaction, the controller updates the models
+        future = self.controller.bulk_move({s.screen_id: s.row_version for s in self.selected_screens}, dest_loc.location_id)
+        self._report_failure(future, 'No screens were moved:')
+
+    def _show_diagnostics(self) -> None:
+        """
+        Opens the diagnostics window, or raises it if it is open.
+        """
+        if self._diagnostics_window is not None and self._diagnostics_window.winfo_exists():
+            self._diagnostics_window.lift()
             return
-        dest_loc=[l for l in self.controller.locations.values() if l.description==dest_name][0]
+        from view.diagnostics_window import DiagnosticsWindow
+        self._diagnostics_window = DiagnosticsWindow(self, self.controller.diagnostics)
 
-        # update the models and write to db
-        for s in list(self.selected_screens):
-            s.location_id=dest_loc.location_id
-            s.add_to_db(self.controller.connection)
-        self.controller.update_screens_and_locations()
+    def _count_widgets(self) -> int:
+        """
+        Counts every widget in the window, for the diagnostics.
+        """
+        count, pending = 0, [self]
+        while pending:
+            children = pending.pop().winfo_children()
+            count += len(children)
+            pending.extend(children)
+        return count
+
+    def _count_shown_screens(self) -> int:
+        """
+        Counts the screens passing the filters (loaded so far in paged mode), for the diagnostics.
+        """
+        if self.display_mode == 'full':
+            return sum(len(lf.screens) for lf in self._location_frames.values())
+        if self.display_mode == 'table':
+            return self.table.count_shown()
+        return sum(1 for kind, _ in self.virtual_list.rows if kind == 'screen')
 
     def refresh_display(self) -> None:
         """
         Rebuilds location and screen views, applies search filters.
         """
+        diagnostics = self.controller.diagnostics
+        with diagnostics.timer('refresh'):
+            self._rebuild_display(diagnostics)
+        diagnostics.log_gauges()
+
+    def _rebuild_display(self, diagnostics) -> None:
+        """
+        Body of refresh_display(), timing each phase.
+        """
         # clear previous selection set and disable buttons
         self.selected_screens.clear()
         self._update_action_bar_state()
@@ -460,48 +910,262 @@ class MainView(tk.Tk):
         # sync filters and dropdowns
         self._update_location_filter_widgets()
         self._refresh_create_dropdowns()
-        for child in self.scroll_frame.winfo_children():
-            child.destroy()
-        # reset scroll to top
-        if hasattr(self, 'display_canvas'):
-            self.display_canvas.yview_moveto(0)
-
-        # build filter predicates
-        search = self.search_var.get().lower()
-        active_params = [k for k,v in self.param_vars.items() if v.get()]
-        loc_ids = [lid for lid,var in self.loc_vars.items() if var.get()]
-        in_use_filter = None
+        if self.display_mode == 'paged':
+            self._refresh_paged()
+            return
+        if self.renderer is not None:
+            with diagnostics.timer('refresh.clear'):
+                self.renderer.cancel()
+                # the rebuild reads the model afresh, only changes from here on need patching
+                self._deferred_patches = set()
+                # hand screen frames back to the pool before their LocationFrames go away
+                self.screen_pool.release_all()
+                for child in self.scroll_frame.winfo_children():
+                    if not isinstance(child, ScreenFrame):
+                        child.destroy()
+                self._location_frames = {}
+                # reset scroll to top
+                self.display_canvas.yview_moveto(0)
+
+        self._refresh_generation += 1
+        self._with_criteria(lambda criteria: self._show_matching(criteria, diagnostics))
+
+    def _show_matching(self, criteria: dict, diagnostics) -> None:
+        """
+        Second half of _rebuild_display(), once the search is resolved: fills the display
+        with the screens matching criteria.
+        """
+        # apply filters and group by location
+        with diagnostics.timer('refresh.filter'):
+            matching = filter_screens(self.controller.screens, criteria)
+        with diagnostics.timer('refresh.group'):
+            ordered_ids, grouped = group_by_location(matching, self.controller.locations)
+
+        if self.display_mode == 'virtual':
+            with diagnostics.timer('refresh.widgets'):
+                # flatten into header and screen rows, only visible rows get widgets
+                rows = []
+                for loc_id in ordered_ids:
+                    rows.append(('location', self.controller.locations[loc_id]))
+                    rows.extend(('screen', sc) for sc in grouped[loc_id])
+                self.virtual_list.set_rows(rows)
+            return
+        if self.display_mode == 'table':
+            with diagnostics.timer('refresh.widgets'):
+                # reattaches the items the table already has, creates only newly shown ones
+                self.table.show(ordered_ids, grouped)
+            return
+
+        # rebuild location frames progressively, the first slice is built before this returns
+        with diagnostics.timer('refresh.widgets'):
+            groups = [(self.controller.locations[loc_id], grouped[loc_id]) for loc_id in ordered_ids]
+            started = time.perf_counter()
+            def done():
+                if diagnostics.enabled:
+                    diagnostics.record('refresh.render', time.perf_counter() - started)
+            self._start_render(self._build_location_frames(groups), done=done)
+
+    def _start_render(self, steps, done=None) -> None:
+        """
+        Starts a progressive render of the full display. Screens changed until it is done
+        are patched in afterwards (see data_updated()).
+
+        Arguments:
+            steps (Iterator): the build steps, see ProgressiveRenderer.start()
+            done (Callable[[], None] | None): called once every step has run
+        """
+        if self._deferred_patches is None:
+            self._deferred_patches = set()
+
+        def finished():
+            if done is not None:
+                done()
+            deferred, self._deferred_patches = self._deferred_patches, None
+            if deferred:
+                self._patch_screens(deferred)
+        self.renderer.start(steps, done=finished)
+
+    def _build_location_frames(self, groups: list[tuple[Location, list[Screen]]]):
+        """
+        Builds the LocationFrames of the full display for the ProgressiveRenderer,
+        yielding after each header and each screen row. Collapsed groups only get their header.
+
+        Arguments:
+            groups (list[tuple[Location, list[Screen]]]): the locations in display order with their screens
+        """
+        for location, screens in groups:
+            lf = LocationFrame(self.scroll_frame, self.controller, location, screens, pool=self.screen_pool,
+                               expanded=False, on_toggle=self._toggle_location)
+            lf.pack(fill='x', pady=2, padx=4, anchor='n')
+            self._location_frames[location.location_id] = lf
+            yield
+            if self._is_expanded(location.location_id):
+                yield from lf.expand_steps()
+
+    def _is_expanded(self, location_id: int) -> bool:
+        """
+        Returns whether a location's group is shown expanded in the full display.
+        """
+        return self._expanded_locations.get(location_id, self._expand_default)
+
+    def _toggle_location(self, lf: LocationFrame) -> None:
+        """
+        Collapses or expands a location's group when its header is clicked, and remembers it
+        for later refreshes. Collapsing deselects the group's screens.
+        """
+        if lf.expanded:
+            for sf in lf.frames.values():
+                self.selected_screens.discard(sf.screen)
+            lf.collapse()
+            self._update_action_bar_state()
+        else:
+            lf.expand()
+        self._expanded_locations[lf.location.location_id] = lf.expanded
+
+    def _expand_all(self, expanded: bool) -> None:
+        """
+        Expands or collapses every group, and makes that the default for groups shown later.
+        Expanding builds the rows progressively.
+        """
+        if self.table is not None:
+            self.table.expand_all(expanded)
+            return
+        self._expanded_locations.clear()
+        self._expand_default = expanded
+        # the headers of the current result must all exist
+        self.renderer.finish()
+        frames = list(self._location_frames.values())
+        if expanded:
+            self._start_render(step for lf in frames for step in lf.expand_steps())
+            return
+        for lf in frames:
+            for sf in lf.frames.values():
+                self.selected_screens.discard(sf.screen)
+            lf.collapse()
+        self._update_action_bar_state()
+
+    def _refresh_paged(self, keep_position: bool = False) -> None:
+        """
+        Restarts the paged display from the first page of the current filters.
+
+        Arguments:
+            keep_position (bool): re-read as many rows as were loaded and keep the scroll position,
+                used when data changed rather than the filters
+        """
+        page_size = self.controller.get_setting('page_size', 200)
+        loaded = sum(1 for kind, _ in self.virtual_list.rows if kind == 'screen') if keep_position else 0
+        position = self.display_canvas.yview()[0] if keep_position else 0.0
+
+        self._page_query = self._build_screen_query()
+        self._page_key = None
+        self._page_done = False
+        self._page_loading = False
+        self.virtual_list.set_rows([])
+        self._load_next_page(max(loaded, page_size), position)
+
+    def _load_next_page(self, limit: int | None = None, position: float | None = None) -> None:
+        """
+        Requests the next page of the paged display, called by the virtual list when
+        the user scrolls near the end of the loaded rows. The page is read on the database
+        worker and appended by _append_page() when it arrives.
+
+        Arguments:
+            limit (int | None): rows to read, defaults to page_size from settings.json
+            position (float | None): scroll position to restore once the page is in
+        """
+        if self._page_done or self._page_loading:
+            return
+        self._page_loading = True
+        limit = limit or self.controller.get_setting('page_size', 200)
+        query = self._page_query
+        future = self.controller.query_screens(query, self._page_key, limit)
+        future.add_done_callback(lambda f: self._append_page(query, f, position))
+
+    def _append_page(self, query: ScreenQuery, future, position: float | None) -> None:
+        """
+        Appends a page requested by _load_next_page(), unless the filters changed meanwhile.
+        """
+        if query is not self._page_query:
+            return
+        self._page_loading = False
+        if future.exception() is not None:
+            return
+        screens, self._page_key = future.result()
+        self._page_done = self._page_key is None
+
+        vl = self.virtual_list
+        last_loc = self._group_location_id(len(vl.rows) - 1) if vl.rows else None
+        rows = []
+        for sc in screens:
+            if sc.location_id != last_loc:
+                last_loc = sc.location_id
+                rows.append(('location', self.controller.locations.get(last_loc) or Location('', last_loc)))
+            rows.append(('screen', sc))
+        if rows:
+            with self.controller.diagnostics.timer('refresh.widgets'):
+                vl.insert_rows(len(vl.rows), rows)
+        if position:
+            self.display_canvas.yview_moveto(position)
+
+    def _build_screen_query(self) -> ScreenQuery:
+        """
+        Turns the sidebar filters into a ScreenQuery for the paged display.
+        """
+        loc_ids = {lid for lid,var in self.loc_vars.items() if var.get()}
+        return ScreenQuery(
+            location_ids=loc_ids or None,
+            in_use=self._in_use_filter(),
+            search=self.search_var.get(),
+            fields=[k for k,v in self.param_vars.items() if v.get()],
+            prefix=self.controller.prefix_search(),
+        )
+
+    def _in_use_filter(self) -> bool | None:
+        """
+        Returns True/False when only in-use/not in-use screens are shown, None for both.
+        """
         if self.show_in_use.get() and not self.show_not_in_use.get():
-            in_use_filter = True
-        elif self.show_not_in_use.get() and not self.show_in_use.get():
-            in_use_filter = False
-
-        # apply filters
-        filtered = []
-        for s in self.controller.screens:
-            if loc_ids and s.location_id not in loc_ids:
-                continue
-            if in_use_filter is not None and s.in_use!=in_use_filter:
-                continue
-            if search:
-                match = False
-                if 'design' in active_params and search in s.design.lower():
-                    match=True
-                if 'customer' in active_params and search in s.customer.lower():
-                    match=True
-                if 'description' in active_params and search in s.description.lower():
-                    match=True
-                if not match:
-                    continue
-            filtered.append(s)
-
-        # group by location
-        grouped={}
-        for sc in filtered:
-            grouped.setdefault(sc.location_id,[]).append(sc)
-
-        # rebuild location frames, in turn rebuilding screen frames
-        for loc_id in sorted(grouped, key=lambda lid: self.controller.locations[lid].description.lower()):
-            lf = LocationFrame(self.scroll_frame, self.controller,
-                               self.controller.locations[loc_id], grouped[loc_id], select_callback=self._select_callback)
-            lf.pack(fill='x', pady=2, padx=4, anchor='n')
\ No newline at end of file
+            return True
+        if self.show_not_in_use.get() and not self.show_in_use.get():
+            return False
+        return None
+
+    def _with_criteria(self, then) -> None:
+        """
+        Reads the sidebar filters, resolves the search text to matching screen ids and calls
+        then(criteria). Substring searches call it at once; prefix searches once the database
+        lookup is back, unless the display was rebuilt meanwhile.
+
+        Arguments:
+            then (Callable): receives the criteria, a dict of matching screen ids (None if not
+                searching), checked location ids and in-use filter
+        """
+        search = self.search_var.get().strip()
+        active_params = [k for k,v in self.param_vars.items() if v.get()]
+        loc_ids = {lid for lid,var in self.loc_vars.items() if var.get()}
+        in_use = self._in_use_filter()
+        if not search:
+            self._last_search = None
+            then({'search_ids': None, 'loc_ids': loc_ids, 'in_use': in_use})
+            return
+        # when the text only grew (another character typed), narrow the previous result
+        within = None
+        last = self._last_search
+        if last is not None and last[1] == active_params and last[0].casefold() in search.casefold():
+            within = last[2]
+        generation = self._refresh_generation
+
+        def resolved(future):
+            if generation != self._refresh_generation or future.exception() is not None:
+                # a newer rebuild has its own search; failures were already reported by the controller
+                return
+            search_ids = future.result()
+            self._last_search = (search, active_params, search_ids)
+            then({'search_ids': search_ids, 'loc_ids': loc_ids, 'in_use': in_use})
+        self.controller.search(search, active_params, within=within).add_done_callback(resolved)
+
+    def _screen_matches(self, s: Screen, criteria: dict) -> bool:
+        """
+        Returns True if the screen passes the filters from _with_criteria().
+        """
+        return screen_matches(s, criteria)
\ No newline at end of file
@@ -0,0 +1,104 @@
+"""progressive.py
+Runs a long widget build in time slices through the Tk event loop, so the window
+paints the first rows at once and stays responsive while the rest fills in.
+"""
+from __future__ import annotations
+
+import time
+import tkinter as tk
+from typing import Callable, Iterator
+
+class ProgressiveRenderer:
+    """
+    Drives a generator that builds widgets, one small step per yield.
+
+    Each slice runs steps until slice_ms have passed, then yields to Tk. The next slice is
+    queued with after_idle and then after(0): idle first so pending redraws happen, then a
+    timer so input events are handled in between (a chain of after(0) alone would starve
+    the redraws, which Tk does at idle).
+
+    Attributes:
+        slice_ms (int): how long a slice may run
+    """
+
+    def __init__(self, widget: tk.Misc, slice_ms: int = 15):
+        self.widget = widget
+        self.slice_ms = slice_ms
+        self._steps = None
+        self._done = None
+        self._jobs = []
+
+    @property
+    def running(self) -> bool:
+        """
+        True while a render is in progress.
+        """
+        return self._steps is not None
+
+    def start(self, steps: Iterator, done: Callable[[], None] | None = None) -> None:
+        """
+        Cancels the render in progress, if any, and starts a new one. The first slice runs
+        before this returns.
+
+        Arguments:
+            steps (Iterator): advanced once per step, usually a generator that builds a row per yield
+            done (Callable[[], None] | None): called once every step has run, not if cancelled
+        """
+        self.cancel()
+        self._steps = steps
+        self._done = done
+        self._run_slice()
+
+    def cancel(self) -> None:
+        """
+        Stops the render in progress, leaving what was built so far.
+        """
+        self._cancel_jobs()
+        if self._steps is not None:
+            close = getattr(self._steps, 'close', None)
+            if close is not None:
+                close()
+        self._steps = None
+        self._done = None
+
+    def finish(self) -> None:
+        """
+        Runs the remaining steps at once, e.g. before code that needs every row built.
+        """
+        self._cancel_jobs()
+        if self.running:
+            self._run_slice(deadline=float('inf'))
+
+    def _cancel_jobs(self) -> None:
+        """
+        Cancels the scheduled hand-offs to the next slice.
+        """
+        for job in self._jobs:
+            self.widget.after_cancel(job)
+        self._jobs = []
+
+    def _run_slice(self, deadline: float | None = None) -> None:
+        """
+        Runs steps until the slice is used up, then schedules the next slice.
+        """
+        self._jobs = []
+        steps = self._steps
+        if steps is None:
+            return
+        if deadline is None:
+            deadline = time.perf_counter() + self.slice_ms / 1000
+        for _ in steps:
+            if time.perf_counter() >= deadline:
+                self._jobs.append(self.widget.after_idle(self._queue_slice))
+                return
+        done = self._done
+        self._steps = None
+        self._done = None
+        if done is not None:
+            done()
+
+    def _queue_slice(self) -> None:
+        """
+        Second half of the hand-off to Tk, see the class docstring.
+        """
+        self._jobs = [self.widget.after(0, self._run_slice)]
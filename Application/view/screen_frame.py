@@ -1,15 +1,54 @@
+import copy
 import tkinter as tk
 from tkinter import ttk
 from controller.controller import Controller
 from model.screen import Screen
 from model.location import Location
+from model.errors import ConflictError
 from tkinter import messagebox
 
+# row backgrounds, shared with the table display
+IN_USE_COLOR = "#eb5d44"
+NOT_IN_USE_COLOR = "#75e858"
+
+def save_screen(controller: Controller, screen: Screen, previous: Screen) -> None:
+	"""
+	Saves the screen. If another workstation changed it since it was read, asks whether to
+	overwrite their changes or discard ours and reload theirs. If the save fails for any
+	other reason (e.g. the database is locked), the screen gets its previous values back
+	and the error is shown.
+
+	Arguments:
+		controller (Controller): saves the screen
+		screen (Screen): the screen, already holding the edits
+		previous (Screen): a copy of the screen from before the edits
+	"""
+	def done(future):
+		error = future.exception()
+		if error is None:
+			return
+		if not isinstance(error, ConflictError):
+			controller.revert_screen(screen, previous)
+			messagebox.showerror("Error", f'"{previous.design}" was not saved:\n{error}')
+			return
+		if screen.screen_id not in error.current:
+			messagebox.showwarning("Screen Deleted", f'"{screen.design}" was deleted on another workstation.')
+			controller.resolve_conflict(screen, error, overwrite=False)
+			return
+		overwrite = messagebox.askyesno("Screen Changed",
+			f'"{screen.design}" was changed on another workstation since you opened it.\n\n'
+			'Overwrite their changes with yours?\n(No discards your changes and shows theirs.)')
+		controller.resolve_conflict(screen, error, overwrite).add_done_callback(done)
+	controller.add_screen(screen).add_done_callback(done)
+
 class ScreenFrame(tk.Frame):
 	"""
 	The view for each individual screen, inherits from tk.Frame.
 	"""
 
+	# ttk styles are shared by the whole interpreter, configure them once
+	_styles_initialized = False
+
 	def __init__(self, parent, controller: Controller, screen: Screen, select_callback=None):
 		super().__init__(parent)
 		self.controller = controller
@@ -20,8 +59,8 @@ class ScreenFrame(tk.Frame):
 		self.selected_var = tk.BooleanVar(value=False)
 
 		# change background based on if screen is in use
-		self.in_use_color = "#eb5d44"
-		self.not_in_use_color = "#75e858"
+		self.in_use_color = IN_USE_COLOR
+		self.not_in_use_color = NOT_IN_USE_COLOR
 
 		# Allow the frame to size itself to its contents
 		self.grid_propagate(True)
@@ -29,14 +68,62 @@ class ScreenFrame(tk.Frame):
 		# Initialize ttk styles for editable widgets and build the form
 		self._init_styles()
 		self._build_form()
+		self._load_screen()
 
 	def _init_styles(self) -> None:
 		"""
 		Initializes custom ttk styles used to highlight editable widgets.
+		Styles are global to the Tk interpreter, so this only runs once per session.
 		"""
+		if ScreenFrame._styles_initialized:
+			return
 		style = ttk.Style()
 		style.configure('Editing.TEntry', fieldbackground="#717171")
 		style.configure('Editing.TCombobox', fieldbackground='#ffffcc')
+		ScreenFrame._styles_initialized = True
+
+	def bind_screen(self, screen: Screen, selected: bool = False) -> None:
+		"""
+		Points this frame at a different screen so it can be reused instead of rebuilt.
+		Leaves edit mode and sets the selection checkbox.
+
+		Arguments:
+			screen (Screen): the screen to display
+			selected (bool): whether the screen is among the selected screens
+		"""
+		self.screen = screen
+		self.selected_var.set(selected)
+		if self.editing:
+			# toggle_edit reloads the fields from self.screen when leaving edit mode
+			self.toggle_edit()
+		else:
+			self._load_screen()
+
+	def _load_screen(self) -> None:
+		"""
+		Copies the screen's data into the form variables, location dropdown and background.
+		"""
+		# NULL columns show as empty fields rather than "None", which saving would then store
+		self.design_str.set(self.screen.design or "")
+		self.customer_str.set(self.screen.customer or "")
+		self.quantity_str.set("" if self.screen.quantity is None else str(self.screen.quantity))
+		self.description_str.set(self.screen.description or "")
+		self.in_use_var.set(self.screen.in_use)
+
+		# Location dropdown
+		location_names = self.controller.location_names
+
+		current_location = ""
+		if self.screen.location_id in self.controller.locations:
+			current_location = self.controller.locations[self.screen.location_id].description
+		self.location_var.set(current_location)
+
+		# Calculate width based on longest location name (minimum width of 5, max of 11)
+		max_location_width = max([len(loc) for loc in location_names]) if location_names else 5
+		max_location_width = min(11, max(5, max_location_width))  # Ensure min/max width
+		self.location_dropdown.configure(values=location_names, width=max_location_width)
+
+		self.toggle_bg_color()
 
 	def _build_form(self) -> None:
 		"""
@@ -49,50 +136,38 @@ class ScreenFrame(tk.Frame):
 		cb.grid(row=0, column=0, padx=padx, pady=pady)
 		column = 1
 
-		self.design_str = tk.StringVar(value=self.screen.design)
+		self.design_str = tk.StringVar()
 		self.design_entry = ttk.Entry(self, textvariable=self.design_str, state="readonly", width=38)
 		self.design_entry.grid(row=0, column=column, padx=padx, pady=pady, sticky="ew")
 		column += 1
 
-		self.customer_str = tk.StringVar(value=self.screen.customer)
+		self.customer_str = tk.StringVar()
 		self.customer_entry = ttk.Entry(self, textvariable=self.customer_str, state="readonly", width=35)
 		self.customer_entry.grid(row=0, column=column, padx=padx, pady=pady, sticky="ew")
 		column += 1
 
-		self.quantity_str = tk.StringVar(value=str(self.screen.quantity))
+		self.quantity_str = tk.StringVar()
 		self.quantity_entry = ttk.Entry(self, textvariable=self.quantity_str, state="readonly", width=5)
 		self.quantity_entry.grid(row=0, column=column, padx=padx, pady=pady, sticky="ew")
 		column += 1
 
-		self.description_str = tk.StringVar(value=self.screen.description)
+		self.description_str = tk.StringVar()
 		self.description_entry = ttk.Entry(self, textvariable=self.description_str, state="readonly", width=48)
 		self.description_entry.grid(row=0, column=column, padx=padx, pady=pady, sticky="ew")
 		column += 1
 
-		self.in_use_var = tk.BooleanVar(value=self.screen.in_use)
+		self.in_use_var = tk.BooleanVar()
 		self.in_use_check = ttk.Checkbutton(self, text="In Use", variable=self.in_use_var, command=self.in_use_check_clicked, state="normal")
 		self.in_use_check.grid(row=0, column=column, padx=padx, pady=pady)
 		column += 1
 
-		# Location dropdown
-		self.location_map = {loc.description: loc for loc in self.controller.locations.values()}
-		location_names = list(self.location_map.keys())
-
-		current_location = ""
-		if self.screen.location_id in self.controller.locations:
-			current_location = self.controller.locations[self.screen.location_id].description
-
-		self.location_var = tk.StringVar(value=current_location)
-		# Calculate width based on longest location name (minimum width of 5, max of 11)
-		max_location_width = max([len(loc) for loc in location_names]) if location_names else 5
-		max_location_width = min(11, max(5, max_location_width))  # Ensure min/max width
-		
+		# Location dropdown, values are filled in by _load_screen
+		self.location_var = tk.StringVar()
 		self.location_dropdown = ttk.Combobox(
 			self,
 			textvariable=self.location_var,
-			values=location_names,
 			state="disabled",
-			width=max_location_width
+			width=5
 		)
 
 		self.location_dropdown.grid(row=0, column=column, padx=padx, pady=pady)
@@ -111,8 +186,6 @@ class ScreenFrame(tk.Frame):
 		self.delete_button = ttk.Button(self, text="Delete", command=self.delete_screen, width=8)
 		self.delete_button.grid(row=0, column=column, padx=padx, pady=pady)
 
-		self.toggle_bg_color()
-
 	def _on_selected(self) -> None:
 		"""
 		Callback from checkbox toggled.
@@ -127,18 +200,7 @@ class ScreenFrame(tk.Frame):
 		self.editing = not self.editing
 		# reset all entries/comboboxes/checkboxes to their prior state
 		if not self.editing:
-			self.design_str.set(self.screen.design)
-			self.customer_str.set(self.screen.customer)
-			self.quantity_str.set(str(self.screen.quantity))
-			self.description_str.set(self.screen.description)
-			self.in_use_var.set(self.screen.in_use)
-			
-			current_location = ""
-			if self.screen.location_id in self.controller.locations:
-				current_location = self.controller.locations[self.screen.location_id].description
-			self.location_var.set(current_location)
-
-			self.toggle_bg_color()
+			self._load_screen()
 
 		# Set state and styling based on edit mode
 		state = "normal" if self.editing else "readonly"
@@ -163,40 +225,50 @@ class ScreenFrame(tk.Frame):
 		Validates entries and then updates the corresponding record in the DB.
 		"""
 		if self.validate_entries():
+			previous = copy.copy(self.screen)
 			self.screen.design = self.design_str.get().strip()
 			self.screen.customer = self.customer_str.get().strip()
 			self.screen.description = self.description_str.get().strip()
 			self.screen.quantity = int(self.quantity_str.get().strip())
 			self.screen.in_use = bool(self.in_use_var.get())
 			selected_location_name = self.location_var.get()
-			self.screen.location_id = self.location_map[selected_location_name].location_id
-
-			self.screen.add_to_db(self.controller.connection)
+			self.screen.location_id = self.controller.locations_by_name[selected_location_name].location_id
 
+			self._save(self.screen, previous)
 			self.toggle_edit()
-			self.controller.update_screens_and_locations()
 
 	def in_use_check_clicked(self) -> None:
 		"""
-		Changes background based on if the screen is in use. If the user is not currently editing, this change is immediately written to the database.
+		Changes background based on if the screen is in use. If the user is not currently editing, this change
+		is applied at once and written to the database shortly after, together with other toggles.
 		"""
 		if not self.editing:
-			self.screen.in_use = not self.screen.in_use
-			self.screen.add_to_db(self.controller.connection)
+			self.controller.set_in_use(self.screen, not self.screen.in_use)
 			self.toggle_bg_color()
 			
 
+	def _save(self, screen: Screen, previous: Screen) -> None:
+		"""
+		Saves the screen, see save_screen().
+		The frame may be rebound to another screen before the save finishes, so screen is passed along.
+		"""
+		save_screen(self.controller, screen, previous)
+
 	def delete_screen(self) -> None:
 		"""
-		Prompts for confirmation of deletion, deletes from DB on confirmation and destroys the ScreenFrame.
+		Prompts for confirmation of deletion, deletes from DB on confirmation.
+		The controller's change event removes the row; the frame itself may be pooled, so it is not destroyed here.
 		"""
 		result = messagebox.askyesno("Delete Screen", f'Are you sure you want to delete "{self.screen.design}"?\nThis action cannot be undone.')
 		if result:
 			if self.editing:
 				self.toggle_edit()
-			self.screen.delete_from_db(self.controller.connection)
-			self.controller.update_screen_list()
-			self.destroy()
+			design = self.screen.design
+			def done(future):
+				# nothing was removed yet, the row stays as it is
+				if future.exception() is not None:
+					messagebox.showerror("Error", f'"{design}" was not deleted:\n{future.exception()}')
+			self.controller.delete_screen(self.screen).add_done_callback(done)
 
 	def validate_entries(self) -> bool:
 		"""
@@ -205,22 +277,10 @@ class ScreenFrame(tk.Frame):
 		Returns:
 			bool: True if all fields are valid, False otherwise.
 		"""
-		if not self.design_str.get().strip():
-			messagebox.showerror("Validation Error", "Design cannot be empty.")
-			return False
-		if not self.customer_str.get().strip():
-			messagebox.showerror("Validation Error", "Customer cannot be empty.")
-			return False
-
-		quantity_val = self.quantity_str.get().strip()
-		if not quantity_val:
-			messagebox.showerror("Validation Error", "Quantity cannot be empty.")
-			return False
-		if not quantity_val.isdigit():
-			messagebox.showerror("Validation Error", "Quantity must be an integer.")
-			return False
-		if not self.location_var.get().strip():
-			messagebox.showerror("Validation Error", "Location must be selected.")
+		error = Screen.validate_fields(self.design_str.get(), self.customer_str.get(),
+									   self.quantity_str.get(), self.location_var.get())
+		if error is not None:
+			messagebox.showerror("Validation Error", error)
 			return False
 
 		return True
@@ -233,3 +293,63 @@ class ScreenFrame(tk.Frame):
 			self.config(bg=self.in_use_color)
 		else:
 			self.config(bg=self.not_in_use_color)
+
+
+class ScreenFramePool:
+	"""
+	Keeps ScreenFrames alive between refreshes and rebinds them to other screens,
+	so widget creation is paid once per session rather than once per filter change.
+
+	Attributes:
+		parent (tk.Widget): the parent of every pooled frame
+		controller (Controller): passed to new frames
+		select_callback (Callable): passed to new frames
+	"""
+
+	def __init__(self, parent, controller: Controller, select_callback=None):
+		self.parent = parent
+		self.controller = controller
+		self.select_callback = select_callback
+		self._free: list[ScreenFrame] = []
+		self._in_use: set[ScreenFrame] = set()
+
+	def acquire(self, screen: Screen) -> ScreenFrame:
+		"""
+		Returns a frame showing the screen, reusing a released frame if one is available.
+
+		Arguments:
+			screen (Screen): the screen to display
+		"""
+		if self._free:
+			frame = self._free.pop()
+			frame.bind_screen(screen)
+		else:
+			frame = ScreenFrame(self.parent, self.controller, screen, select_callback=self.select_callback)
+		self._in_use.add(frame)
+		return frame
+
+	def release(self, frame: ScreenFrame) -> None:
+		"""
+		Hands a frame back to the pool, unmapping it.
+
+		Arguments:
+			frame (ScreenFrame): a frame previously returned by acquire()
+		"""
+		if frame in self._in_use:
+			self._in_use.discard(frame)
+			frame.pack_forget()
+			self._free.append(frame)
+
+	def release_all(self) -> None:
+		"""
+		Releases every frame currently handed out.
+		"""
+		for frame in list(self._in_use):
+			self.release(frame)
+
+	def in_use(self) -> list[ScreenFrame]:
+		"""
+		Returns:
+			frames (list[ScreenFrame]): the frames currently handed out
+		"""
+		return list(self._in_use)
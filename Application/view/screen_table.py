@@ -0,0 +1,431 @@
+"""screen_table.py
+The "table" display: every screen in a single ttk.Treeview, grouped under a node per location.
+
+Rows are Treeview items rather than widgets, so the table copes with 100k screens. An item
+is created the first time its location is opened and kept for the life of the table; a
+refresh only re-attaches, detaches and reorders existing items (Treeview.set_children),
+it never deletes and rebuilds them. Closed locations hold a single placeholder item so
+they still show the expand arrow.
+
+Editing happens in one overlay of entry widgets placed over the active row, reused for
+whichever row is edited next.
+"""
+from __future__ import annotations
+
+import tkinter as tk
+import copy
+from tkinter import ttk, messagebox
+from typing import Callable
+from controller.controller import Controller
+from model.screen import Screen
+from .screen_frame import IN_USE_COLOR, NOT_IN_USE_COLOR, save_screen
+
+# (column, heading, width) of the screen fields, the tree column (#0) shows the location
+COLUMNS = (
+    ('design', "Design", 240),
+    ('customer', "Customer", 200),
+    ('quantity', "Qty", 60),
+    ('description', "Description", 280),
+    ('in_use', "In Use", 70),
+)
+
+def _screen_iid(screen_id: int) -> str:
+    return f"S{screen_id}"
+
+def _location_iid(location_id: int) -> str:
+    return f"L{location_id}"
+
+def _placeholder_iid(location_id: int) -> str:
+    return f"P{location_id}"
+
+def _row_values(screen: Screen) -> tuple:
+    """
+    Returns the cell values of a screen's item, in COLUMNS order.
+    """
+    return (*(_cell(screen, name) for name in ('design', 'customer', 'quantity', 'description')),
+            "Yes" if screen.in_use else "No")
+
+def _cell(screen: Screen, name: str) -> str:
+    """
+    Returns a field of a screen as text, empty for NULL rather than "None".
+    """
+    value = getattr(screen, name)
+    return "" if value is None else str(value)
+
+def _row_tags(screen: Screen) -> tuple:
+    return ('in_use',) if screen.in_use else ('not_in_use',)
+
+class ScreenTable(ttk.Frame):
+    """
+    Treeview of the filtered screens, one parent node per location.
+
+    Attributes:
+        tree (ttk.Treeview): the table itself
+        expand_default (bool): whether locations the user has not toggled are shown open
+    """
+
+    def __init__(self, parent: tk.Widget, controller: Controller,
+                 on_select: Callable[[list[Screen]], None] | None = None, expand_default: bool = False):
+        """
+        Arguments:
+            on_select (Callable[[list[Screen]], None] | None): called with the selected screens
+                whenever the selection changes
+            expand_default (bool): show locations open until the user toggles them
+        """
+        super().__init__(parent)
+        self.controller = controller
+        self.on_select = on_select
+        self.expand_default = expand_default
+
+        self.tree = ttk.Treeview(self, columns=[name for name, _, _ in COLUMNS],
+                                 show='tree headings', selectmode='extended')
+        self.tree.heading('#0', text="Location", anchor='w')
+        self.tree.column('#0', width=220, stretch=False)
+        for name, heading, width in COLUMNS:
+            self.tree.heading(name, text=heading, anchor='w')
+            self.tree.column(name, width=width, stretch=name == 'description')
+        self.tree.tag_configure('in_use', background=IN_USE_COLOR)
+        self.tree.tag_configure('not_in_use', background=NOT_IN_USE_COLOR)
+        self.tree.tag_configure('location', font=("Segoe UI", 10, "bold"))
+
+        vsb = ttk.Scrollbar(self, orient='vertical', command=self.tree.yview)
+        hsb = ttk.Scrollbar(self, orient='horizontal', command=self.tree.xview)
+        self._vsb, self._hsb = vsb, hsb
+        self.tree.configure(yscrollcommand=self._on_yscroll, xscrollcommand=self._on_xscroll)
+        self.tree.grid(row=0, column=0, sticky='nsew')
+        vsb.grid(row=0, column=1, sticky='ns')
+        hsb.grid(row=1, column=0, sticky='ew')
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        # iid -> Screen for every screen item created so far, attached or not
+        self._screens: dict[str, Screen] = {}
+        # the current result: location id -> its screens, and screen id -> location id
+        self._groups: dict[int, list[Screen]] = {}
+        self._located: dict[int, int] = {}
+        # locations whose items are attached, i.e. open since the last refresh
+        self._filled: set[int] = set()
+        # location id -> open, for locations the user toggled
+        self._open: dict[int, bool] = {}
+
+        self.tree.bind('<<TreeviewSelect>>', self._on_select)
+        self.tree.bind('<<TreeviewOpen>>', self._on_open)
+        self.tree.bind('<<TreeviewClose>>', self._on_close)
+        self.tree.bind('<Double-1>', self._on_double_click)
+        self.tree.bind('<Return>', lambda e: self.edit(self.tree.focus()))
+        self.tree.bind('<F2>', lambda e: self.edit(self.tree.focus()))
+        self.tree.bind('<Configure>', lambda e: self._editor.place_over_row() if self._editor else None)
+
+        self._editor: _RowEditor | None = None
+
+    # display
+
+    def show(self, ordered_ids: list[int], grouped: dict[int, list[Screen]]) -> None:
+        """
+        Shows a new result. Items that already exist are reused, only screens in open
+        locations get items, and the selection is cleared.
+
+        Arguments:
+            ordered_ids (list[int]): location ids in display order
+            grouped (dict[int, list[Screen]]): each location's screens, in display order
+        """
+        self.cancel_edit()
+        tree = self.tree
+        self._groups = grouped
+        self._located = {s.screen_id: loc_id for loc_id, screens in grouped.items() for s in screens}
+        self._filled = set()
+        nodes = [self._location_node(loc_id) for loc_id in ordered_ids]
+        # detaches the locations (and so the screens) left out of this result
+        tree.set_children('', *nodes)
+        for loc_id in ordered_ids:
+            self._set_open(loc_id, self._is_open(loc_id))
+        tree.selection_set(())
+        tree.yview_moveto(0)
+
+    def count_shown(self) -> int:
+        """
+        Returns the number of screens in the current result, open or not.
+        """
+        return len(self._located)
+
+    def clear_selection(self) -> None:
+        self.tree.selection_set(())
+
+    def expand_all(self, expanded: bool) -> None:
+        """
+        Opens or closes every location, and makes that the default for locations shown later.
+        """
+        self._open.clear()
+        self.expand_default = expanded
+        for loc_id in list(self._groups):
+            self._set_open(loc_id, expanded)
+
+    def _is_open(self, location_id: int) -> bool:
+        return self._open.get(location_id, self.expand_default)
+
+    def _location_node(self, location_id: int) -> str:
+        """
+        Creates or relabels a location's node.
+        """
+        iid = _location_iid(location_id)
+        location = self.controller.locations[location_id]
+        count = len(self._groups.get(location_id, ()))
+        text = f"{location.description} ({count} {'screen' if count == 1 else 'screens'})"
+        if self.tree.exists(iid):
+            self.tree.item(iid, text=text)
+        else:
+            self.tree.insert('', 'end', iid=iid, text=text, tags=('location',))
+        return iid
+
+    def _set_open(self, location_id: int, expanded: bool) -> None:
+        """
+        Opens a location, attaching its screen items, or closes it, leaving only the placeholder.
+        """
+        iid = _location_iid(location_id)
+        if expanded:
+            self._fill(location_id)
+        else:
+            self._filled.discard(location_id)
+            self._deselect_children(iid)
+            placeholder = _placeholder_iid(location_id)
+            if not self.tree.exists(placeholder):
+                self.tree.insert(iid, 'end', iid=placeholder, text="...")
+            self.tree.set_children(iid, placeholder)
+        self.tree.item(iid, open=expanded)
+
+    def _fill(self, location_id: int) -> None:
+        """
+        Attaches the items of a location's screens in order, creating those not yet seen.
+        """
+        parent = _location_iid(location_id)
+        items = [self._screen_item(screen, parent) for screen in self._groups.get(location_id, ())]
+        self.tree.set_children(parent, *items)
+        self._filled.add(location_id)
+
+    def _screen_item(self, screen: Screen, parent: str) -> str:
+        """
+        Returns a screen's item, creating it under parent or updating it if the Screen was replaced.
+        """
+        iid = _screen_iid(screen.screen_id)
+        known = self._screens.get(iid)
+        if known is None:
+            self.tree.insert(parent, 'end', iid=iid, values=_row_values(screen), tags=_row_tags(screen))
+        elif known is not screen:
+            # read again from the database, e.g. after a reload
+            self.tree.item(iid, values=_row_values(screen), tags=_row_tags(screen))
+        self._screens[iid] = screen
+        return iid
+
+    def _deselect_children(self, iid: str) -> None:
+        selection = self.tree.selection()
+        if not selection:
+            return
+        selected = set(selection).intersection(self.tree.get_children(iid))
+        if selected:
+            self.tree.selection_remove(*selected)
+
+    # change events
+
+    def patch(self, screen_id: int, screen: Screen | None, matches: bool) -> None:
+        """
+        Brings a single screen's item in line with the model: updates it in place,
+        moves it to another location, or detaches it.
+
+        Arguments:
+            screen_id (int): the changed screen
+            screen (Screen | None): the screen as now in the controller, None if deleted
+            matches (bool): whether the screen passes the current filters
+        """
+        iid = _screen_iid(screen_id)
+        tree = self.tree
+        old = self._located.get(screen_id)
+        if old is not None and not (matches and old == screen.location_id):
+            del self._located[screen_id]
+            self._groups[old] = [s for s in self._groups[old] if s.screen_id != screen_id]
+            if self._editor is not None and self._editor.iid == iid:
+                self.cancel_edit()
+            if tree.exists(iid):
+                tree.selection_remove(iid)
+                tree.detach(iid)
+            if self._groups[old]:
+                self._location_node(old)
+            else:
+                del self._groups[old]
+                tree.detach(_location_iid(old))
+
+        if screen is None:
+            if iid in self._screens:
+                del self._screens[iid]
+                tree.delete(iid)
+            return
+        if iid in self._screens:
+            self._screens[iid] = screen
+            tree.item(iid, values=_row_values(screen), tags=_row_tags(screen))
+        if not matches or old == screen.location_id:
+            return
+
+        loc_id = screen.location_id
+        self._located[screen_id] = loc_id
+        group = self._groups.get(loc_id)
+        if group is not None:
+            group.append(screen)
+            self._location_node(loc_id)
+            if loc_id in self._filled:
+                tree.move(self._screen_item(screen, _location_iid(loc_id)), _location_iid(loc_id), 'end')
+            return
+        # first screen of a location not in the result: add its node in name order
+        self._groups[loc_id] = [screen]
+        node = self._location_node(loc_id)
+        name = self.controller.locations[loc_id].description.lower()
+        shown = [n for n in tree.get_children('') if n != node]
+        index = next((i for i, n in enumerate(shown)
+                      if self.controller.locations[int(n[1:])].description.lower() > name), len(shown))
+        tree.move(node, '', index)
+        self._set_open(loc_id, self._is_open(loc_id))
+
+    # events
+
+    def _on_yscroll(self, first, last) -> None:
+        self._vsb.set(first, last)
+        if self._editor is not None:
+            self._editor.place_over_row()
+
+    def _on_xscroll(self, first, last) -> None:
+        self._hsb.set(first, last)
+        if self._editor is not None:
+            self._editor.place_over_row()
+
+    def _on_select(self, event) -> None:
+        if self.on_select is not None:
+            self.on_select([self._screens[iid] for iid in self.tree.selection() if iid in self._screens])
+
+    def _on_open(self, event) -> None:
+        # sent before the item opens; the item is the focus
+        iid = self.tree.focus()
+        if iid.startswith('L'):
+            loc_id = int(iid[1:])
+            self._open[loc_id] = True
+            if loc_id not in self._filled:
+                self._fill(loc_id)
+
+    def _on_close(self, event) -> None:
+        iid = self.tree.focus()
+        if iid.startswith('L'):
+            loc_id = int(iid[1:])
+            self._open[loc_id] = False
+            # the items stay attached until the next refresh, only the selection goes
+            self._deselect_children(iid)
+
+    def _on_double_click(self, event) -> str | None:
+        """
+        Double-clicking the In Use cell toggles it (written shortly after, see Controller.set_in_use),
+        elsewhere it edits the row.
+        """
+        iid = self.tree.identify_row(event.y)
+        if iid not in self._screens:
+            return None
+        if self.tree.identify_column(event.x) == f"#{len(COLUMNS)}":
+            screen = self._screens[iid]
+            # the change event repaints the row
+            self.controller.set_in_use(screen, not screen.in_use)
+        else:
+            self.edit(iid)
+        return 'break'
+
+    # inline editing
+
+    def edit(self, iid: str) -> None:
+        """
+        Opens the inline editor over a screen's row, scrolling it into view.
+        """
+        if iid not in self._screens:
+            return
+        if self._editor is None:
+            self._editor = _RowEditor(self)
+        self.tree.see(iid)
+        self._editor.open(iid, self._screens[iid])
+
+    def cancel_edit(self) -> None:
+        if self._editor is not None:
+            self._editor.close()
+
+class _RowEditor:
+    """
+    Entry widgets laid over the cells of the row being edited. Return saves, Escape cancels.
+    """
+
+    def __init__(self, table: ScreenTable):
+        self.table = table
+        self.tree = table.tree
+        self.iid = None
+        self.screen = None
+        self.vars = {name: tk.StringVar() for name, _, _ in COLUMNS if name != 'in_use'}
+        self.in_use_var = tk.BooleanVar()
+        self.location_var = tk.StringVar()
+        # column -> widget, placed over that column's cell
+        self.widgets = {name: ttk.Entry(self.tree, textvariable=var) for name, var in self.vars.items()}
+        self.widgets['in_use'] = ttk.Checkbutton(self.tree, variable=self.in_use_var)
+        self.widgets['#0'] = ttk.Combobox(self.tree, textvariable=self.location_var, state='readonly')
+        for widget in self.widgets.values():
+            widget.bind('<Return>', lambda e: self.save())
+            widget.bind('<Escape>', lambda e: self.close())
+
+    def open(self, iid: str, screen: Screen) -> None:
+        self.iid = iid
+        self.screen = screen
+        for name, var in self.vars.items():
+            var.set(_cell(screen, name))
+        self.in_use_var.set(screen.in_use)
+        self.widgets['#0'].configure(values=self.table.controller.location_names)
+        self.location_var.set(self.table.controller.locations[screen.location_id].description)
+        # the row must be drawn before its bbox is known
+        self.tree.update_idletasks()
+        self.place_over_row()
+        self.widgets['design'].focus_set()
+        self.widgets['design'].select_range(0, 'end')
+
+    def place_over_row(self) -> None:
+        """
+        Moves the widgets onto the row's cells, hiding them while the row is scrolled out of view.
+        """
+        if self.iid is None:
+            return
+        for name, widget in self.widgets.items():
+            bbox = self.tree.bbox(self.iid, name) if self.tree.exists(self.iid) else ''
+            if bbox:
+                x, y, width, height = bbox
+                widget.place(x=x, y=y, width=width, height=height)
+            else:
+                widget.place_forget()
+
+    def close(self) -> None:
+        if self.iid is None:
+            return
+        for widget in self.widgets.values():
+            widget.place_forget()
+        if self.tree.exists(self.iid):
+            self.tree.focus(self.iid)
+        self.tree.focus_set()
+        self.iid = None
+        self.screen = None
+
+    def save(self) -> None:
+        """
+        Validates the fields, then writes them to the screen and saves it.
+        """
+        controller = self.table.controller
+        error = Screen.validate_fields(self.vars['design'].get(), self.vars['customer'].get(),
+                                       self.vars['quantity'].get(), self.location_var.get())
+        if error is not None:
+            messagebox.showerror("Invalid Screen", error, parent=self.tree)
+            return
+        screen = self.screen
+        previous = copy.copy(screen)
+        screen.design = self.vars['design'].get().strip()
+        screen.customer = self.vars['customer'].get().strip()
+        screen.description = self.vars['description'].get().strip()
+        screen.quantity = int(self.vars['quantity'].get().strip())
+        screen.in_use = bool(self.in_use_var.get())
+        screen.location_id = controller.locations_by_name[self.location_var.get()].location_id
+        self.close()
+        save_screen(controller, screen, previous)
@@ -0,0 +1,268 @@
+"""virtual_list.py
+Windowed rendering for a scrollable tk.Canvas.
+VirtualList keeps the full list of rows as plain data and only creates
+widgets for the rows that are in (or near) the visible part of the canvas.
+The scroll region always spans every row, so the scrollbar reflects the
+full result count.
+"""
+from __future__ import annotations
+
+import tkinter as tk
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Hashable
+
+class VirtualList:
+    """
+    Places row widgets on a canvas on demand as the user scrolls.
+
+    Attributes:
+        canvas (tk.Canvas): the canvas rows are drawn on
+        factories (dict[str, Callable]): maps a row kind to a function (parent, data) -> widget
+        releasers (dict[str, Callable]): maps a row kind to a function (widget) -> None that takes
+            the widget back (e.g. into a pool); kinds without one are destroyed
+        indents (dict[str, int]): x offset of each row kind in pixels
+        keys (dict[str, Callable]): maps a row kind to a function (data) -> key, rows of these
+            kinds can be found with position() without scanning the list
+        pinned (dict[str, Callable]): maps a row kind to a function (widget) -> bool, widgets for
+            which it returns True (e.g. a row being edited) are kept when scrolled out of the window
+        overscan (int): number of extra rows kept alive above and below the viewport
+        on_near_end (Callable | None): called when the rendered rows reach the end of the list,
+            so more rows can be appended (e.g. the next page of a query)
+        rows (list[tuple[str, Any]]): every row as (kind, data)
+    """
+
+    def __init__(self, canvas: tk.Canvas, scrollbar, factories: dict[str, Callable[[tk.Widget, Any], tk.Widget]],
+                 releasers: dict[str, Callable[[tk.Widget], None]] | None = None,
+                 indents: dict[str, int] | None = None, overscan: int = 5,
+                 on_near_end: Callable[[], None] | None = None,
+                 keys: dict[str, Callable[[Any], Hashable]] | None = None,
+                 pinned: dict[str, Callable[[tk.Widget], bool]] | None = None):
+        self.canvas = canvas
+        self.scrollbar = scrollbar
+        self.factories = factories
+        self.releasers = releasers or {}
+        self.indents = indents or {}
+        self.keys = keys or {}
+        self.pinned = pinned or {}
+        self.overscan = overscan
+        self.on_near_end = on_near_end
+        self.rows: list[tuple[str, Any]] = []
+
+        self._heights: dict[str, int] = {}  # measured once per row kind
+        self._offsets: list[int] = [0]      # y of each row, plus the total height at the end
+        self._live: dict[int, tuple[int, tk.Widget, str]] = {}  # row index -> (canvas item, widget, kind)
+        self._positions: dict[tuple[str, Hashable], int] = {}   # (kind, key) -> row index, for kinds in keys
+        self._render_job = None
+        self._near_end_job = None
+
+        self.canvas.configure(yscrollcommand=self._on_yview)
+        self.canvas.bind("<Configure>", lambda e: self._schedule_render(), add="+")
+
+    def set_rows(self, rows: list[tuple[str, Any]]) -> None:
+        """
+        Replaces the rows and scrolls back to the top.
+
+        Arguments:
+            rows (list[tuple[str, Any]]): every row as (kind, data), in display order
+        """
+        self.clear()
+        self.rows = rows
+        self._positions = {}
+        self._reindex(0)
+        self._relayout()
+        self.canvas.yview_moveto(0)
+        self._render()
+
+    def insert_rows(self, index: int, rows: list[tuple[str, Any]]) -> None:
+        """
+        Inserts rows before index without rebuilding the rows already on screen.
+
+        Arguments:
+            index (int): position of the first new row
+            rows (list[tuple[str, Any]]): the rows to insert as (kind, data)
+        """
+        self.rows[index:index] = rows
+        shift = len(rows)
+        self._live = {(i + shift if i >= index else i): v for i, v in self._live.items()}
+        self._reindex(index)
+        self._relayout(index)
+
+    def remove_rows(self, index: int, count: int = 1) -> None:
+        """
+        Removes count rows starting at index, discarding their widgets if built.
+
+        Arguments:
+            index (int): position of the first row to remove
+            count (int): number of rows to remove
+        """
+        for i in range(index, index + count):
+            if i in self._live:
+                item, widget, kind = self._live.pop(i)
+                self.canvas.delete(item)
+                self._discard(kind, widget)
+            self._unindex(i)
+        del self.rows[index:index + count]
+        self._live = {(i - count if i >= index + count else i): v for i, v in self._live.items()}
+        self._reindex(index)
+        self._relayout(index)
+
+    def update_row(self, index: int, data: Any) -> None:
+        """
+        Replaces the data of a row; its widget is rebuilt only if it is on screen.
+
+        Arguments:
+            index (int): the row to update
+            data (Any): the new data, the row keeps its kind
+        """
+        self._unindex(index)
+        kind = self.rows[index][0]
+        self.rows[index] = (kind, data)
+        self._reindex(index, index + 1)
+        if index in self._live:
+            item, widget, kind = self._live.pop(index)
+            self.canvas.delete(item)
+            self._discard(kind, widget)
+            self._schedule_render()
+
+    def position(self, kind: str, key: Hashable) -> int:
+        """
+        Returns:
+            index (int): the row of that kind whose data has that key (see keys), or -1
+        """
+        return self._positions.get((kind, key), -1)
+
+    def _reindex(self, start: int, stop: int | None = None) -> None:
+        """
+        Records the positions of the keyed rows from start (to stop, default the end).
+        """
+        keys = self.keys
+        if not keys:
+            return
+        for i in range(start, len(self.rows) if stop is None else stop):
+            kind, data = self.rows[i]
+            key = keys.get(kind)
+            if key is not None:
+                self._positions[(kind, key(data))] = i
+
+    def _unindex(self, index: int) -> None:
+        """
+        Forgets the position of row index, if its kind is keyed.
+        """
+        kind, data = self.rows[index]
+        key = self.keys.get(kind)
+        if key is not None and self._positions.get((kind, key(data))) == index:
+            del self._positions[(kind, key(data))]
+
+    def _relayout(self, start: int = 0) -> None:
+        """
+        Recomputes row offsets from row start on, after rows were inserted or removed there,
+        and moves the live widgets at or below it into place, keeping the current scroll position.
+        """
+        offsets = self._offsets
+        del offsets[start + 1:]
+        y = offsets[start]
+        for kind, data in self.rows[start:]:
+            y += self._row_height(kind, data)
+            offsets.append(y)
+
+        for idx, (item, widget, kind) in self._live.items():
+            if idx >= start:
+                self.canvas.coords(item, self.indents.get(kind, 0), offsets[idx])
+        self.canvas.configure(scrollregion=(0, 0, self.canvas.winfo_width(), y))
+        self._schedule_render()
+
+    def clear(self) -> None:
+        """
+        Removes every live row widget from the canvas.
+        """
+        for item, widget, kind in self._live.values():
+            self.canvas.delete(item)
+            self._discard(kind, widget)
+        self._live.clear()
+
+    def live_widgets(self) -> list[tk.Widget]:
+        """
+        Returns:
+            widgets (list[tk.Widget]): the row widgets currently built
+        """
+        return [widget for _, widget, _ in self._live.values()]
+
+    def _row_height(self, kind: str, data: Any) -> int:
+        """
+        Height of a row kind in pixels, measured from a throwaway widget the first time.
+        """
+        if kind not in self._heights:
+            probe = self.factories[kind](self.canvas, data)
+            probe.update_idletasks()
+            self._heights[kind] = probe.winfo_reqheight() + 2
+            self._discard(kind, probe)
+        return self._heights[kind]
+
+    def _discard(self, kind: str, widget: tk.Widget) -> None:
+        """
+        Hands a widget to its releaser, or destroys it if its kind is not pooled.
+        """
+        releaser = self.releasers.get(kind)
+        if releaser is not None:
+            releaser(widget)
+        else:
+            widget.destroy()
+
+    def _on_yview(self, first, last) -> None:
+        """
+        yscrollcommand hook, forwards to the scrollbar and re-renders.
+        """
+        self.scrollbar.set(first, last)
+        self._schedule_render()
+
+    def _schedule_render(self) -> None:
+        """
+        Coalesces scroll and resize events into one render on the idle loop.
+        """
+        if self._render_job is None:
+            self._render_job = self.canvas.after_idle(self._render)
+
+    def _render(self) -> None:
+        """
+        Builds widgets for rows in the viewport (plus overscan) and discards the rest.
+        """
+        self._render_job = None
+        if not self.rows:
+            return
+
+        top = self.canvas.canvasy(0)
+        bottom = top + max(self.canvas.winfo_height(), 1)
+        first = max(bisect_right(self._offsets, top) - 1 - self.overscan, 0)
+        last = min(bisect_left(self._offsets, bottom) + self.overscan, len(self.rows))
+
+        for idx in [i for i in self._live if (i < first or i >= last) and not self._is_pinned(i)]:
+            item, widget, kind = self._live.pop(idx)
+            self.canvas.delete(item)
+            self._discard(kind, widget)
+
+        for idx in range(first, last):
+            if idx in self._live:
+                continue
+            kind, data = self.rows[idx]
+            widget = self.factories[kind](self.canvas, data)
+            item = self.canvas.create_window(self.indents.get(kind, 0), self._offsets[idx],
+                                             window=widget, anchor="nw")
+            self._live[idx] = (item, widget, kind)
+
+        if self.on_near_end is not None and last == len(self.rows) and self._near_end_job is None:
+            self._near_end_job = self.canvas.after_idle(self._fire_near_end)
+
+    def _is_pinned(self, index: int) -> bool:
+        """
+        Returns whether the live widget of row index must outlive the render window.
+        """
+        _, widget, kind = self._live[index]
+        pinned = self.pinned.get(kind)
+        return pinned is not None and pinned(widget)
+
+    def _fire_near_end(self) -> None:
+        """
+        Runs on_near_end once per burst of renders that reached the end.
+        """
+        self._near_end_job = None
+        self.on_near_end()